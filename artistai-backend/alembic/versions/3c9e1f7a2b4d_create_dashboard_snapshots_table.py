@@ -0,0 +1,41 @@
+"""create_dashboard_snapshots_table
+
+Revision ID: 3c9e1f7a2b4d
+Revises: 7a544a084814
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e1f7a2b4d'
+down_revision: Union[str, Sequence[str], None] = '7a544a084814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Criar tabela dashboard_snapshots (um registro por usuário)
+    op.create_table('dashboard_snapshots',
+        sa.Column('user_id', sa.String(length=255), nullable=False),
+        sa.Column('active_artists_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('active_leads_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('upcoming_events_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('monthly_income', sa.Numeric(precision=15, scale=2), server_default=sa.text('0.00'), nullable=False),
+        sa.Column('monthly_expenses', sa.Numeric(precision=15, scale=2), server_default=sa.text('0.00'), nullable=False),
+        sa.Column('open_conversations', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('needs_attention', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('computed_on', sa.Date(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('dashboard_snapshots')
@@ -0,0 +1,39 @@
+"""add_messages_conversation_timestamp_index
+
+Revision ID: 8b7f3e1d6a20
+Revises: 5d2a8c4e9f13
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b7f3e1d6a20'
+down_revision: Union[str, Sequence[str], None] = '5d2a8c4e9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índice da paginação por cursor do histórico de mensagens (conversation_id, timestamp, id).
+    # Criado com CONCURRENTLY para não bloquear escritas na tabela messages.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_messages_conversation_id_timestamp_id', 'messages',
+            ['conversation_id', 'timestamp', 'id'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_messages_conversation_id_timestamp_id', table_name='messages',
+            postgresql_concurrently=True
+        )
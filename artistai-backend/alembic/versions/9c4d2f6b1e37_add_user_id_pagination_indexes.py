@@ -0,0 +1,50 @@
+"""add_user_id_pagination_indexes
+
+Revision ID: 9c4d2f6b1e37
+Revises: 8b7f3e1d6a20
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2f6b1e37'
+down_revision: Union[str, Sequence[str], None] = '8b7f3e1d6a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Índices das listagens paginadas por cursor: (user_id, chave de ordenação, id).
+# O id no final desempata registros com a mesma chave e permite a comparação de tupla do cursor.
+PAGINATION_INDEXES = [
+    ('idx_artists_user_id_created_at_id', 'artists', ['user_id', 'created_at', 'id']),
+    ('idx_contractors_user_id_created_at_id', 'contractors', ['user_id', 'created_at', 'id']),
+    ('idx_events_user_id_event_date_id', 'events', ['user_id', 'event_date', 'id']),
+    ('idx_conversations_user_id_activity', 'conversations',
+     ['user_id', sa.text('coalesce(last_message_at, created_at)'), 'id']),
+    ('idx_messages_user_id_timestamp_id', 'messages', ['user_id', 'timestamp', 'id']),
+    ('idx_notes_user_id_created_at_id', 'notes', ['user_id', 'created_at', 'id']),
+    ('idx_notes_contractor_id_created_at_id', 'notes', ['contractor_id', 'created_at', 'id']),
+    ('idx_pipeline_stages_user_id_order_id', 'pipeline_stages', ['user_id', 'order', 'id']),
+    ('idx_financial_transactions_user_id_date_id', 'financial_transactions',
+     ['user_id', 'transaction_date', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Criados com CONCURRENTLY para não bloquear escritas nas tabelas
+    with op.get_context().autocommit_block():
+        for name, table, columns in PAGINATION_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(PAGINATION_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
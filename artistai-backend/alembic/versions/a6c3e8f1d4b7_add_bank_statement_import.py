@@ -0,0 +1,71 @@
+"""add_bank_statement_import
+
+Revision ID: a6c3e8f1d4b7
+Revises: f2d8b6e4a1c3
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c3e8f1d4b7'
+down_revision: Union[str, Sequence[str], None] = 'f2d8b6e4a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Criar tabela financial_category_rules (categorização na importação de extratos)
+    op.create_table('financial_category_rules',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.String(length=255), nullable=False),
+        sa.Column('category_id', sa.UUID(), nullable=False),
+        sa.Column('pattern', sa.String(length=255), nullable=False),
+        sa.Column('transaction_type', postgresql.ENUM(name='transaction_type_enum', create_type=False), nullable=True),
+        sa.Column('priority', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['financial_categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_financial_category_rules_user_id', 'financial_category_rules', ['user_id', 'priority'])
+    op.create_index('idx_financial_category_rules_category_id', 'financial_category_rules', ['category_id'])
+
+    op.add_column('financial_transactions', sa.Column('import_hash', sa.String(length=64), nullable=True))
+
+    # Deduplicação da importação: ON CONFLICT no hash do lançamento e consulta das referências por conta.
+    # Criados com CONCURRENTLY para não bloquear escritas na tabela financial_transactions
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_financial_transactions_account_id_import_hash', 'financial_transactions',
+            ['account_id', 'import_hash'],
+            unique=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_financial_transactions_account_id_reference_number', 'financial_transactions',
+            ['account_id', 'reference_number'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_financial_transactions_account_id_reference_number', table_name='financial_transactions',
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_financial_transactions_account_id_import_hash', table_name='financial_transactions',
+            postgresql_concurrently=True
+        )
+    op.drop_column('financial_transactions', 'import_hash')
+    op.drop_index('idx_financial_category_rules_category_id', table_name='financial_category_rules')
+    op.drop_index('idx_financial_category_rules_user_id', table_name='financial_category_rules')
+    op.drop_table('financial_category_rules')
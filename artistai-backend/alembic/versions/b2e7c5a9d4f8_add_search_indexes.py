@@ -0,0 +1,62 @@
+"""add_search_indexes
+
+Revision ID: b2e7c5a9d4f8
+Revises: 9c4d2f6b1e37
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e7c5a9d4f8'
+down_revision: Union[str, Sequence[str], None] = '9c4d2f6b1e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Índices GIN compostos com user_id (btree_gin): a busca de um usuário usa um único índice
+SEARCH_INDEXES = [
+    ('idx_messages_user_id_search_vector', 'messages', 'search_vector', None),
+    ('idx_notes_user_id_search_vector', 'notes', 'search_vector', None),
+    ('idx_contractors_user_id_name_trgm', 'contractors', 'name', 'gin_trgm_ops'),
+    ('idx_contractors_user_id_phone_trgm', 'contractors', 'phone', 'gin_trgm_ops'),
+    ('idx_contractors_user_id_email_trgm', 'contractors', 'email', 'gin_trgm_ops'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+
+    # Colunas geradas: o tsvector é mantido pelo próprio banco a cada INSERT/UPDATE de content
+    for table in ('messages', 'notes'):
+        op.add_column(table, sa.Column(
+            'search_vector', postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('portuguese', content)", persisted=True)
+        ))
+
+    # Criados com CONCURRENTLY para não bloquear escritas nas tabelas
+    with op.get_context().autocommit_block():
+        for name, table, column, opclass in SEARCH_INDEXES:
+            op.create_index(
+                name, table, ['user_id', column],
+                postgresql_using='gin',
+                postgresql_ops={column: opclass} if opclass else {},
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(SEARCH_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    op.drop_column('notes', 'search_vector')
+    op.drop_column('messages', 'search_vector')
@@ -0,0 +1,90 @@
+"""add_contractor_normalized_identifiers
+
+Revision ID: c4a8e1f3b6d2
+Revises: b2e7c5a9d4f8
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e1f3b6d2'
+down_revision: Union[str, Sequence[str], None] = 'b2e7c5a9d4f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contractors', sa.Column('phone_normalized', sa.String(length=24), nullable=True))
+    op.add_column('contractors', sa.Column('cpf_cnpj_normalized', sa.String(length=18), nullable=True))
+
+    # Preenche os registros existentes com as mesmas regras de app/normalization.py:
+    # E.164, assumindo o código do país 55 para números nacionais (DDD + número), e CPF/CNPJ só com dígitos
+    op.execute("""
+        UPDATE contractors SET phone_normalized = normalized.value
+        FROM (
+            SELECT id, '+' || CASE
+                WHEN btrim(phone) LIKE '+%' THEN digits
+                WHEN length(ltrim(digits, '0')) IN (10, 11) THEN '55' || ltrim(digits, '0')
+                ELSE ltrim(digits, '0')
+            END AS value
+            FROM (SELECT id, phone, regexp_replace(phone, '\\D', '', 'g') AS digits FROM contractors) AS raw
+            WHERE digits <> ''
+        ) AS normalized
+        WHERE contractors.id = normalized.id
+    """)
+    op.execute("""
+        UPDATE contractors SET cpf_cnpj_normalized = NULLIF(regexp_replace(cpf_cnpj, '\\D', '', 'g'), '')
+        WHERE cpf_cnpj IS NOT NULL
+    """)
+
+    # Duplicatas já existentes (mesmo número com outra formatação) mantêm só o registro mais antigo
+    # com a forma normalizada; as demais ficam nulas até serem mescladas
+    for column in ('phone_normalized', 'cpf_cnpj_normalized'):
+        op.execute(f"""
+            UPDATE contractors SET {column} = NULL
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, row_number() OVER (
+                        PARTITION BY user_id, {column} ORDER BY created_at, id
+                    ) AS position
+                    FROM contractors
+                    WHERE {column} IS NOT NULL
+                ) AS ranked
+                WHERE position > 1
+            )
+        """)
+
+    # Criados com CONCURRENTLY para não bloquear escritas na tabela contractors
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_contractors_user_id_phone_normalized', 'contractors',
+            ['user_id', 'phone_normalized'], unique=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_contractors_user_id_cpf_cnpj_normalized', 'contractors',
+            ['user_id', 'cpf_cnpj_normalized'], unique=True,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_contractors_user_id_cpf_cnpj_normalized', table_name='contractors',
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_contractors_user_id_phone_normalized', table_name='contractors',
+            postgresql_concurrently=True
+        )
+
+    op.drop_column('contractors', 'cpf_cnpj_normalized')
+    op.drop_column('contractors', 'phone_normalized')
@@ -0,0 +1,41 @@
+"""add_financial_summary_covering_index
+
+Revision ID: d7b3f9a2c5e1
+Revises: c4a8e1f3b6d2
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b3f9a2c5e1'
+down_revision: Union[str, Sequence[str], None] = 'c4a8e1f3b6d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índice de cobertura dos resumos financeiros: filtros na chave e amount no INCLUDE,
+    # para que os SUM ... FILTER sejam resolvidos com index-only scan.
+    # Criado com CONCURRENTLY para não bloquear escritas na tabela financial_transactions
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_financial_transactions_user_id_summary', 'financial_transactions',
+            ['user_id', 'transaction_date', 'transaction_type', 'status'],
+            postgresql_include=['amount'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_financial_transactions_user_id_summary', table_name='financial_transactions',
+            postgresql_concurrently=True
+        )
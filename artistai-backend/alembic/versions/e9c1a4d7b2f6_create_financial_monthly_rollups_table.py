@@ -0,0 +1,55 @@
+"""create_financial_monthly_rollups_table
+
+Revision ID: e9c1a4d7b2f6
+Revises: d7b3f9a2c5e1
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9c1a4d7b2f6'
+down_revision: Union[str, Sequence[str], None] = 'd7b3f9a2c5e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Criar tabela financial_monthly_rollups (totais mensais por tipo, categoria e conta).
+    # Preenchida com: python -m app.jobs.backfill_financial_rollups
+    op.create_table('financial_monthly_rollups',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.String(length=255), nullable=False),
+        sa.Column('year_month', sa.Date(), nullable=False),
+        sa.Column('transaction_type', postgresql.ENUM(name='transaction_type_enum', create_type=False), nullable=False),
+        sa.Column('category_id', sa.UUID(), nullable=True),
+        sa.Column('account_id', sa.UUID(), nullable=False),
+        sa.Column('total_amount', sa.Numeric(precision=15, scale=2), server_default=sa.text('0.00'), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['financial_categories.id']),
+        sa.ForeignKeyConstraint(['account_id'], ['financial_accounts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    # Chave das atualizações incrementais (ON CONFLICT); NULLS NOT DISTINCT para transações sem categoria.
+    # Também atende as leituras por usuário e intervalo de meses
+    op.create_index(
+        'idx_financial_monthly_rollups_key', 'financial_monthly_rollups',
+        ['user_id', 'year_month', 'transaction_type', 'category_id', 'account_id'],
+        unique=True, postgresql_nulls_not_distinct=True
+    )
+    op.create_index('idx_financial_monthly_rollups_category_id', 'financial_monthly_rollups', ['category_id'])
+    op.create_index('idx_financial_monthly_rollups_account_id', 'financial_monthly_rollups', ['account_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_financial_monthly_rollups_account_id', table_name='financial_monthly_rollups')
+    op.drop_index('idx_financial_monthly_rollups_category_id', table_name='financial_monthly_rollups')
+    op.drop_index('idx_financial_monthly_rollups_key', table_name='financial_monthly_rollups')
+    op.drop_table('financial_monthly_rollups')
@@ -0,0 +1,39 @@
+"""add_financial_account_opening_balance
+
+Revision ID: f2d8b6e4a1c3
+Revises: e9c1a4d7b2f6
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d8b6e4a1c3'
+down_revision: Union[str, Sequence[str], None] = 'e9c1a4d7b2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('financial_accounts', sa.Column(
+        'opening_balance', sa.Numeric(precision=15, scale=2), server_default=sa.text('0.00'), nullable=False
+    ))
+
+    # Deriva o saldo inicial dos saldos atuais: opening_balance = balance - (receitas - despesas)
+    op.execute("""
+        UPDATE financial_accounts SET opening_balance = financial_accounts.balance - COALESCE((
+            SELECT SUM(CASE WHEN t.transaction_type = 'income' THEN t.amount ELSE -t.amount END)
+            FROM financial_transactions AS t
+            WHERE t.account_id = financial_accounts.id
+        ), 0)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('financial_accounts', 'opening_balance')
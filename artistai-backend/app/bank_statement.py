@@ -0,0 +1,116 @@
+import codecs
+import io
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+from xml.sax.saxutils import unescape
+
+from .spreadsheet import (
+    CSV_CONTENT_TYPES, XLSX_CONTENT_TYPE, SpreadsheetError, UnsupportedSpreadsheetError, iter_rows
+)
+
+OFX_CONTENT_TYPES = ("application/x-ofx", "application/ofx")
+
+OFX_READ_CHARS = 64 * 1024
+
+_OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.IGNORECASE | re.DOTALL)
+# Elementos do OFX 1.x (SGML) não precisam ser fechados: o valor vai até a próxima tag ou quebra de linha
+_OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%d/%m/%y", "%d-%m-%Y", "%Y%m%d")
+
+
+class StatementError(SpreadsheetError):
+    """Extrato bancário inválido"""
+    pass
+
+
+def iter_statement_rows(file: BinaryIO, content_type: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Lê um extrato bancário OFX, CSV ou XLSX sob demanda.
+    Gera (número da linha ou da transação no arquivo, {coluna: valor}). As transações do OFX
+    vêm com as colunas date, amount, description e reference; planilhas mantêm o próprio cabeçalho.
+    """
+    if content_type in OFX_CONTENT_TYPES:
+        return _iter_ofx_rows(file)
+    if content_type in CSV_CONTENT_TYPES or content_type == XLSX_CONTENT_TYPE:
+        return iter_rows(file, content_type)
+    raise UnsupportedSpreadsheetError(
+        f"Tipo de conteúdo não suportado: '{content_type}'. Envie application/x-ofx, text/csv ou {XLSX_CONTENT_TYPE}."
+    )
+
+
+def _iter_ofx_rows(file: BinaryIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    sample = file.read(OFX_READ_CHARS)
+    file.seek(0)
+
+    # OFX 1.x costuma vir em CHARSET:1252; sem UTF-8 válido na amostra, assume cp1252
+    encoding = "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        encoding = "cp1252"
+
+    if b"<OFX>" not in sample.upper():
+        raise StatementError("Arquivo OFX inválido: elemento <OFX> não encontrado")
+
+    text = io.TextIOWrapper(file, encoding=encoding, errors="replace", newline="")
+    buffer = ""
+    number = 0
+    while True:
+        chunk = text.read(OFX_READ_CHARS)
+        buffer += chunk
+        end = 0
+        for match in _OFX_TRANSACTION.finditer(buffer):
+            number += 1
+            fields = {tag.upper(): unescape(value.strip()) for tag, value in _OFX_FIELD.findall(match.group(1))}
+            yield number, {
+                "date": fields.get("DTPOSTED", ""),
+                "amount": fields.get("TRNAMT", ""),
+                "description": fields.get("MEMO") or fields.get("NAME", ""),
+                "reference": fields.get("FITID") or fields.get("CHECKNUM", ""),
+            }
+            end = match.end()
+        # Mantém só o trecho ainda sem </STMTTRN>, que pode continuar no próximo bloco lido
+        buffer = buffer[end:]
+        if not chunk:
+            break
+
+
+def parse_amount(value: str) -> Optional[Decimal]:
+    """
+    Converte valores como "1.234,56", "-1234.56", "R$ 10,00" e "(10,00)" (negativo) em Decimal.
+    Com "." e "," presentes, o último é o separador decimal. Retorna None se o valor for inválido.
+    """
+    text = value.replace("R$", "").replace(" ", "").replace("\xa0", "")
+    negative = text.startswith("(") and text.endswith(")")
+    text = text.strip("()")
+    if "," in text and "." in text:
+        thousands = "." if text.rfind(",") > text.rfind(".") else ","
+        text = text.replace(thousands, "")
+    text = text.replace(",", ".")
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        return None
+    if not amount.is_finite():
+        return None
+    return -amount if negative else amount
+
+
+def parse_date(value: str) -> Optional[date]:
+    """
+    Converte datas em dd/mm/aaaa, aaaa-mm-dd, dd/mm/aa, dd-mm-aaaa e aaaammdd (OFX, com hora opcional).
+    Retorna None se a data for inválida.
+    """
+    text = value.strip()
+    # Datas com hora: "2026-01-05 00:00:00" (células XLSX) e "20260105120000[-3:BRT]" (OFX)
+    if len(text) > 10 and text[:4].isdigit():
+        text = text[:10] if "-" in text[:10] else text[:8]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
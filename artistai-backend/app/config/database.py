@@ -0,0 +1,39 @@
+import os
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
+class DatabaseConfig:
+    """Configurações do pool de conexões com o banco, lidas das variáveis de ambiente"""
+
+    def __init__(self):
+        self.url = os.getenv("DATABASE_URL")
+        self.use_async = _get_bool("DATABASE_ASYNC", False)
+        self.pool_size = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+        self.max_overflow = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+        self.pool_timeout = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+        # Conexões mais antigas que isso são recriadas (o pooler do Supabase encerra conexões ociosas)
+        self.pool_recycle = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+        self.pool_pre_ping = _get_bool("DATABASE_POOL_PRE_PING", True)
+        # PgBouncer/Supavisor em modo transação (porta 6543): não há prepared statements no servidor
+        self.transaction_pooler = _get_bool("DATABASE_TRANSACTION_POOLER", False)
+
+    @property
+    def max_connections(self) -> int:
+        """Número máximo de conexões que um processo pode abrir por engine"""
+        return self.pool_size + max(self.max_overflow, 0)
+
+    def engine_options(self) -> dict:
+        """Argumentos do pool para create_engine/create_async_engine"""
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
@@ -1,6 +1,8 @@
 import os
 from typing import Optional
 
+import httpx
+
 class EvolutionConfig:
     """Configurações centralizadas para a Evolution API"""
     
@@ -9,12 +11,45 @@ class EvolutionConfig:
         self.global_key = os.getenv("EVOLUTION_API_GLOBAL_KEY")
         self.webhook_url = os.getenv("N8N_WHATSAPP_WEBHOOK_URL")
         self.timeout = 30.0
+        # Timeout de conexão (TCP/TLS), comum a todas as operações
+        self.connect_timeout = 5.0
+        # Timeouts por operação; operações não listadas usam self.timeout
+        self.operation_timeouts = {
+            "create_instance": 30.0,
+            "get_qr_code": 15.0,
+            "get_instance_status": 10.0,
+            "delete_instance": 15.0,
+            "instance_exists": 5.0,
+        }
+        # Pool de conexões keep-alive do cliente HTTP compartilhado
+        self.max_connections = int(os.getenv("EVOLUTION_MAX_CONNECTIONS", "50"))
+        self.max_keepalive_connections = int(os.getenv("EVOLUTION_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        self.keepalive_expiry = 30.0
+        # Intervalo da atualização periódica do status das instâncias (0 desabilita)
+        self.status_refresh_interval = float(os.getenv("WHATSAPP_STATUS_REFRESH_INTERVAL", "30"))
+        self.status_refresh_batch_size = 20
         
     @property
     def is_configured(self) -> bool:
         """Verifica se a Evolution API está configurada"""
         return bool(self.api_url and self.global_key)
     
+    @property
+    def limits(self) -> httpx.Limits:
+        """Limites do pool de conexões do cliente HTTP compartilhado"""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+    
+    def get_timeout(self, operation: str) -> httpx.Timeout:
+        """Timeout de uma operação da Evolution API"""
+        return httpx.Timeout(
+            self.operation_timeouts.get(operation, self.timeout),
+            connect=self.connect_timeout
+        )
+    
     @property
     def headers(self) -> dict:
         """Headers padrão para requisições"""
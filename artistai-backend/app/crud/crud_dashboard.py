@@ -2,7 +2,11 @@ import uuid
 from datetime import date, datetime, timedelta
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, and_, or_, extract
+from sqlalchemy import (
+    func, and_, or_, extract, select, union_all, literal, null, cast,
+    String, Text, Numeric, Date
+)
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
@@ -14,64 +18,82 @@ from ..models import (
 from ..schemas import (
     FinancialSummary, CategorySummary, MonthlyTrend
 )
+from ..cache import TTLCache
+from .crud_dashboard_snapshot import get_dashboard_counters
 
 logger = logging.getLogger(__name__)
 
+# Cache do resumo do pipeline por usuário.
+# Invalidado pelas mutações de contratantes e etapas (crud_contractor, crud_stages).
+PIPELINE_SUMMARY_CACHE_TTL_SECONDS = 60
+_pipeline_summary_cache = TTLCache(ttl_seconds=PIPELINE_SUMMARY_CACHE_TTL_SECONDS)
 
-def get_kpis(db: Session, user_id: str) -> Dict[str, Any]:
+
+def invalidate_pipeline_summary(user_id: str) -> None:
+    """Descartar o resumo do pipeline em cache para o usuário."""
+    _pipeline_summary_cache.invalidate(user_id)
+
+
+def _build_kpis(counters: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "active_artists_count": counters["active_artists_count"],
+        "active_leads_count": counters["active_leads_count"],
+        "upcoming_events_count": counters["upcoming_events_count"],
+        "monthly_revenue": float(counters["monthly_income"])
+    }
+
+
+def _build_financial_summary(counters: Dict[str, Any]) -> Dict[str, float]:
+    monthly_income = counters["monthly_income"]
+    monthly_expenses = counters["monthly_expenses"]
+    return {
+        "monthly_income": float(monthly_income),
+        "monthly_expenses": float(monthly_expenses),
+        "net_income": float(monthly_income - monthly_expenses)
+    }
+
+
+def _build_conversations_summary(counters: Dict[str, Any]) -> Dict[str, int]:
+    open_conversations = counters["open_conversations"]
+    needs_attention = counters["needs_attention"]
+    return {
+        "open_conversations": open_conversations,
+        "needs_attention": needs_attention,
+        "total_active": open_conversations + needs_attention
+    }
+
+
+def get_main_dashboard(db: Session, user_id: str) -> Dict[str, Any]:
     """
-    Calcular e retornar KPIs principais do dashboard.
+    Retornar todos os dados do dashboard principal.
+    KPIs, resumo financeiro e resumo de conversas vêm do snapshot do usuário (busca por chave primária);
+    pipeline, atividades recentes e próximos eventos usam uma consulta cada.
     """
     try:
-        # Total de artistas ativos
-        active_artists_count = db.query(Artist).filter(
-            and_(
-                Artist.user_id == user_id,
-                Artist.status == 'active'
-            )
-        ).count()
-        
-        # Total de contratantes em estágios "ativos" do funil
-        # Consideramos contratantes que têm stage_id (estão no pipeline)
-        active_leads_count = db.query(Contractor).filter(
-            and_(
-                Contractor.user_id == user_id,
-                Contractor.stage_id.isnot(None)
-            )
-        ).count()
-        
-        # Eventos confirmados para os próximos 30 dias
-        today = date.today()
-        next_30_days = today + timedelta(days=30)
-        
-        upcoming_events_count = db.query(Event).filter(
-            and_(
-                Event.user_id == user_id,
-                Event.status.in_(['confirmed', 'pending_payment']),
-                Event.event_date >= today,
-                Event.event_date <= next_30_days
-            )
-        ).count()
-        
-        # Receita total do mês corrente (transações completadas)
-        start_of_month = today.replace(day=1)
-        
-        monthly_revenue = db.query(func.sum(FinancialTransaction.amount)).filter(
-            and_(
-                FinancialTransaction.user_id == user_id,
-                FinancialTransaction.transaction_type == 'income',
-                FinancialTransaction.status == 'completed',
-                FinancialTransaction.transaction_date >= start_of_month,
-                FinancialTransaction.transaction_date <= today
-            )
-        ).scalar() or 0.0
-        
+        counters = get_dashboard_counters(db, user_id)
+
         return {
-            "active_artists_count": active_artists_count,
-            "active_leads_count": active_leads_count,
-            "upcoming_events_count": upcoming_events_count,
-            "monthly_revenue": float(monthly_revenue)
+            "kpis": _build_kpis(counters),
+            "pipeline_summary": get_pipeline_summary(db, user_id),
+            "financial_summary": _build_financial_summary(counters),
+            "recent_activities": get_recent_activities(db, user_id),
+            "upcoming_events": get_upcoming_events(db, user_id),
+            "conversations_summary": _build_conversations_summary(counters)
         }
+    except SQLAlchemyError as e:
+        logger.error(f"Erro de banco de dados ao buscar dashboard principal para usuário {user_id}: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Erro inesperado ao buscar dashboard principal para usuário {user_id}: {str(e)}")
+        raise
+
+
+def get_kpis(db: Session, user_id: str) -> Dict[str, Any]:
+    """
+    Calcular e retornar KPIs principais do dashboard.
+    """
+    try:
+        return _build_kpis(get_dashboard_counters(db, user_id))
     except SQLAlchemyError as e:
         logger.error(f"Erro de banco de dados ao buscar KPIs para usuário {user_id}: {str(e)}")
         raise
@@ -83,44 +105,59 @@ def get_kpis(db: Session, user_id: str) -> Dict[str, Any]:
 def get_pipeline_summary(db: Session, user_id: str) -> List[Dict[str, Any]]:
     """
     Retornar resumo do pipeline com número de contratantes por etapa.
+    Usa uma única consulta agrupada por stage_id, independente do número de etapas.
+    O resultado fica em cache por usuário até a próxima mutação de contratantes ou etapas.
     """
+    cached = _pipeline_summary_cache.get(user_id)
+    if cached is not None:
+        return cached
+
     try:
-        # Buscar todas as etapas do usuário
-        stages = db.query(PipelineStage).filter(
+        # Contagem de contratantes por etapa (stage_id nulo = não atribuídos)
+        stage_counts = select(
+            Contractor.stage_id.label('stage_id'),
+            func.count().label('contractor_count')
+        ).where(
+            Contractor.user_id == user_id
+        ).group_by(
+            Contractor.stage_id
+        ).subquery()
+
+        unassigned = select(
+            cast(null(), UUID(as_uuid=True)).label('stage_id'),
+            literal('Não Atribuídos').label('stage_name'),
+            literal(-1).label('stage_order'),
+            func.coalesce(func.max(stage_counts.c.contractor_count), 0).label('contractor_count')
+        ).where(
+            stage_counts.c.stage_id.is_(None)
+        )
+
+        stages = select(
+            PipelineStage.id.label('stage_id'),
+            PipelineStage.name.label('stage_name'),
+            PipelineStage.order.label('stage_order'),
+            func.coalesce(stage_counts.c.contractor_count, 0).label('contractor_count')
+        ).outerjoin(
+            stage_counts, stage_counts.c.stage_id == PipelineStage.id
+        ).where(
             PipelineStage.user_id == user_id
-        ).order_by(PipelineStage.order).all()
-        
-        pipeline_summary = []
-        
-        # Adicionar contratantes não atribuídos
-        unassigned_count = db.query(Contractor).filter(
-            and_(
-                Contractor.user_id == user_id,
-                Contractor.stage_id.is_(None)
-            )
-        ).count()
-        
-        pipeline_summary.append({
-            "stage_name": "Não Atribuídos",
-            "contractor_count": unassigned_count,
-            "stage_id": None
-        })
-        
-        # Adicionar contratantes por etapa
-        for stage in stages:
-            contractor_count = db.query(Contractor).filter(
-                and_(
-                    Contractor.user_id == user_id,
-                    Contractor.stage_id == stage.id
-                )
-            ).count()
-            
-            pipeline_summary.append({
-                "stage_name": stage.name,
-                "contractor_count": contractor_count,
-                "stage_id": str(stage.id)
-            })
-        
+        )
+
+        summary = union_all(unassigned, stages).subquery()
+        rows = db.execute(
+            select(summary).order_by(summary.c.stage_order)
+        ).all()
+
+        pipeline_summary = [
+            {
+                "stage_name": row.stage_name,
+                "contractor_count": row.contractor_count,
+                "stage_id": str(row.stage_id) if row.stage_id else None
+            }
+            for row in rows
+        ]
+
+        _pipeline_summary_cache.set(user_id, pipeline_summary)
         return pipeline_summary
     except SQLAlchemyError as e:
         logger.error(f"Erro de banco de dados ao buscar resumo do pipeline para usuário {user_id}: {str(e)}")
@@ -135,36 +172,7 @@ def get_financial_summary(db: Session, user_id: str) -> Dict[str, float]:
     Retornar resumo financeiro do mês corrente.
     """
     try:
-        today = date.today()
-        start_of_month = today.replace(day=1)
-        
-        # Receitas do mês
-        monthly_income = db.query(func.sum(FinancialTransaction.amount)).filter(
-            and_(
-                FinancialTransaction.user_id == user_id,
-                FinancialTransaction.transaction_type == 'income',
-                FinancialTransaction.status == 'completed',
-                FinancialTransaction.transaction_date >= start_of_month,
-                FinancialTransaction.transaction_date <= today
-            )
-        ).scalar() or 0.0
-        
-        # Despesas do mês
-        monthly_expenses = db.query(func.sum(FinancialTransaction.amount)).filter(
-            and_(
-                FinancialTransaction.user_id == user_id,
-                FinancialTransaction.transaction_type == 'expense',
-                FinancialTransaction.status == 'completed',
-                FinancialTransaction.transaction_date >= start_of_month,
-                FinancialTransaction.transaction_date <= today
-            )
-        ).scalar() or 0.0
-        
-        return {
-            "monthly_income": float(monthly_income),
-            "monthly_expenses": float(monthly_expenses),
-            "net_income": float(monthly_income - monthly_expenses)
-        }
+        return _build_financial_summary(get_dashboard_counters(db, user_id))
     except SQLAlchemyError as e:
         logger.error(f"Erro de banco de dados ao buscar resumo financeiro para usuário {user_id}: {str(e)}")
         raise
@@ -177,66 +185,96 @@ def get_recent_activities(db: Session, user_id: str, limit: int = 5) -> List[Dic
     """
     Retornar atividades recentes do usuário.
     Funciona mesmo quando WhatsApp não está conectado.
+    Eventos, contratantes e transações são buscados em uma única consulta (UNION ALL).
     """
     try:
-        activities = []
-        
-        # Eventos recentes (últimos 7 dias)
         week_ago = date.today() - timedelta(days=7)
-        recent_events = db.query(Event).filter(
+
+        # Eventos recentes (últimos 7 dias)
+        recent_events = select(
+            literal('event').label('type'),
+            Event.title.label('name'),
+            Event.event_date.label('event_date'),
+            cast(null(), String).label('phone'),
+            cast(null(), String).label('transaction_type'),
+            cast(null(), Numeric).label('amount'),
+            cast(null(), Text).label('description'),
+            Event.created_at.label('timestamp')
+        ).where(
             and_(
                 Event.user_id == user_id,
                 Event.created_at >= week_ago
             )
-        ).order_by(Event.created_at.desc()).limit(3).all()
-        
-        for event in recent_events:
-            activities.append({
-                "type": "event",
-                "title": f"Evento '{event.title}' criado",
-                "description": f"Agendado para {event.event_date.strftime('%d/%m/%Y')}",
-                "timestamp": event.created_at,
-                "icon": "calendar"
-            })
-        
+        ).order_by(Event.created_at.desc()).limit(3)
+
         # Contratantes recentes (últimos 7 dias)
-        recent_contractors = db.query(Contractor).filter(
+        recent_contractors = select(
+            literal('contractor'),
+            Contractor.name,
+            cast(null(), Date),
+            Contractor.phone,
+            cast(null(), String),
+            cast(null(), Numeric),
+            cast(null(), Text),
+            Contractor.created_at
+        ).where(
             and_(
                 Contractor.user_id == user_id,
                 Contractor.created_at >= week_ago
             )
-        ).order_by(Contractor.created_at.desc()).limit(2).all()
-        
-        for contractor in recent_contractors:
-            activities.append({
-                "type": "contractor",
-                "title": f"Novo contratante: {contractor.name}",
-                "description": f"Telefone: {contractor.phone}",
-                "timestamp": contractor.created_at,
-                "icon": "user-plus"
-            })
-        
+        ).order_by(Contractor.created_at.desc()).limit(2)
+
         # Transações financeiras recentes (últimos 7 dias)
-        recent_transactions = db.query(FinancialTransaction).filter(
+        recent_transactions = select(
+            literal('transaction'),
+            cast(null(), String),
+            cast(null(), Date),
+            cast(null(), String),
+            cast(FinancialTransaction.transaction_type, String),
+            FinancialTransaction.amount,
+            FinancialTransaction.description,
+            FinancialTransaction.created_at
+        ).where(
             and_(
                 FinancialTransaction.user_id == user_id,
                 FinancialTransaction.created_at >= week_ago
             )
-        ).order_by(FinancialTransaction.created_at.desc()).limit(2).all()
-        
-        for transaction in recent_transactions:
-            transaction_type = "Receita" if transaction.transaction_type == "income" else "Despesa"
-            activities.append({
-                "type": "transaction",
-                "title": f"{transaction_type}: R$ {transaction.amount:.2f}",
-                "description": transaction.description,
-                "timestamp": transaction.created_at,
-                "icon": "dollar-sign"
-            })
-        
-        # Ordenar por timestamp e limitar
-        activities.sort(key=lambda x: x["timestamp"], reverse=True)
-        return activities[:limit]
+        ).order_by(FinancialTransaction.created_at.desc()).limit(2)
+
+        combined = union_all(recent_events, recent_contractors, recent_transactions).subquery()
+        rows = db.execute(
+            select(combined).order_by(combined.c.timestamp.desc()).limit(limit)
+        ).all()
+
+        activities = []
+        for row in rows:
+            if row.type == 'event':
+                activities.append({
+                    "type": "event",
+                    "title": f"Evento '{row.name}' criado",
+                    "description": f"Agendado para {row.event_date.strftime('%d/%m/%Y')}",
+                    "timestamp": row.timestamp,
+                    "icon": "calendar"
+                })
+            elif row.type == 'contractor':
+                activities.append({
+                    "type": "contractor",
+                    "title": f"Novo contratante: {row.name}",
+                    "description": f"Telefone: {row.phone}",
+                    "timestamp": row.timestamp,
+                    "icon": "user-plus"
+                })
+            else:
+                transaction_type = "Receita" if row.transaction_type == "income" else "Despesa"
+                activities.append({
+                    "type": "transaction",
+                    "title": f"{transaction_type}: R$ {row.amount:.2f}",
+                    "description": row.description,
+                    "timestamp": row.timestamp,
+                    "icon": "dollar-sign"
+                })
+
+        return activities
     except SQLAlchemyError as e:
         logger.error(f"Erro de banco de dados ao buscar atividades recentes para usuário {user_id}: {str(e)}")
         # Em caso de erro, retornar lista vazia para não quebrar o dashboard
@@ -254,7 +292,10 @@ def get_upcoming_events(db: Session, user_id: str, limit: int = 5) -> List[Dict[
     try:
         today = date.today()
         
-        upcoming_events = db.query(Event).filter(
+        upcoming_events = db.query(Event).options(
+            joinedload(Event.artist),
+            joinedload(Event.contractor)
+        ).filter(
             and_(
                 Event.user_id == user_id,
                 Event.status.in_(['confirmed', 'pending_payment']),
@@ -294,40 +335,7 @@ def get_conversations_summary(db: Session, user_id: str) -> Dict[str, int]:
     Retorna valores zerados se não houver conversas (WhatsApp desconectado).
     """
     try:
-        # Verificar se existem conversas para o usuário
-        total_conversations = db.query(Conversation).filter(
-            Conversation.user_id == user_id
-        ).count()
-        
-        # Se não há conversas, retornar valores zerados
-        if total_conversations == 0:
-            return {
-                "open_conversations": 0,
-                "needs_attention": 0,
-                "total_active": 0
-            }
-        
-        # Conversas abertas
-        open_conversations = db.query(Conversation).filter(
-            and_(
-                Conversation.user_id == user_id,
-                Conversation.status == 'open'
-            )
-        ).count()
-        
-        # Conversas que precisam de atenção
-        needs_attention = db.query(Conversation).filter(
-            and_(
-                Conversation.user_id == user_id,
-                Conversation.status == 'needs_attention'
-            )
-        ).count()
-        
-        return {
-            "open_conversations": open_conversations,
-            "needs_attention": needs_attention,
-            "total_active": open_conversations + needs_attention
-        }
+        return _build_conversations_summary(get_dashboard_counters(db, user_id))
     except SQLAlchemyError as e:
         logger.error(f"Erro de banco de dados ao buscar resumo de conversas para usuário {user_id}: {str(e)}")
         # Em caso de erro, retornar valores zerados para não quebrar o dashboard
@@ -0,0 +1,261 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Any, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, select, true
+from sqlalchemy.dialects.postgresql import insert
+import logging
+
+from ..models import (
+    Artist, Contractor, Event, Conversation, FinancialTransaction, DashboardSnapshot
+)
+
+logger = logging.getLogger(__name__)
+
+# Idade máxima de um snapshot antes de ser recalculado a partir das tabelas de origem.
+# Limita a divergência causada por escritas que não passam pelas funções CRUD.
+SNAPSHOT_MAX_AGE = timedelta(minutes=15)
+
+UPCOMING_EVENT_STATUSES = ('confirmed', 'pending_payment')
+UPCOMING_EVENTS_WINDOW_DAYS = 30
+
+COUNTER_FIELDS = (
+    "active_artists_count",
+    "active_leads_count",
+    "upcoming_events_count",
+    "monthly_income",
+    "monthly_expenses",
+    "open_conversations",
+    "needs_attention",
+)
+
+
+def compute_dashboard_counters(db: Session, user_id: str, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Calcular todos os contadores do dashboard em uma única ida ao banco.
+    Cada tabela é agregada uma única vez (COUNT/SUM com FILTER) e as linhas
+    resultantes são combinadas em um único SELECT.
+    """
+    today = today or date.today()
+    start_of_month = today.replace(day=1)
+    next_30_days = today + timedelta(days=UPCOMING_EVENTS_WINDOW_DAYS)
+
+    # Total de artistas ativos
+    artists = select(
+        func.count().label('active_artists_count')
+    ).where(
+        and_(
+            Artist.user_id == user_id,
+            Artist.status == 'active'
+        )
+    ).subquery()
+
+    # Contratantes no pipeline (com stage_id)
+    contractors = select(
+        func.count().label('active_leads_count')
+    ).where(
+        and_(
+            Contractor.user_id == user_id,
+            Contractor.stage_id.isnot(None)
+        )
+    ).subquery()
+
+    # Eventos confirmados para os próximos 30 dias
+    events = select(
+        func.count().label('upcoming_events_count')
+    ).where(
+        and_(
+            Event.user_id == user_id,
+            Event.status.in_(UPCOMING_EVENT_STATUSES),
+            Event.event_date >= today,
+            Event.event_date <= next_30_days
+        )
+    ).subquery()
+
+    # Receitas e despesas completadas do mês corrente
+    transactions = select(
+        func.coalesce(
+            func.sum(FinancialTransaction.amount).filter(FinancialTransaction.transaction_type == 'income'), 0
+        ).label('monthly_income'),
+        func.coalesce(
+            func.sum(FinancialTransaction.amount).filter(FinancialTransaction.transaction_type == 'expense'), 0
+        ).label('monthly_expenses')
+    ).where(
+        and_(
+            FinancialTransaction.user_id == user_id,
+            FinancialTransaction.status == 'completed',
+            FinancialTransaction.transaction_date >= start_of_month,
+            FinancialTransaction.transaction_date <= today
+        )
+    ).subquery()
+
+    # Conversas por status
+    conversations = select(
+        func.count().filter(Conversation.status == 'open').label('open_conversations'),
+        func.count().filter(Conversation.status == 'needs_attention').label('needs_attention')
+    ).where(
+        Conversation.user_id == user_id
+    ).subquery()
+
+    # Cada subquery retorna exatamente uma linha
+    query = select(
+        artists, contractors, events, transactions, conversations
+    ).select_from(artists).join(
+        contractors, true()
+    ).join(
+        events, true()
+    ).join(
+        transactions, true()
+    ).join(
+        conversations, true()
+    )
+
+    return dict(db.execute(query).mappings().one())
+
+
+def refresh_dashboard_snapshot(db: Session, user_id: str) -> Dict[str, Any]:
+    """
+    Recalcular os contadores a partir das tabelas de origem e gravar o snapshot do usuário.
+    Antes do cálculo, bloqueia a linha do snapshot (ou, se ela ainda não existe, uma trava consultiva
+    do usuário): escritas que já aplicaram deltas terminam antes e entram no cálculo, feito num comando
+    seguinte; as posteriores esperam o commit e aplicam o delta sobre os contadores novos.
+    Faz o commit da sessão recebida.
+    """
+    if _lock_snapshot(db, user_id) is None:
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"dashboard_snapshot:{user_id}"))))
+        # Outro recálculo pode ter criado a linha enquanto esta sessão esperava a trava
+        _lock_snapshot(db, user_id)
+
+    today = date.today()
+    counters = compute_dashboard_counters(db, user_id, today=today)
+
+    values = dict(counters, computed_on=today, refreshed_at=func.now())
+    statement = insert(DashboardSnapshot).values(user_id=user_id, **values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[DashboardSnapshot.user_id],
+        set_=values
+    )
+    db.execute(statement)
+    db.commit()
+    return counters
+
+
+def _lock_snapshot(db: Session, user_id: str) -> Optional[str]:
+    return db.execute(
+        select(DashboardSnapshot.user_id).where(DashboardSnapshot.user_id == user_id).with_for_update()
+    ).scalar_one_or_none()
+
+
+def get_dashboard_counters(db: Session, user_id: str) -> Dict[str, Any]:
+    """
+    Retornar os contadores do dashboard a partir do snapshot do usuário (busca por chave primária).
+    O snapshot é recalculado se não existir, se foi calculado em outro dia
+    (as janelas de mês corrente e próximos 30 dias mudaram) ou se passou de SNAPSHOT_MAX_AGE.
+    O recálculo usa uma sessão própria, na mesma engine, para não fazer commit da sessão de quem chama;
+    por isso não deve ser chamada com escritas pendentes no snapshot do usuário.
+    """
+    snapshot = db.get(DashboardSnapshot, user_id)
+    if (
+        snapshot is None
+        or snapshot.computed_on != date.today()
+        or snapshot.refreshed_at < datetime.now(timezone.utc) - SNAPSHOT_MAX_AGE
+    ):
+        with Session(bind=db.get_bind()) as refresh_db:
+            return refresh_dashboard_snapshot(refresh_db, user_id)
+
+    return {field: getattr(snapshot, field) for field in COUNTER_FIELDS}
+
+
+def apply_dashboard_delta(db: Session, user_id: str, before: Optional[Dict[str, Any]] = None,
+                          after: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Aplicar ao snapshot a diferença entre a contribuição de um registro antes e depois de uma escrita.
+    A atualização é atômica (col = col + delta) e participa da transação de quem chama,
+    portanto deve ser chamada antes do commit.
+    Snapshots de outro dia não são alterados; eles serão recalculados na próxima leitura.
+    """
+    before = before or {}
+    after = after or {}
+
+    deltas = {}
+    for field in COUNTER_FIELDS:
+        delta = after.get(field, 0) - before.get(field, 0)
+        if delta:
+            deltas[field] = getattr(DashboardSnapshot, field) + delta
+
+    if not deltas:
+        return
+
+    db.query(DashboardSnapshot).filter(
+        and_(
+            DashboardSnapshot.user_id == user_id,
+            DashboardSnapshot.computed_on == date.today()
+        )
+    ).update(deltas, synchronize_session=False)
+
+
+def invalidate_dashboard_snapshot(db: Session, user_id: str) -> None:
+    """
+    Descartar o snapshot do usuário, forçando o recálculo na próxima leitura.
+    Usado quando uma escrita afeta linhas em cascata (ex.: exclusão de contratante ou artista).
+    Deve ser chamada antes do commit.
+    """
+    db.query(DashboardSnapshot).filter(
+        DashboardSnapshot.user_id == user_id
+    ).delete(synchronize_session=False)
+
+
+def reconcile_dashboard_snapshots(db: Session) -> int:
+    """
+    Recalcular todos os snapshots existentes para corrigir eventuais divergências.
+    Retorna o número de snapshots reconciliados.
+    """
+    user_ids = db.execute(select(DashboardSnapshot.user_id)).scalars().all()
+
+    for user_id in user_ids:
+        try:
+            refresh_dashboard_snapshot(db, user_id)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Erro ao reconciliar snapshot do dashboard para usuário {user_id}: {str(e)}")
+
+    return len(user_ids)
+
+
+# Contribuição de cada registro para os contadores do snapshot
+def artist_contribution(artist: Artist) -> Dict[str, Any]:
+    return {"active_artists_count": 1 if artist.status == 'active' else 0}
+
+
+def contractor_contribution(contractor: Contractor) -> Dict[str, Any]:
+    return {"active_leads_count": 1 if contractor.stage_id is not None else 0}
+
+
+def event_contribution(event: Event) -> Dict[str, Any]:
+    today = date.today()
+    is_upcoming = (
+        event.status in UPCOMING_EVENT_STATUSES
+        and today <= event.event_date <= today + timedelta(days=UPCOMING_EVENTS_WINDOW_DAYS)
+    )
+    return {"upcoming_events_count": 1 if is_upcoming else 0}
+
+
+def transaction_contribution(transaction: FinancialTransaction) -> Dict[str, Any]:
+    today = date.today()
+    if (
+        transaction.status != 'completed'
+        or not (today.replace(day=1) <= transaction.transaction_date <= today)
+    ):
+        return {}
+
+    amount = Decimal(str(transaction.amount))
+    if transaction.transaction_type == 'income':
+        return {"monthly_income": amount}
+    return {"monthly_expenses": amount}
+
+
+def conversation_contribution(conversation: Conversation) -> Dict[str, Any]:
+    return {
+        "open_conversations": 1 if conversation.status == 'open' else 0,
+        "needs_attention": 1 if conversation.status == 'needs_attention' else 0
+    }
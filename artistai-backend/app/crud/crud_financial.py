@@ -1,12 +1,16 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func, extract
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, and_, or_, case, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from collections import defaultdict
 from datetime import date, datetime, timedelta
+from decimal import Decimal
+import hashlib
 import uuid
 
 from app.models import (
     FinancialAccount, FinancialCategory, FinancialTransaction, 
-    FinancialGoal, FinancialBudget
+    FinancialGoal, FinancialBudget, FinancialCategoryRule, FinancialMonthlyRollup, Event
 )
 from app.schemas import (
     FinancialAccountCreate, FinancialAccountUpdate,
@@ -14,19 +18,73 @@ from app.schemas import (
     FinancialTransactionCreate, FinancialTransactionUpdate,
     FinancialGoalCreate, FinancialGoalUpdate,
     FinancialBudgetCreate, FinancialBudgetUpdate,
-    FinancialSummary, CategorySummary, MonthlyTrend
+    FinancialCategoryRuleCreate,
+    FinancialSummary, CategorySummary, MonthlyTrend, FinancialDashboard
 )
+from app.bank_statement import parse_amount, parse_date
+from app.cache import TTLCache
+from app.normalization import normalize_text
+from app.pagination import paginate_query
+from app.crud.crud_dashboard_snapshot import (
+    apply_dashboard_delta, invalidate_dashboard_snapshot, transaction_contribution
+)
+from app.crud.crud_financial_rollup import (
+    add_months, add_rollup_contributions, apply_rollup_delta, fold_category_rollups, month_start,
+    rollup_contribution
+)
+
+# Linhas buscadas do banco por vez na exportação de transações
+EXPORT_BATCH_SIZE = 1000
+
+# Linhas gravadas por INSERT na importação de extratos
+IMPORT_CHUNK_SIZE = 1000
+
+# Nomes de coluna aceitos na importação de extratos (planilhas em minúsculas; o OFX usa os nomes em inglês)
+STATEMENT_IMPORT_COLUMNS = {
+    "date": ("data", "date", "data lançamento", "data lancamento", "data_lancamento"),
+    "description": ("descricao", "descrição", "description", "historico", "histórico", "lançamento", "lancamento", "memo"),
+    "amount": ("valor", "amount", "valor (r$)"),
+    "type": ("tipo", "type"),
+    "reference": ("referencia", "referência", "reference", "documento", "nº documento", "fitid"),
+    "category": ("categoria", "category"),
+}
+
+# Valores da coluna tipo (já sem acentos e em minúsculas) para cada tipo de transação
+STATEMENT_TYPE_ALIASES = {
+    "income": ("income", "receita", "credito", "c", "entrada"),
+    "expense": ("expense", "despesa", "debito", "d", "saida"),
+}
+
+# Cache do dashboard financeiro por usuário.
+# Invalidado por todas as escritas deste módulo; o TTL limita a defasagem entre workers.
+FINANCIAL_DASHBOARD_CACHE_TTL_SECONDS = 30
+_financial_dashboard_cache = TTLCache(ttl_seconds=FINANCIAL_DASHBOARD_CACHE_TTL_SECONDS)
+
+
+def get_cached_financial_dashboard(user_id: str) -> Optional[FinancialDashboard]:
+    return _financial_dashboard_cache.get(user_id)
+
+
+def cache_financial_dashboard(user_id: str, dashboard: FinancialDashboard) -> None:
+    _financial_dashboard_cache.set(user_id, dashboard)
+
+
+def invalidate_financial_dashboard(user_id: str) -> None:
+    """Descartar o dashboard financeiro em cache para o usuário."""
+    _financial_dashboard_cache.invalidate(user_id)
 
 
 # CRUD para Financial Accounts
 def create_financial_account(db: Session, account: FinancialAccountCreate, user_id: str) -> FinancialAccount:
     db_account = FinancialAccount(
         **account.dict(),
+        opening_balance=account.balance,
         user_id=user_id,
         id=uuid.uuid4()
     )
     db.add(db_account)
     db.commit()
+    invalidate_financial_dashboard(user_id)
     db.refresh(db_account)
     return db_account
 
@@ -47,10 +105,17 @@ def update_financial_account(db: Session, account_id: uuid.UUID, account: Financ
     db_account = get_financial_account(db, account_id, user_id)
     if db_account:
         update_data = account.dict(exclude_unset=True)
+        if update_data.get('balance') is not None:
+            # Ajuste manual do saldo: desloca o saldo inicial na mesma medida, mantendo
+            # balance = opening_balance + soma das transações (calculado no próprio UPDATE)
+            new_balance = Decimal(str(update_data.pop('balance')))
+            db_account.opening_balance = FinancialAccount.opening_balance + (new_balance - FinancialAccount.balance)
+            db_account.balance = new_balance
         for field, value in update_data.items():
             setattr(db_account, field, value)
         db_account.updated_at = datetime.utcnow()
         db.commit()
+        invalidate_financial_dashboard(user_id)
         db.refresh(db_account)
     return db_account
 
@@ -59,7 +124,10 @@ def delete_financial_account(db: Session, account_id: uuid.UUID, user_id: str) -
     db_account = get_financial_account(db, account_id, user_id)
     if db_account:
         db.delete(db_account)
+        # A exclusão remove transações em cascata; recalcular o snapshot na próxima leitura
+        invalidate_dashboard_snapshot(db, user_id)
         db.commit()
+        invalidate_financial_dashboard(user_id)
         return True
     return False
 
@@ -73,6 +141,7 @@ def create_financial_category(db: Session, category: FinancialCategoryCreate, us
     )
     db.add(db_category)
     db.commit()
+    invalidate_financial_dashboard(user_id)
     db.refresh(db_category)
     return db_category
 
@@ -84,10 +153,14 @@ def get_financial_categories(db: Session, user_id: str, category_type: Optional[
     return query.all()
 
 
-def get_financial_category(db: Session, category_id: uuid.UUID, user_id: str) -> Optional[FinancialCategory]:
-    return db.query(FinancialCategory).filter(
+def get_financial_category(db: Session, category_id: uuid.UUID, user_id: str,
+                           for_update: bool = False) -> Optional[FinancialCategory]:
+    query = db.query(FinancialCategory).filter(
         and_(FinancialCategory.id == category_id, FinancialCategory.user_id == user_id)
-    ).first()
+    )
+    if for_update:
+        query = query.with_for_update()
+    return query.first()
 
 
 def update_financial_category(db: Session, category_id: uuid.UUID, category: FinancialCategoryUpdate, user_id: str) -> Optional[FinancialCategory]:
@@ -97,19 +170,119 @@ def update_financial_category(db: Session, category_id: uuid.UUID, category: Fin
         for field, value in update_data.items():
             setattr(db_category, field, value)
         db.commit()
+        invalidate_financial_dashboard(user_id)
         db.refresh(db_category)
     return db_category
 
 
 def delete_financial_category(db: Session, category_id: uuid.UUID, user_id: str) -> bool:
-    db_category = get_financial_category(db, category_id, user_id)
+    # O bloqueio impede que transações concorrentes passem a usar a categoria durante a exclusão
+    db_category = get_financial_category(db, category_id, user_id, for_update=True)
     if db_category:
+        # As transações da categoria ficam sem categoria (SET NULL); os totais mensais delas
+        # passam para as linhas sem categoria na mesma transação, antes da exclusão
+        fold_category_rollups(db, user_id, category_id)
         db.delete(db_category)
         db.commit()
+        invalidate_financial_dashboard(user_id)
         return True
     return False
 
 
+# Saldos das contas
+def transaction_balance_delta(transaction_type: str, amount: Any) -> Decimal:
+    """Efeito de uma transação no saldo da conta: receitas somam, despesas subtraem."""
+    amount = Decimal(str(amount))
+    return amount if transaction_type == 'income' else -amount
+
+
+def apply_balance_deltas(db: Session, user_id: str, deltas: Dict[uuid.UUID, Decimal]) -> Dict[uuid.UUID, Decimal]:
+    """
+    Aplicar variações de saldo às contas do usuário com UPDATE ... SET balance = balance + :delta,
+    sem carregar as contas: escritas concorrentes na mesma conta não perdem atualizações.
+    As contas são atualizadas em ordem de id, evitando deadlock entre escritas que tocam as
+    mesmas contas. Retorna os novos saldos. Participa da transação de quem chama (antes do commit).
+    """
+    balances = {}
+    for account_id in sorted(deltas, key=str):
+        delta = deltas[account_id]
+        if not delta:
+            continue
+        balance = db.execute(
+            update(FinancialAccount)
+            .where(FinancialAccount.id == account_id, FinancialAccount.user_id == user_id)
+            .values(balance=FinancialAccount.balance + delta, updated_at=func.now())
+            .returning(FinancialAccount.balance)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        if balance is not None:
+            balances[account_id] = balance
+    return balances
+
+
+def reconcile_account_balances(db: Session, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Conferir em lote o saldo das contas contra saldo inicial + soma das transações (receitas menos despesas)
+    e corrigir as divergentes. Uma agregação sobre financial_transactions, o bloqueio das contas divergentes
+    e um único UPDATE, que recalcula o saldo em vez de gravar o valor lido na agregação.
+    Retorna as contas corrigidas, com o saldo anterior e o esperado.
+    """
+    signed_amount = case(
+        (FinancialTransaction.transaction_type == 'income', FinancialTransaction.amount),
+        else_=-FinancialTransaction.amount
+    )
+    ledger = select(
+        FinancialTransaction.account_id,
+        func.sum(signed_amount).label('total')
+    ).group_by(FinancialTransaction.account_id)
+    if user_id:
+        ledger = ledger.where(FinancialTransaction.user_id == user_id)
+    ledger = ledger.subquery()
+
+    expected = FinancialAccount.opening_balance + func.coalesce(ledger.c.total, 0)
+    query = select(
+        FinancialAccount.id, FinancialAccount.user_id, FinancialAccount.balance, expected.label('expected')
+    ).outerjoin(
+        ledger, ledger.c.account_id == FinancialAccount.id
+    ).where(
+        FinancialAccount.balance != expected
+    )
+    if user_id:
+        query = query.where(FinancialAccount.user_id == user_id)
+    mismatches = db.execute(query).all()
+
+    if mismatches:
+        account_ids = [row.id for row in mismatches]
+        # Bloqueia as contas (em ordem de id, como apply_balance_deltas) num comando próprio: escritas que já
+        # alteraram o saldo terminam antes, e o UPDATE seguinte, com um snapshot novo, soma as transações
+        # delas. Escritas posteriores aplicam o próprio delta sobre o saldo recalculado
+        db.execute(
+            select(FinancialAccount.id)
+            .where(FinancialAccount.id.in_(account_ids))
+            .order_by(FinancialAccount.id)
+            .with_for_update()
+        )
+        account_total = select(
+            func.coalesce(func.sum(signed_amount), 0)
+        ).where(
+            FinancialTransaction.account_id == FinancialAccount.id
+        ).scalar_subquery()
+        db.execute(
+            update(FinancialAccount)
+            .where(FinancialAccount.id.in_(account_ids))
+            .values(balance=FinancialAccount.opening_balance + account_total, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    for affected_user_id in {row.user_id for row in mismatches}:
+        invalidate_financial_dashboard(affected_user_id)
+
+    return [
+        {"account_id": row.id, "user_id": row.user_id, "balance": row.balance, "expected": row.expected}
+        for row in mismatches
+    ]
+
+
 # CRUD para Financial Transactions
 def create_financial_transaction(db: Session, transaction: FinancialTransactionCreate, user_id: str) -> FinancialTransaction:
     db_transaction = FinancialTransaction(
@@ -118,29 +291,120 @@ def create_financial_transaction(db: Session, transaction: FinancialTransactionC
         id=uuid.uuid4()
     )
     db.add(db_transaction)
+    db.flush()
     
-    # Atualizar saldo da conta
-    account = get_financial_account(db, transaction.account_id, user_id)
-    if account:
-        if transaction.transaction_type == 'income':
-            account.balance += transaction.amount
-        else:
-            account.balance -= transaction.amount
-        account.updated_at = datetime.utcnow()
-    
+    apply_balance_deltas(db, user_id, {
+        db_transaction.account_id: transaction_balance_delta(db_transaction.transaction_type, db_transaction.amount)
+    })
+    apply_dashboard_delta(db, user_id, after=transaction_contribution(db_transaction))
+    apply_rollup_delta(db, user_id, after=rollup_contribution(db_transaction))
     db.commit()
+    invalidate_financial_dashboard(user_id)
     db.refresh(db_transaction)
     return db_transaction
 
 
-def get_financial_transactions(db: Session, user_id: str, skip: int = 0, limit: int = 100, 
+def get_financial_transactions(db: Session, user_id: str, limit: int = 100, cursor: Optional[str] = None,
                              account_id: Optional[uuid.UUID] = None,
                              category_id: Optional[uuid.UUID] = None,
                              transaction_type: Optional[str] = None,
                              start_date: Optional[date] = None,
-                             end_date: Optional[date] = None) -> List[FinancialTransaction]:
-    query = db.query(FinancialTransaction).filter(FinancialTransaction.user_id == user_id)
+                             end_date: Optional[date] = None) -> Dict[str, Any]:
+    """Lista as transações do usuário, das mais recentes para as mais antigas, paginadas por cursor."""
+    query = _filter_transactions(
+        db.query(FinancialTransaction), user_id,
+        account_id, category_id, transaction_type, start_date, end_date
+    )
     
+    return paginate_query(
+        query,
+        (FinancialTransaction.transaction_date, FinancialTransaction.id),
+        (date, uuid.UUID),
+        lambda transaction: (transaction.transaction_date, transaction.id),
+        limit,
+        cursor,
+        descending=True
+    )
+
+
+def get_recent_financial_transactions(db: Session, user_id: str, limit: int = 10) -> List[FinancialTransaction]:
+    """Transações mais recentes, com os relacionamentos exibidos na resposta já carregados."""
+    return db.query(FinancialTransaction).options(
+        joinedload(FinancialTransaction.account),
+        joinedload(FinancialTransaction.category),
+        joinedload(FinancialTransaction.contractor),
+        joinedload(FinancialTransaction.event).joinedload(Event.artist),
+        joinedload(FinancialTransaction.event).joinedload(Event.contractor)
+    ).filter(
+        FinancialTransaction.user_id == user_id
+    ).order_by(
+        FinancialTransaction.transaction_date.desc(), FinancialTransaction.id.desc()
+    ).limit(limit).all()
+
+
+def iter_financial_transactions_for_export(db: Session, user_id: str,
+                                          account_id: Optional[uuid.UUID] = None,
+                                          category_id: Optional[uuid.UUID] = None,
+                                          transaction_type: Optional[str] = None,
+                                          start_date: Optional[date] = None,
+                                          end_date: Optional[date] = None,
+                                          batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Row]]:
+    """
+    Percorre as transações do usuário em ordem cronológica, em lotes de até batch_size linhas,
+    com os mesmos filtros de get_financial_transactions. Os nomes da conta e da categoria vêm na
+    mesma consulta. yield_per usa um cursor no servidor: só o lote atual fica na memória.
+    """
+    query = _filter_transactions(
+        db.query(
+            FinancialTransaction.id,
+            FinancialTransaction.transaction_date,
+            FinancialTransaction.due_date,
+            FinancialTransaction.description,
+            FinancialTransaction.transaction_type,
+            FinancialTransaction.amount,
+            FinancialTransaction.status,
+            FinancialAccount.name.label("account_name"),
+            FinancialCategory.name.label("category_name"),
+            FinancialTransaction.reference_number,
+            FinancialTransaction.is_tax_deductible,
+            FinancialTransaction.tax_category,
+            FinancialTransaction.notes,
+        )
+        .join(FinancialAccount, FinancialAccount.id == FinancialTransaction.account_id)
+        .outerjoin(FinancialCategory, FinancialCategory.id == FinancialTransaction.category_id),
+        user_id, account_id, category_id, transaction_type, start_date, end_date
+    ).order_by(FinancialTransaction.transaction_date, FinancialTransaction.id)
+
+    result = db.execute(query.statement.execution_options(yield_per=batch_size))
+    try:
+        for batch in result.partitions():
+            yield batch
+    finally:
+        result.close()
+
+
+def get_financial_transactions_date_range(db: Session, user_id: str,
+                                          account_id: Optional[uuid.UUID] = None,
+                                          category_id: Optional[uuid.UUID] = None,
+                                          transaction_type: Optional[str] = None,
+                                          start_date: Optional[date] = None,
+                                          end_date: Optional[date] = None) -> Tuple[Optional[date], Optional[date]]:
+    """Primeira e última data de transação dentro dos filtros (None, None se não houver transações)."""
+    query = _filter_transactions(
+        db.query(func.min(FinancialTransaction.transaction_date), func.max(FinancialTransaction.transaction_date)),
+        user_id, account_id, category_id, transaction_type, start_date, end_date
+    )
+    first, last = query.one()
+    return first, last
+
+
+def _filter_transactions(query, user_id: str,
+                         account_id: Optional[uuid.UUID] = None,
+                         category_id: Optional[uuid.UUID] = None,
+                         transaction_type: Optional[str] = None,
+                         start_date: Optional[date] = None,
+                         end_date: Optional[date] = None):
+    query = query.filter(FinancialTransaction.user_id == user_id)
     if account_id:
         query = query.filter(FinancialTransaction.account_id == account_id)
     if category_id:
@@ -151,61 +415,60 @@ def get_financial_transactions(db: Session, user_id: str, skip: int = 0, limit:
         query = query.filter(FinancialTransaction.transaction_date >= start_date)
     if end_date:
         query = query.filter(FinancialTransaction.transaction_date <= end_date)
-    
-    return query.order_by(FinancialTransaction.transaction_date.desc()).offset(skip).limit(limit).all()
+    return query
 
 
-def get_financial_transaction(db: Session, transaction_id: uuid.UUID, user_id: str) -> Optional[FinancialTransaction]:
-    return db.query(FinancialTransaction).filter(
+def get_financial_transaction(db: Session, transaction_id: uuid.UUID, user_id: str,
+                              for_update: bool = False) -> Optional[FinancialTransaction]:
+    """`for_update` bloqueia a linha até o commit, para que escritas concorrentes na mesma transação não se percam."""
+    query = db.query(FinancialTransaction).filter(
         and_(FinancialTransaction.id == transaction_id, FinancialTransaction.user_id == user_id)
-    ).first()
+    )
+    if for_update:
+        query = query.with_for_update()
+    return query.first()
 
 
 def update_financial_transaction(db: Session, transaction_id: uuid.UUID, transaction: FinancialTransactionUpdate, user_id: str) -> Optional[FinancialTransaction]:
-    db_transaction = get_financial_transaction(db, transaction_id, user_id)
+    db_transaction = get_financial_transaction(db, transaction_id, user_id, for_update=True)
     if db_transaction:
-        # Reverter o impacto no saldo da conta anterior
-        old_account = get_financial_account(db, db_transaction.account_id, user_id)
-        if old_account:
-            if db_transaction.transaction_type == 'income':
-                old_account.balance -= db_transaction.amount
-            else:
-                old_account.balance += db_transaction.amount
+        # Impacto anterior no saldo, revertido junto com o novo num único delta por conta
+        deltas = defaultdict(Decimal)
+        deltas[db_transaction.account_id] -= transaction_balance_delta(db_transaction.transaction_type, db_transaction.amount)
         
         # Aplicar atualizações
+        before = transaction_contribution(db_transaction)
+        before_rollup = rollup_contribution(db_transaction)
         update_data = transaction.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_transaction, field, value)
         db_transaction.updated_at = datetime.utcnow()
         
         # Aplicar novo impacto no saldo
-        new_account = get_financial_account(db, db_transaction.account_id, user_id)
-        if new_account:
-            if db_transaction.transaction_type == 'income':
-                new_account.balance += db_transaction.amount
-            else:
-                new_account.balance -= db_transaction.amount
-            new_account.updated_at = datetime.utcnow()
+        deltas[db_transaction.account_id] += transaction_balance_delta(db_transaction.transaction_type, db_transaction.amount)
+        apply_balance_deltas(db, user_id, deltas)
         
+        apply_dashboard_delta(db, user_id, before=before, after=transaction_contribution(db_transaction))
+        apply_rollup_delta(db, user_id, before=before_rollup, after=rollup_contribution(db_transaction))
         db.commit()
+        invalidate_financial_dashboard(user_id)
         db.refresh(db_transaction)
     return db_transaction
 
 
 def delete_financial_transaction(db: Session, transaction_id: uuid.UUID, user_id: str) -> bool:
-    db_transaction = get_financial_transaction(db, transaction_id, user_id)
+    db_transaction = get_financial_transaction(db, transaction_id, user_id, for_update=True)
     if db_transaction:
         # Reverter o impacto no saldo da conta
-        account = get_financial_account(db, db_transaction.account_id, user_id)
-        if account:
-            if db_transaction.transaction_type == 'income':
-                account.balance -= db_transaction.amount
-            else:
-                account.balance += db_transaction.amount
-            account.updated_at = datetime.utcnow()
+        apply_balance_deltas(db, user_id, {
+            db_transaction.account_id: -transaction_balance_delta(db_transaction.transaction_type, db_transaction.amount)
+        })
         
         db.delete(db_transaction)
+        apply_dashboard_delta(db, user_id, before=transaction_contribution(db_transaction))
+        apply_rollup_delta(db, user_id, before=rollup_contribution(db_transaction))
         db.commit()
+        invalidate_financial_dashboard(user_id)
         return True
     return False
 
@@ -219,12 +482,15 @@ def create_financial_goal(db: Session, goal: FinancialGoalCreate, user_id: str)
     )
     db.add(db_goal)
     db.commit()
+    invalidate_financial_dashboard(user_id)
     db.refresh(db_goal)
     return db_goal
 
 
 def get_financial_goals(db: Session, user_id: str, is_active: Optional[bool] = None) -> List[FinancialGoal]:
-    query = db.query(FinancialGoal).filter(FinancialGoal.user_id == user_id)
+    query = db.query(FinancialGoal).options(
+        joinedload(FinancialGoal.category)
+    ).filter(FinancialGoal.user_id == user_id)
     if is_active is not None:
         query = query.filter(FinancialGoal.is_active == is_active)
     return query.all()
@@ -244,6 +510,7 @@ def update_financial_goal(db: Session, goal_id: uuid.UUID, goal: FinancialGoalUp
             setattr(db_goal, field, value)
         db_goal.updated_at = datetime.utcnow()
         db.commit()
+        invalidate_financial_dashboard(user_id)
         db.refresh(db_goal)
     return db_goal
 
@@ -253,6 +520,7 @@ def delete_financial_goal(db: Session, goal_id: uuid.UUID, user_id: str) -> bool
     if db_goal:
         db.delete(db_goal)
         db.commit()
+        invalidate_financial_dashboard(user_id)
         return True
     return False
 
@@ -266,12 +534,15 @@ def create_financial_budget(db: Session, budget: FinancialBudgetCreate, user_id:
     )
     db.add(db_budget)
     db.commit()
+    invalidate_financial_dashboard(user_id)
     db.refresh(db_budget)
     return db_budget
 
 
 def get_financial_budgets(db: Session, user_id: str, is_active: Optional[bool] = None) -> List[FinancialBudget]:
-    query = db.query(FinancialBudget).filter(FinancialBudget.user_id == user_id)
+    query = db.query(FinancialBudget).options(
+        joinedload(FinancialBudget.category)
+    ).filter(FinancialBudget.user_id == user_id)
     if is_active is not None:
         query = query.filter(FinancialBudget.is_active == is_active)
     return query.all()
@@ -291,6 +562,7 @@ def update_financial_budget(db: Session, budget_id: uuid.UUID, budget: Financial
             setattr(db_budget, field, value)
         db_budget.updated_at = datetime.utcnow()
         db.commit()
+        invalidate_financial_dashboard(user_id)
         db.refresh(db_budget)
     return db_budget
 
@@ -300,82 +572,331 @@ def delete_financial_budget(db: Session, budget_id: uuid.UUID, user_id: str) ->
     if db_budget:
         db.delete(db_budget)
         db.commit()
+        invalidate_financial_dashboard(user_id)
         return True
     return False
 
 
-# Funções de Analytics
-def get_financial_summary(db: Session, user_id: str, start_date: date, end_date: date) -> FinancialSummary:
-    # Receitas no período
-    income_query = db.query(func.sum(FinancialTransaction.amount)).filter(
-        and_(
-            FinancialTransaction.user_id == user_id,
-            FinancialTransaction.transaction_type == 'income',
-            FinancialTransaction.transaction_date >= start_date,
-            FinancialTransaction.transaction_date <= end_date,
-            FinancialTransaction.status == 'completed'
-        )
-    ).scalar() or 0
-    
-    # Despesas no período
-    expenses_query = db.query(func.sum(FinancialTransaction.amount)).filter(
-        and_(
-            FinancialTransaction.user_id == user_id,
-            FinancialTransaction.transaction_type == 'expense',
-            FinancialTransaction.transaction_date >= start_date,
-            FinancialTransaction.transaction_date <= end_date,
-            FinancialTransaction.status == 'completed'
+# CRUD para Financial Category Rules
+def create_financial_category_rule(db: Session, rule: FinancialCategoryRuleCreate, user_id: str) -> FinancialCategoryRule:
+    db_rule = FinancialCategoryRule(
+        **rule.dict(),
+        user_id=user_id,
+        id=uuid.uuid4()
+    )
+    db.add(db_rule)
+    db.commit()
+    db.refresh(db_rule)
+    return db_rule
+
+
+def get_financial_category_rules(db: Session, user_id: str) -> List[FinancialCategoryRule]:
+    """Regras do usuário na ordem em que são avaliadas (prioridade, depois as mais antigas)."""
+    return db.query(FinancialCategoryRule).options(
+        joinedload(FinancialCategoryRule.category)
+    ).filter(
+        FinancialCategoryRule.user_id == user_id
+    ).order_by(FinancialCategoryRule.priority, FinancialCategoryRule.created_at).all()
+
+
+def get_financial_category_rule(db: Session, rule_id: uuid.UUID, user_id: str) -> Optional[FinancialCategoryRule]:
+    return db.query(FinancialCategoryRule).filter(
+        and_(FinancialCategoryRule.id == rule_id, FinancialCategoryRule.user_id == user_id)
+    ).first()
+
+
+def delete_financial_category_rule(db: Session, rule_id: uuid.UUID, user_id: str) -> bool:
+    db_rule = get_financial_category_rule(db, rule_id, user_id)
+    if db_rule:
+        db.delete(db_rule)
+        db.commit()
+        return True
+    return False
+
+
+# Importação de extratos
+def import_bank_statement(
+    db: Session,
+    user_id: str,
+    account_id: uuid.UUID,
+    rows: Iterable[Tuple[int, Dict[str, str]]],
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Optional[Dict[str, Any]]:
+    """
+    Importa os lançamentos de um extrato ((número da linha, {coluna: valor})) como transações
+    completadas da conta. Retorna None se a conta não existir.
+
+    As linhas são consumidas sob demanda e gravadas em lotes de `chunk_size`. A categoria vem da
+    coluna categoria (pelo nome) ou da primeira regra de categorização que casar com a descrição.
+    Lançamentos já importados são ignorados e contados em `duplicates`: pela referência (FITID no OFX)
+    já existente na conta, consultada uma vez por lote, e pelo import_hash (data, valor, descrição e
+    ocorrência no arquivo), com INSERT ... ON CONFLICT DO NOTHING. O saldo da conta recebe uma única
+    variação líquida ao final e tudo é confirmado em um único commit.
+
+    Retorna {"received", "created", "duplicates", "failed", "errors": [{"row", "error"}], "balance"}.
+    """
+    account = get_financial_account(db, account_id, user_id)
+    if not account:
+        return None
+
+    result = {"received": 0, "created": 0, "duplicates": 0, "failed": 0, "errors": []}
+    rules = [
+        (normalize_text(rule.pattern), rule.transaction_type, rule.category_id)
+        for rule in get_financial_category_rules(db, user_id)
+    ]
+    categories = {
+        normalize_text(name): category_id
+        for category_id, name in db.query(FinancialCategory.id, FinancialCategory.name).filter(
+            FinancialCategory.user_id == user_id
         )
-    ).scalar() or 0
-    
-    # Receitas pendentes
-    pending_income = db.query(func.sum(FinancialTransaction.amount)).filter(
-        and_(
-            FinancialTransaction.user_id == user_id,
-            FinancialTransaction.transaction_type == 'income',
-            FinancialTransaction.status == 'pending'
+    }
+    seen_references: Dict[str, int] = {}
+    occurrences: Dict[tuple, int] = defaultdict(int)
+    balance_delta = Decimal(0)
+    dashboard_delta: Dict[str, Any] = defaultdict(Decimal)
+
+    def fail(line: int, error: str):
+        result["failed"] += 1
+        result["errors"].append({"row": line, "error": error})
+
+    def flush(chunk: List[Tuple[int, Dict[str, Any]]]):
+        nonlocal balance_delta
+        inserted = _import_statement_chunk(db, account_id, chunk, result)
+        for transaction in inserted:
+            balance_delta += transaction_balance_delta(transaction.transaction_type, transaction.amount)
+            for field, value in transaction_contribution(transaction).items():
+                dashboard_delta[field] += value
+        add_rollup_contributions(db, user_id, (rollup_contribution(transaction) for transaction in inserted))
+
+    chunk = []
+    for line, row in rows:
+        result["received"] += 1
+        data = {
+            field: next((row[column] for column in columns if row.get(column)), None)
+            for field, columns in STATEMENT_IMPORT_COLUMNS.items()
+        }
+        transaction_date = parse_date(data["date"] or "")
+        if not transaction_date:
+            fail(line, "Data não informada ou inválida")
+            continue
+        amount = parse_amount(data["amount"] or "")
+        if not amount:
+            fail(line, "Valor não informado ou inválido")
+            continue
+        description = " ".join((data["description"] or "").split())
+        if not description:
+            fail(line, "Descrição não informada")
+            continue
+
+        transaction_type = _statement_transaction_type(data["type"], amount)
+        amount = abs(amount).quantize(Decimal("0.01"))
+        reference = (data["reference"] or "")[:100] or None
+        if reference:
+            if reference in seen_references:
+                fail(line, f"Referência '{reference}' repetida no arquivo (linha {seen_references[reference]})")
+                continue
+            seen_references[reference] = line
+
+        normalized_description = normalize_text(description)
+        category_id = categories.get(normalize_text(data["category"])) or next(
+            (
+                rule_category_id for pattern, rule_type, rule_category_id in rules
+                if pattern in normalized_description and rule_type in (None, transaction_type)
+            ),
+            None
         )
-    ).scalar() or 0
-    
-    # Despesas pendentes
-    pending_expenses = db.query(func.sum(FinancialTransaction.amount)).filter(
-        and_(
-            FinancialTransaction.user_id == user_id,
-            FinancialTransaction.transaction_type == 'expense',
-            FinancialTransaction.status == 'pending'
+
+        # Lançamentos idênticos no mesmo dia (ex.: duas tarifas iguais) são distinguidos pela
+        # ocorrência no arquivo, e um extrato que se sobrepõe a outro gera os mesmos hashes
+        signed_amount = transaction_balance_delta(transaction_type, amount)
+        key = (transaction_date, signed_amount, normalized_description)
+        occurrences[key] += 1
+        import_hash = hashlib.sha256(
+            f"{transaction_date.isoformat()}|{signed_amount}|{normalized_description}|{occurrences[key]}".encode("utf-8")
+        ).hexdigest()
+
+        chunk.append((line, {
+            "user_id": user_id,
+            "account_id": account_id,
+            "category_id": category_id,
+            "transaction_type": transaction_type,
+            "amount": amount,
+            "description": description,
+            "reference_number": reference,
+            "transaction_date": transaction_date,
+            "status": "completed",
+            "import_hash": import_hash,
+        }))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+
+    if chunk:
+        flush(chunk)
+
+    apply_balance_deltas(db, user_id, {account_id: balance_delta})
+    apply_dashboard_delta(db, user_id, after=dashboard_delta)
+    db.commit()
+    if result["created"]:
+        invalidate_financial_dashboard(user_id)
+    db.refresh(account)
+    result["balance"] = account.balance
+    result["errors"].sort(key=lambda error: error["row"])
+    return result
+
+
+def _statement_transaction_type(type_value: Optional[str], amount: Decimal) -> str:
+    """Tipo pela coluna tipo (receita/despesa, crédito/débito, C/D) ou, sem ela, pelo sinal do valor."""
+    normalized = normalize_text(type_value)
+    for transaction_type, aliases in STATEMENT_TYPE_ALIASES.items():
+        if normalized in aliases:
+            return transaction_type
+    return 'income' if amount > 0 else 'expense'
+
+
+def _import_statement_chunk(db: Session, account_id: uuid.UUID, chunk: List[Tuple[int, Dict[str, Any]]],
+                            result: Dict[str, Any]) -> List[Row]:
+    """
+    Grava um lote da importação: uma consulta das referências já existentes na conta e um INSERT
+    de várias linhas. Retorna as transações inseridas.
+    """
+    references = [data["reference_number"] for _, data in chunk if data["reference_number"]]
+    existing = set()
+    if references:
+        existing = set(db.scalars(
+            select(FinancialTransaction.reference_number).where(
+                FinancialTransaction.account_id == account_id,
+                FinancialTransaction.reference_number.in_(references)
+            )
+        ).all())
+
+    to_insert = [data for _, data in chunk if not data["reference_number"] or data["reference_number"] not in existing]
+    result["duplicates"] += len(chunk) - len(to_insert)
+    if not to_insert:
+        return []
+
+    # executemany com RETURNING (insertmanyvalues); o ON CONFLICT no índice único (account_id, import_hash)
+    # descarta os lançamentos já importados, inclusive por uma importação concorrente
+    inserted = db.execute(
+        insert(FinancialTransaction.__table__).on_conflict_do_nothing().returning(
+            FinancialTransaction.account_id,
+            FinancialTransaction.category_id,
+            FinancialTransaction.transaction_type,
+            FinancialTransaction.amount,
+            FinancialTransaction.transaction_date,
+            FinancialTransaction.status,
+        ),
+        to_insert
+    ).all()
+    result["created"] += len(inserted)
+    result["duplicates"] += len(to_insert) - len(inserted)
+    return inserted
+
+
+# Funções de Analytics
+def get_financial_summary(db: Session, user_id: str, start_date: date, end_date: date) -> FinancialSummary:
+    """
+    Receitas e despesas completadas no período e pendentes em aberto (de qualquer data),
+    somadas numa única passada com SUM ... FILTER. O índice de cobertura
+    idx_financial_transactions_user_id_summary permite resolver a consulta só pelo índice.
+    """
+    completed = FinancialTransaction.status == 'completed'
+    pending = FinancialTransaction.status == 'pending'
+    income = FinancialTransaction.transaction_type == 'income'
+    expense = FinancialTransaction.transaction_type == 'expense'
+
+    def bucket(*conditions):
+        return func.coalesce(func.sum(FinancialTransaction.amount).filter(and_(*conditions)), 0)
+
+    totals = db.query(
+        bucket(income, completed).label('total_income'),
+        bucket(expense, completed).label('total_expenses'),
+        bucket(income, pending).label('pending_income'),
+        bucket(expense, pending).label('pending_expenses')
+    ).filter(
+        FinancialTransaction.user_id == user_id,
+        or_(
+            pending,
+            and_(
+                completed,
+                FinancialTransaction.transaction_date >= start_date,
+                FinancialTransaction.transaction_date <= end_date
+            )
         )
-    ).scalar() or 0
+    ).one()
     
     return FinancialSummary(
-        total_income=income_query,
-        total_expenses=expenses_query,
-        net_income=income_query - expenses_query,
-        pending_income=pending_income,
-        pending_expenses=pending_expenses,
+        total_income=totals.total_income,
+        total_expenses=totals.total_expenses,
+        net_income=totals.total_income - totals.total_expenses,
+        pending_income=totals.pending_income,
+        pending_expenses=totals.pending_expenses,
         period_start=start_date,
         period_end=end_date
     )
 
 
 def get_category_summary(db: Session, user_id: str, start_date: date, end_date: date) -> List[CategorySummary]:
-    # Query para obter resumo por categoria
+    """
+    Resumo das transações completadas por categoria no período.
+    Os meses inteiros do período vêm de financial_monthly_rollups; só as pontas que não
+    cobrem um mês inteiro são somadas em financial_transactions.
+    """
+    end_exclusive = end_date + timedelta(days=1)
+    full_start = month_start(start_date) if start_date.day == 1 else add_months(start_date, 1)
+    full_end = month_start(end_exclusive)
+
+    raw_range = and_(
+        FinancialTransaction.transaction_date >= start_date,
+        FinancialTransaction.transaction_date < end_exclusive
+    )
+    parts = []
+    if full_start < full_end:
+        parts.append(
+            db.query(
+                FinancialMonthlyRollup.category_id.label('category_id'),
+                func.sum(FinancialMonthlyRollup.total_amount).label('total_amount'),
+                func.sum(FinancialMonthlyRollup.transaction_count).label('transaction_count')
+            ).filter(
+                FinancialMonthlyRollup.user_id == user_id,
+                FinancialMonthlyRollup.category_id.isnot(None),
+                FinancialMonthlyRollup.year_month >= full_start,
+                FinancialMonthlyRollup.year_month < full_end
+            ).group_by(FinancialMonthlyRollup.category_id)
+        )
+        raw_range = and_(
+            raw_range,
+            or_(
+                FinancialTransaction.transaction_date < full_start,
+                FinancialTransaction.transaction_date >= full_end
+            )
+        )
+    parts.append(
+        db.query(
+            FinancialTransaction.category_id.label('category_id'),
+            func.sum(FinancialTransaction.amount).label('total_amount'),
+            func.count(FinancialTransaction.id).label('transaction_count')
+        ).filter(
+            FinancialTransaction.user_id == user_id,
+            FinancialTransaction.category_id.isnot(None),
+            FinancialTransaction.status == 'completed',
+            raw_range
+        ).group_by(FinancialTransaction.category_id)
+    )
+    totals = parts[0].union_all(*parts[1:]).subquery()
+
     results = db.query(
         FinancialCategory.id,
         FinancialCategory.name,
         FinancialCategory.category_type,
-        func.sum(FinancialTransaction.amount).label('total_amount'),
-        func.count(FinancialTransaction.id).label('transaction_count')
+        func.sum(totals.c.total_amount).label('total_amount'),
+        func.sum(totals.c.transaction_count).label('transaction_count')
     ).join(
-        FinancialTransaction, FinancialCategory.id == FinancialTransaction.category_id
-    ).filter(
-        and_(
-            FinancialTransaction.user_id == user_id,
-            FinancialTransaction.transaction_date >= start_date,
-            FinancialTransaction.transaction_date <= end_date,
-            FinancialTransaction.status == 'completed'
-        )
+        totals, FinancialCategory.id == totals.c.category_id
     ).group_by(
         FinancialCategory.id, FinancialCategory.name, FinancialCategory.category_type
+    ).having(
+        func.sum(totals.c.transaction_count) > 0
     ).all()
     
     # Calcular total geral para percentuais
@@ -394,33 +915,33 @@ def get_category_summary(db: Session, user_id: str, start_date: date, end_date:
     ]
 
 
-def get_monthly_trends(db: Session, user_id: str, months: int = 12) -> List[MonthlyTrend]:
-    start_date = datetime.now() - timedelta(days=months * 30)
+def get_monthly_trends(db: Session, user_id: str, months: int = 12, today: Optional[date] = None) -> List[MonthlyTrend]:
+    """Receitas e despesas completadas dos últimos `months` meses (incluindo o atual), a partir dos totais mensais."""
+    start_month = add_months(today or date.today(), -(months - 1))
     
     # Query para tendências mensais
     results = db.query(
-        extract('month', FinancialTransaction.transaction_date).label('month'),
-        extract('year', FinancialTransaction.transaction_date).label('year'),
-        FinancialTransaction.transaction_type,
-        func.sum(FinancialTransaction.amount).label('total_amount')
+        FinancialMonthlyRollup.year_month,
+        FinancialMonthlyRollup.transaction_type,
+        func.sum(FinancialMonthlyRollup.total_amount).label('total_amount')
     ).filter(
         and_(
-            FinancialTransaction.user_id == user_id,
-            FinancialTransaction.transaction_date >= start_date.date(),
-            FinancialTransaction.status == 'completed'
+            FinancialMonthlyRollup.user_id == user_id,
+            FinancialMonthlyRollup.year_month >= start_month
         )
     ).group_by(
-        extract('month', FinancialTransaction.transaction_date),
-        extract('year', FinancialTransaction.transaction_date),
-        FinancialTransaction.transaction_type
+        FinancialMonthlyRollup.year_month,
+        FinancialMonthlyRollup.transaction_type
+    ).having(
+        func.sum(FinancialMonthlyRollup.transaction_count) > 0
     ).all()
     
     # Organizar dados por mês/ano
     monthly_data = {}
     for result in results:
-        key = f"{int(result.year)}-{int(result.month):02d}"
+        key = result.year_month
         if key not in monthly_data:
-            monthly_data[key] = {'income': 0, 'expenses': 0, 'month': int(result.month), 'year': int(result.year)}
+            monthly_data[key] = {'income': 0, 'expenses': 0, 'month': key.month, 'year': key.year}
         
         if result.transaction_type == 'income':
             monthly_data[key]['income'] = result.total_amount
@@ -438,4 +959,4 @@ def get_monthly_trends(db: Session, user_id: str, months: int = 12) -> List[Mont
             net=data['income'] - data['expenses']
         ))
     
-    return trends
\ No newline at end of file
+    return trends
@@ -0,0 +1,181 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import Date, cast, func, literal, select, union
+from sqlalchemy.dialects.postgresql import insert
+import logging
+
+from ..models import FinancialTransaction, FinancialMonthlyRollup
+
+logger = logging.getLogger(__name__)
+
+# Colunas que identificam uma linha de financial_monthly_rollups
+ROLLUP_KEY = ("year_month", "transaction_type", "category_id", "account_id")
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Primeiro dia do mês deslocado em `months` meses a partir do mês de `value`."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def rollup_contribution(transaction: FinancialTransaction) -> Optional[Dict[str, Any]]:
+    """Contribuição de uma transação para os totais mensais (só transações completadas entram)."""
+    if transaction.status != 'completed':
+        return None
+    return {
+        "year_month": month_start(transaction.transaction_date),
+        "transaction_type": transaction.transaction_type,
+        "category_id": transaction.category_id,
+        "account_id": transaction.account_id,
+        "total_amount": Decimal(str(transaction.amount)),
+        "transaction_count": 1,
+    }
+
+
+def apply_rollup_delta(db: Session, user_id: str, before: Optional[Dict[str, Any]] = None,
+                       after: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Aplicar aos totais mensais a diferença entre a contribuição de uma transação antes e depois
+    de uma escrita, num único upsert atômico (col = col + delta).
+    Participa da transação de quem chama, portanto deve ser chamada antes do commit.
+    """
+    _upsert_rollup_deltas(db, user_id, ((before, -1), (after, 1)))
+
+
+def add_rollup_contributions(db: Session, user_id: str, contributions: Iterable[Optional[Dict[str, Any]]]) -> None:
+    """
+    Somar aos totais mensais as contribuições de várias transações novas (ex.: importação em lote),
+    agrupadas por chave num único upsert. Deve ser chamada antes do commit.
+    """
+    _upsert_rollup_deltas(db, user_id, ((contribution, 1) for contribution in contributions))
+
+
+def _upsert_rollup_deltas(db: Session, user_id: str,
+                          contributions: Iterable[Tuple[Optional[Dict[str, Any]], int]]) -> None:
+    deltas: Dict[tuple, Dict[str, Any]] = {}
+    for contribution, sign in contributions:
+        if not contribution:
+            continue
+        key = tuple(contribution[column] for column in ROLLUP_KEY)
+        delta = deltas.setdefault(key, dict(zip(ROLLUP_KEY, key), total_amount=Decimal(0), transaction_count=0))
+        delta["total_amount"] += sign * contribution["total_amount"]
+        delta["transaction_count"] += sign * contribution["transaction_count"]
+
+    rows = [
+        dict(delta, user_id=user_id) for delta in deltas.values()
+        if delta["total_amount"] or delta["transaction_count"]
+    ]
+    if not rows:
+        return
+
+    statement = insert(FinancialMonthlyRollup).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[FinancialMonthlyRollup.user_id, *(getattr(FinancialMonthlyRollup, c) for c in ROLLUP_KEY)],
+        set_={
+            "total_amount": FinancialMonthlyRollup.total_amount + statement.excluded.total_amount,
+            "transaction_count": FinancialMonthlyRollup.transaction_count + statement.excluded.transaction_count,
+        }
+    )
+    db.execute(statement)
+
+
+def fold_category_rollups(db: Session, user_id: str, category_id: Any) -> None:
+    """
+    Mover os totais mensais de uma categoria para as linhas sem categoria, somando-os com um
+    upsert, e apagar as linhas da categoria. Usada antes de excluir a categoria, cujas transações
+    ficam sem categoria. Deve ser chamada antes do commit.
+    """
+    category_rows = select(
+        FinancialMonthlyRollup.user_id,
+        FinancialMonthlyRollup.year_month,
+        FinancialMonthlyRollup.transaction_type,
+        literal(None, FinancialMonthlyRollup.category_id.type),
+        FinancialMonthlyRollup.account_id,
+        FinancialMonthlyRollup.total_amount,
+        FinancialMonthlyRollup.transaction_count
+    ).where(
+        FinancialMonthlyRollup.user_id == user_id,
+        FinancialMonthlyRollup.category_id == category_id
+    )
+
+    statement = insert(FinancialMonthlyRollup).from_select(
+        ["user_id", *ROLLUP_KEY, "total_amount", "transaction_count"], category_rows
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[FinancialMonthlyRollup.user_id, *(getattr(FinancialMonthlyRollup, c) for c in ROLLUP_KEY)],
+        set_={
+            "total_amount": FinancialMonthlyRollup.total_amount + statement.excluded.total_amount,
+            "transaction_count": FinancialMonthlyRollup.transaction_count + statement.excluded.transaction_count,
+        }
+    )
+    db.execute(statement)
+
+    db.query(FinancialMonthlyRollup).filter(
+        FinancialMonthlyRollup.user_id == user_id,
+        FinancialMonthlyRollup.category_id == category_id
+    ).delete(synchronize_session=False)
+
+
+def rebuild_monthly_rollups(db: Session, user_id: str) -> int:
+    """
+    Recalcular os totais mensais do usuário a partir de financial_transactions, num único INSERT ... SELECT.
+    Retorna o número de linhas gravadas.
+    """
+    year_month = cast(func.date_trunc('month', FinancialTransaction.transaction_date), Date)
+    aggregated = select(
+        FinancialTransaction.user_id,
+        year_month,
+        FinancialTransaction.transaction_type,
+        FinancialTransaction.category_id,
+        FinancialTransaction.account_id,
+        func.sum(FinancialTransaction.amount),
+        func.count()
+    ).where(
+        FinancialTransaction.user_id == user_id,
+        FinancialTransaction.status == 'completed'
+    ).group_by(
+        FinancialTransaction.user_id,
+        year_month,
+        FinancialTransaction.transaction_type,
+        FinancialTransaction.category_id,
+        FinancialTransaction.account_id
+    )
+
+    db.query(FinancialMonthlyRollup).filter(
+        FinancialMonthlyRollup.user_id == user_id
+    ).delete(synchronize_session=False)
+    result = db.execute(
+        insert(FinancialMonthlyRollup).from_select(
+            ["user_id", *ROLLUP_KEY, "total_amount", "transaction_count"], aggregated
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def backfill_monthly_rollups(db: Session) -> int:
+    """
+    Recalcular os totais mensais de todos os usuários com transações ou totais gravados,
+    um usuário por transação. Retorna o número de usuários processados.
+    """
+    user_ids = db.execute(
+        union(
+            select(FinancialTransaction.user_id),
+            select(FinancialMonthlyRollup.user_id)
+        )
+    ).scalars().all()
+
+    for user_id in user_ids:
+        try:
+            rebuild_monthly_rollups(db, user_id)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Erro ao recalcular totais mensais financeiros para usuário {user_id}: {str(e)}")
+
+    return len(user_ids)
@@ -1,9 +1,14 @@
 import uuid
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Optional
 from sqlalchemy.orm import Session
 
 from . import models
 from . import schemas
+from .pagination import paginate_query
+from .crud.crud_dashboard_snapshot import (
+    apply_dashboard_delta, invalidate_dashboard_snapshot, artist_contribution
+)
 
 
 def get_artist(db: Session, artist_id: uuid.UUID, user_id: str) -> Optional[models.Artist]:
@@ -14,11 +19,17 @@ def get_artist(db: Session, artist_id: uuid.UUID, user_id: str) -> Optional[mode
     ).first()
 
 
-def get_artists(db: Session, user_id: str, skip: int = 0, limit: int = 100) -> list[models.Artist]:
-    """Lista os artistas do usuário, com suporte para paginação (skip e limit)."""
-    return db.query(models.Artist).filter(
-        models.Artist.user_id == user_id
-    ).offset(skip).limit(limit).all()
+def get_artists(db: Session, user_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Lista os artistas do usuário, paginados por cursor sobre (created_at, id)."""
+    query = db.query(models.Artist).filter(models.Artist.user_id == user_id)
+    return paginate_query(
+        query,
+        (models.Artist.created_at, models.Artist.id),
+        (datetime, uuid.UUID),
+        lambda artist: (artist.created_at, artist.id),
+        limit,
+        cursor
+    )
 
 
 def create_artist(db: Session, artist: schemas.ArtistCreate, user_id: str) -> models.Artist:
@@ -32,6 +43,8 @@ def create_artist(db: Session, artist: schemas.ArtistCreate, user_id: str) -> mo
     artist_data["user_id"] = user_id
     db_artist = models.Artist(**artist_data)
     db.add(db_artist)
+    db.flush()
+    apply_dashboard_delta(db, user_id, after=artist_contribution(db_artist))
     db.commit()
     db.refresh(db_artist)
     return db_artist
@@ -49,9 +62,11 @@ def update_artist(db: Session, artist_id: uuid.UUID, artist_update: schemas.Arti
         models.Artist.user_id == user_id
     ).first()
     if db_artist:
+        before = artist_contribution(db_artist)
         update_data = artist_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_artist, field, value)
+        apply_dashboard_delta(db, user_id, before=before, after=artist_contribution(db_artist))
         db.commit()
         db.refresh(db_artist)
     return db_artist
@@ -68,5 +83,7 @@ def delete_artist(db: Session, artist_id: uuid.UUID, user_id: str) -> Optional[m
     ).first()
     if db_artist:
         db.delete(db_artist)
+        # A exclusão remove eventos em cascata; recalcular o snapshot na próxima leitura
+        invalidate_dashboard_snapshot(db, user_id)
         db.commit()
     return db_artist 
\ No newline at end of file
@@ -1,10 +1,37 @@
+import re
 import uuid
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, union_all, func, and_, or_, false, literal
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert
 
 from . import models
 from . import schemas
+from .normalization import normalize_phone, normalize_cpf_cnpj
+from .pagination import paginate_query
+from .crud.crud_dashboard import invalidate_pipeline_summary
+from .crud.crud_dashboard_snapshot import (
+    apply_dashboard_delta, invalidate_dashboard_snapshot, contractor_contribution
+)
+
+
+# Linhas da planilha gravadas por INSERT na importação em lote
+IMPORT_CHUNK_SIZE = 1000
+
+# Nomes de coluna aceitos na importação, para cada campo do contratante
+IMPORT_COLUMNS = {
+    "name": ("name", "nome"),
+    "phone": ("phone", "telefone", "celular", "whatsapp"),
+    "email": ("email", "e-mail"),
+    "cpf_cnpj": ("cpf_cnpj", "cpf/cnpj", "cpf", "cnpj", "documento"),
+}
+
+# Nome de cada campo nas mensagens de erro da importação
+IMPORT_FIELD_LABELS = {"name": "Nome", "phone": "Telefone", "email": "E-mail", "cpf_cnpj": "CPF/CNPJ"}
+
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
 
 class ContractorError(Exception):
@@ -25,64 +52,198 @@ def get_contractor(db: Session, contractor_id: uuid.UUID, user_id: str) -> Optio
     ).first()
 
 
-def get_contractors(db: Session, user_id: str, skip: int = 0, limit: int = 100) -> list[models.Contractor]:
-    """Lista os contratantes do usuário, com suporte para paginação (skip e limit)."""
-    return db.query(models.Contractor).filter(
-        models.Contractor.user_id == user_id
-    ).offset(skip).limit(limit).all()
+def get_contractors(db: Session, user_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Lista os contratantes do usuário, paginados por cursor sobre (created_at, id)."""
+    query = db.query(models.Contractor).filter(models.Contractor.user_id == user_id)
+    return paginate_query(
+        query,
+        (models.Contractor.created_at, models.Contractor.id),
+        (datetime, uuid.UUID),
+        lambda contractor: (contractor.created_at, contractor.id),
+        limit,
+        cursor
+    )
 
 
-def check_contractor_duplicates(db: Session, contractor: schemas.ContractorCreate, user_id: str, exclude_id: Optional[uuid.UUID] = None) -> None:
+def find_contractor_duplicates(
+    db: Session,
+    user_id: str,
+    phone: Optional[str] = None,
+    cpf_cnpj: Optional[str] = None,
+    name: Optional[str] = None,
+    exclude_id: Optional[uuid.UUID] = None,
+    limit: int = 10
+) -> List[Dict[str, Any]]:
     """
-    Verifica se já existe um contratante com o mesmo CPF/CNPJ ou telefone para o usuário.
-    Levanta DuplicateContractorError se encontrar duplicatas.
+    Busca, em uma única consulta, contratantes que conflitam com os dados informados:
+    - telefone e CPF/CNPJ do usuário comparados pela forma normalizada (E.164 / apenas dígitos);
+    - telefone e CPF/CNPJ de outros usuários comparados como gravados (restrições únicas globais);
+    - opcionalmente, nomes parecidos do usuário (pg_trgm), como sugestão de possível duplicata.
+
+    Retorna dicts com id, name, phone, cpf_cnpj, own, matches (lista de "phone", "cpf_cnpj", "name")
+    e similarity. Registros de outros usuários vêm com own=False e sem dados identificáveis.
     """
-    query = db.query(models.Contractor).filter(models.Contractor.user_id == user_id)
-    
+    if not (phone or cpf_cnpj or name):
+        return []
+
+    own = models.Contractor.user_id == user_id
+    phone_normalized = normalize_phone(phone)
+    cpf_cnpj_normalized = normalize_cpf_cnpj(cpf_cnpj)
+
+    phone_match = false()
+    if phone:
+        phone_match = or_(
+            and_(own, models.Contractor.phone_normalized == phone_normalized),
+            models.Contractor.phone == phone
+        )
+    cpf_cnpj_match = false()
+    if cpf_cnpj:
+        cpf_cnpj_match = or_(
+            and_(own, models.Contractor.cpf_cnpj_normalized == cpf_cnpj_normalized),
+            models.Contractor.cpf_cnpj == cpf_cnpj
+        )
+    name_match = and_(own, models.Contractor.name.op("%")(name)) if name else false()
+    similarity = func.similarity(models.Contractor.name, name) if name else literal(0.0)
+
+    query = select(
+        models.Contractor.id,
+        models.Contractor.name,
+        models.Contractor.phone,
+        models.Contractor.cpf_cnpj,
+        own.label("own"),
+        phone_match.label("phone_match"),
+        cpf_cnpj_match.label("cpf_cnpj_match"),
+        name_match.label("name_match"),
+        similarity.label("similarity"),
+    ).where(or_(phone_match, cpf_cnpj_match, name_match))
+
     # Excluir o próprio registro em caso de atualização
     if exclude_id:
-        query = query.filter(models.Contractor.id != exclude_id)
-    
-    # Verificar CPF/CNPJ duplicado (apenas se fornecido)
-    if contractor.cpf_cnpj:
-        existing_cpf = query.filter(models.Contractor.cpf_cnpj == contractor.cpf_cnpj).first()
-        if existing_cpf:
-            raise DuplicateContractorError(f"Já existe um contratante cadastrado com o CPF/CNPJ '{contractor.cpf_cnpj}' em sua conta.")
-    
-    # Verificar telefone duplicado
-    existing_phone = query.filter(models.Contractor.phone == contractor.phone).first()
-    if existing_phone:
-        raise DuplicateContractorError(f"Já existe um contratante cadastrado com o telefone '{contractor.phone}' em sua conta.")
+        query = query.where(models.Contractor.id != exclude_id)
+
+    # Conflitos exatos primeiro, depois os nomes mais parecidos
+    query = query.order_by(or_(phone_match, cpf_cnpj_match).desc().nulls_last())
+    if name:
+        query = query.order_by(similarity.desc())
+    rows = db.execute(query.limit(limit)).all()
+
+    duplicates = []
+    for row in rows:
+        matches = [
+            field for field, matched in
+            (("phone", row.phone_match), ("cpf_cnpj", row.cpf_cnpj_match), ("name", row.name_match))
+            if matched
+        ]
+        if row.own:
+            duplicates.append({
+                "id": row.id, "name": row.name, "phone": row.phone, "cpf_cnpj": row.cpf_cnpj,
+                "own": True, "matches": matches, "similarity": float(row.similarity or 0),
+            })
+        else:
+            duplicates.append({
+                "id": None, "name": None, "phone": None, "cpf_cnpj": None,
+                "own": False, "matches": matches, "similarity": 0.0,
+            })
+    return duplicates
+
+
+def check_contractor_duplicates(db: Session, contractor: schemas.ContractorCreate, user_id: str, exclude_id: Optional[uuid.UUID] = None) -> None:
+    """
+    Verifica, com uma única consulta, se o CPF/CNPJ ou o telefone já estão cadastrados
+    (em qualquer formatação) para o usuário, ou exatamente iguais para outro usuário.
+    Levanta DuplicateContractorError para duplicatas do usuário e ContractorError para as de outros usuários.
+    """
+    duplicates = find_contractor_duplicates(
+        db, user_id, phone=contractor.phone, cpf_cnpj=contractor.cpf_cnpj, exclude_id=exclude_id
+    )
+
+    for field in ("cpf_cnpj", "phone"):
+        if any(d["own"] and field in d["matches"] for d in duplicates):
+            if field == "cpf_cnpj":
+                raise DuplicateContractorError(f"Já existe um contratante cadastrado com o CPF/CNPJ '{contractor.cpf_cnpj}' em sua conta.")
+            raise DuplicateContractorError(f"Já existe um contratante cadastrado com o telefone '{contractor.phone}' em sua conta.")
+
+    for field in ("cpf_cnpj", "phone"):
+        if any(field in d["matches"] for d in duplicates):
+            if field == "cpf_cnpj":
+                raise ContractorError("Este CPF/CNPJ já está sendo usado por outro usuário no sistema.")
+            raise ContractorError("Este telefone já está sendo usado por outro usuário no sistema.")
 
 
 def create_contractor(db: Session, contractor: schemas.ContractorCreate, user_id: str) -> models.Contractor:
     """
     Recebe um objeto do tipo schemas.ContractorCreate e user_id.
-    Verifica duplicatas antes de criar.
-    Cria uma instância de models.Contractor com os dados recebidos.
-    Adiciona a instância à sessão, comita e atualiza a instância.
+    Cria o contratante com um único INSERT ... ON CONFLICT DO NOTHING: as restrições únicas
+    (telefone e CPF/CNPJ normalizados por usuário, e os valores globais) fazem a verificação de duplicatas.
+    Só quando o INSERT não grava nada a consulta de duplicatas é feita, para identificar o conflito.
     Retorna a instância models.Contractor recém-criada.
     """
-    # Verificar duplicatas no contexto do usuário
-    check_contractor_duplicates(db, contractor, user_id)
-    
+    contractor_data = contractor.dict()
+    contractor_data.update(
+        user_id=user_id,
+        phone_normalized=normalize_phone(contractor.phone),
+        cpf_cnpj_normalized=normalize_cpf_cnpj(contractor.cpf_cnpj),
+    )
+
     try:
-        contractor_data = contractor.dict()
-        contractor_data["user_id"] = user_id
-        db_contractor = models.Contractor(**contractor_data)
-        db.add(db_contractor)
+        db_contractor = db.scalars(
+            insert(models.Contractor).values(**contractor_data).on_conflict_do_nothing().returning(models.Contractor)
+        ).first()
+        if db_contractor is None:
+            check_contractor_duplicates(db, contractor, user_id)
+            raise ContractorError("Erro ao criar contratante. Verifique os dados fornecidos.")
+        apply_dashboard_delta(db, user_id, after=contractor_contribution(db_contractor))
         db.commit()
-        db.refresh(db_contractor)
+        invalidate_pipeline_summary(user_id)
         return db_contractor
-    except IntegrityError as e:
+    except IntegrityError:
         db.rollback()
-        # Tratar erros de constraint global (dados de outros usuários)
-        if "cpf_cnpj" in str(e.orig):
-            raise ContractorError("Este CPF/CNPJ já está sendo usado por outro usuário no sistema.")
-        elif "phone" in str(e.orig):
-            raise ContractorError("Este telefone já está sendo usado por outro usuário no sistema.")
-        else:
-            raise ContractorError("Erro ao criar contratante. Verifique os dados fornecidos.")
+        raise ContractorError("Erro ao criar contratante. Verifique os dados fornecidos.")
+    except ContractorError:
+        db.rollback()
+        raise
+
+
+def get_or_create_contractors_by_phone(db: Session, user_id: str, phones: Iterable[str]) -> Dict[str, uuid.UUID]:
+    """
+    Resolve em lote os contratantes do usuário pelos telefones, criando os que não existem
+    com um único INSERT. Não faz commit.
+    Os telefones são comparados pela forma normalizada, então "5511999887766" encontra
+    um contratante cadastrado como "(11) 99988-7766".
+    Retorna {telefone: contractor_id}; telefones cadastrados por outro usuário ficam de fora.
+    """
+    normalized = {phone: normalize_phone(phone) for phone in set(phones)}
+    normalized = {phone: value for phone, value in normalized.items() if value}
+    if not normalized:
+        return {}
+
+    def find(values):
+        return dict(db.query(models.Contractor.phone_normalized, models.Contractor.id).filter(
+            models.Contractor.user_id == user_id,
+            models.Contractor.phone_normalized.in_(values)
+        ).all())
+
+    found = find(set(normalized.values()))
+    missing = {}
+    for phone in sorted(normalized):
+        if normalized[phone] not in found:
+            missing.setdefault(normalized[phone], phone)
+
+    if missing:
+        # Contratantes novos não têm etapa, então não alteram os contadores do snapshot.
+        # Sem alvo no ON CONFLICT: cobre o telefone global e o telefone normalizado do usuário
+        statement = insert(models.Contractor).values([
+            {"user_id": user_id, "name": f"Contato {phone}", "phone": phone, "phone_normalized": value}
+            for value, phone in missing.items()
+        ]).on_conflict_do_nothing().returning(models.Contractor.phone_normalized, models.Contractor.id)
+        found.update(dict(db.execute(statement).all()))
+
+        # Criados por uma requisição concorrente do mesmo usuário
+        remaining = missing.keys() - found.keys()
+        if remaining:
+            found.update(find(remaining))
+
+    return {phone: found[value] for phone, value in normalized.items() if value in found}
 
 
 def update_contractor(db: Session, contractor_id: uuid.UUID, contractor_update: schemas.ContractorUpdate, user_id: str) -> Optional[models.Contractor]:
@@ -100,32 +261,32 @@ def update_contractor(db: Session, contractor_id: uuid.UUID, contractor_update:
     if not db_contractor:
         return None
     
-    # Verificar duplicatas apenas para campos que estão sendo atualizados
     update_data = contractor_update.dict(exclude_unset=True)
-    if update_data:  # Se há dados para atualizar
-        # Criar um objeto temporário para verificação
-        temp_contractor = schemas.ContractorCreate(
-            name=update_data.get('name', db_contractor.name),
-            cpf_cnpj=update_data.get('cpf_cnpj', db_contractor.cpf_cnpj),
-            email=update_data.get('email', db_contractor.email),
-            phone=update_data.get('phone', db_contractor.phone)
-        )
+    # Criar um objeto temporário para verificação
+    temp_contractor = schemas.ContractorCreate(
+        name=update_data.get('name', db_contractor.name),
+        cpf_cnpj=update_data.get('cpf_cnpj', db_contractor.cpf_cnpj),
+        email=update_data.get('email', db_contractor.email),
+        phone=update_data.get('phone', db_contractor.phone)
+    )
+    # Verificar duplicatas apenas quando telefone ou CPF/CNPJ estão sendo atualizados
+    if update_data.keys() & {"phone", "cpf_cnpj"}:
         check_contractor_duplicates(db, temp_contractor, user_id, exclude_id=contractor_id)
     
     try:
+        before = contractor_contribution(db_contractor)
         for field, value in update_data.items():
             setattr(db_contractor, field, value)
+        apply_dashboard_delta(db, user_id, before=before, after=contractor_contribution(db_contractor))
         db.commit()
         db.refresh(db_contractor)
+        invalidate_pipeline_summary(user_id)
         return db_contractor
-    except IntegrityError as e:
+    except IntegrityError:
         db.rollback()
-        if "cpf_cnpj" in str(e.orig):
-            raise ContractorError("Este CPF/CNPJ já está sendo usado por outro usuário no sistema.")
-        elif "phone" in str(e.orig):
-            raise ContractorError("Este telefone já está sendo usado por outro usuário no sistema.")
-        else:
-            raise ContractorError("Erro ao atualizar contratante. Verifique os dados fornecidos.")
+        # Duplicata gravada por uma requisição concorrente após a verificação
+        check_contractor_duplicates(db, temp_contractor, user_id, exclude_id=contractor_id)
+        raise ContractorError("Erro ao atualizar contratante. Verifique os dados fornecidos.")
 
 
 def delete_contractor(db: Session, contractor_id: uuid.UUID, user_id: str) -> Optional[models.Contractor]:
@@ -139,5 +300,150 @@ def delete_contractor(db: Session, contractor_id: uuid.UUID, user_id: str) -> Op
     ).first()
     if db_contractor:
         db.delete(db_contractor)
+        # A exclusão remove conversas e eventos em cascata; recalcular o snapshot na próxima leitura
+        invalidate_dashboard_snapshot(db, user_id)
         db.commit()
-    return db_contractor
\ No newline at end of file
+        invalidate_pipeline_summary(user_id)
+    return db_contractor
+
+
+def import_contractors(
+    db: Session,
+    user_id: str,
+    rows: Iterable[Tuple[int, Dict[str, str]]],
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Importa contratantes a partir das linhas de uma planilha ((número da linha, {coluna: valor})).
+
+    As linhas são consumidas sob demanda e gravadas em lotes de `chunk_size`: telefones e CPF/CNPJ
+    são normalizados, duplicatas dentro do arquivo são descartadas em memória e as já cadastradas
+    são identificadas com uma consulta por lote, seguida de um INSERT de várias linhas com ON CONFLICT.
+    Tudo é confirmado em um único commit ao final.
+
+    Retorna {"received", "created", "failed", "errors": [{"row", "error"}]}.
+    """
+    result = {"received": 0, "created": 0, "failed": 0, "errors": []}
+    seen_phones: Dict[str, int] = {}
+    seen_cpf_cnpj: Dict[str, int] = {}
+
+    def fail(line: int, error: str):
+        result["failed"] += 1
+        result["errors"].append({"row": line, "error": error})
+
+    chunk = []
+    for line, row in rows:
+        result["received"] += 1
+        data = {
+            field: next((row[column] for column in columns if row.get(column)), None)
+            for field, columns in IMPORT_COLUMNS.items()
+        }
+        if not data["name"]:
+            fail(line, "Nome não informado")
+            continue
+        # Valores acima do tamanho das colunas fariam o INSERT do lote inteiro falhar
+        too_long = next((field for field in IMPORT_COLUMNS if _exceeds_column(field, data[field])), None)
+        if too_long:
+            limit = models.Contractor.__table__.c[too_long].type.length
+            fail(line, f"{IMPORT_FIELD_LABELS[too_long]} com mais de {limit} caracteres")
+            continue
+        if data["email"] and not _EMAIL.match(data["email"]):
+            fail(line, f"E-mail inválido: '{data['email']}'")
+            continue
+        phone_normalized = normalize_phone(data["phone"])
+        if not phone_normalized or _exceeds_column("phone_normalized", phone_normalized):
+            fail(line, "Telefone não informado ou inválido")
+            continue
+        cpf_cnpj_normalized = normalize_cpf_cnpj(data["cpf_cnpj"])
+
+        # Duplicatas dentro do próprio arquivo
+        if phone_normalized in seen_phones:
+            fail(line, f"Telefone repetido no arquivo (linha {seen_phones[phone_normalized]})")
+            continue
+        if cpf_cnpj_normalized and cpf_cnpj_normalized in seen_cpf_cnpj:
+            fail(line, f"CPF/CNPJ repetido no arquivo (linha {seen_cpf_cnpj[cpf_cnpj_normalized]})")
+            continue
+        seen_phones[phone_normalized] = line
+        if cpf_cnpj_normalized:
+            seen_cpf_cnpj[cpf_cnpj_normalized] = line
+
+        chunk.append((line, {
+            **data,
+            "user_id": user_id,
+            "phone_normalized": phone_normalized,
+            "cpf_cnpj_normalized": cpf_cnpj_normalized,
+        }))
+        if len(chunk) >= chunk_size:
+            _import_contractor_chunk(db, user_id, chunk, result, fail)
+            chunk = []
+
+    if chunk:
+        _import_contractor_chunk(db, user_id, chunk, result, fail)
+
+    db.commit()
+    if result["created"]:
+        # Contratantes novos não têm etapa, então não alteram os contadores do snapshot
+        invalidate_pipeline_summary(user_id)
+    result["errors"].sort(key=lambda error: error["row"])
+    return result
+
+
+def _exceeds_column(column: str, value: Optional[str]) -> bool:
+    return value is not None and len(value) > models.Contractor.__table__.c[column].type.length
+
+
+def _import_contractor_chunk(db: Session, user_id: str, chunk: List[Tuple[int, Dict[str, Any]]], result: Dict[str, Any], fail) -> None:
+    """Grava um lote da importação: uma consulta de duplicatas e um INSERT de várias linhas."""
+    phones = [data["phone_normalized"] for _, data in chunk]
+    documents = [data["cpf_cnpj_normalized"] for _, data in chunk if data["cpf_cnpj_normalized"]]
+    raw_phones = [data["phone"] for _, data in chunk]
+    raw_documents = [data["cpf_cnpj"] for _, data in chunk if data["cpf_cnpj"]]
+
+    # Já cadastrados pelo usuário (em qualquer formatação) ou, com o mesmo valor, por outro usuário.
+    # Uma consulta por condição, unidas: cada uma usa o próprio índice (um OR entre listas IN
+    # leva o planejador a percorrer a tabela inteira)
+    own = models.Contractor.user_id == user_id
+    columns = (
+        own.label("own"),
+        models.Contractor.phone, models.Contractor.phone_normalized,
+        models.Contractor.cpf_cnpj, models.Contractor.cpf_cnpj_normalized,
+    )
+    existing = db.execute(union_all(
+        select(*columns).where(own, models.Contractor.phone_normalized.in_(phones)),
+        select(*columns).where(own, models.Contractor.cpf_cnpj_normalized.in_(documents)),
+        select(*columns).where(models.Contractor.phone.in_(raw_phones)),
+        select(*columns).where(models.Contractor.cpf_cnpj.in_(raw_documents)),
+    )).all()
+    own_phones = {row.phone_normalized for row in existing if row.own}
+    own_documents = {row.cpf_cnpj_normalized for row in existing if row.own}
+    taken_phones = {row.phone for row in existing if not row.own}
+    taken_documents = {row.cpf_cnpj for row in existing if not row.own}
+
+    to_insert = []
+    for line, data in chunk:
+        if data["phone_normalized"] in own_phones:
+            fail(line, f"Já existe um contratante cadastrado com o telefone '{data['phone']}' em sua conta.")
+        elif data["cpf_cnpj_normalized"] and data["cpf_cnpj_normalized"] in own_documents:
+            fail(line, f"Já existe um contratante cadastrado com o CPF/CNPJ '{data['cpf_cnpj']}' em sua conta.")
+        elif data["phone"] in taken_phones:
+            fail(line, "Este telefone já está sendo usado por outro usuário no sistema.")
+        elif data["cpf_cnpj"] and data["cpf_cnpj"] in taken_documents:
+            fail(line, "Este CPF/CNPJ já está sendo usado por outro usuário no sistema.")
+        else:
+            to_insert.append((line, data))
+
+    if not to_insert:
+        return
+
+    # executemany com RETURNING: o SQLAlchemy agrupa as linhas em INSERTs de vários VALUES
+    # (insertmanyvalues) sem recompilar a instrução a cada lote
+    inserted = set(db.scalars(
+        insert(models.Contractor.__table__).on_conflict_do_nothing().returning(models.Contractor.phone_normalized),
+        [data for _, data in to_insert]
+    ).all())
+    result["created"] += len(inserted)
+
+    # Gravados por uma requisição concorrente entre a consulta e o INSERT
+    for line, data in to_insert:
+        if data["phone_normalized"] not in inserted:
+            fail(line, "Contratante já cadastrado (telefone ou CPF/CNPJ em uso)")
@@ -1,11 +1,13 @@
 import uuid
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from sqlalchemy import func, insert
 
 from . import models, schemas
 from . import crud_contractor
+from .pagination import paginate_query
+from .crud.crud_dashboard_snapshot import apply_dashboard_delta, conversation_contribution
 
 
 def get_conversation(db: Session, conversation_id: uuid.UUID, user_id: str) -> Optional[models.Conversation]:
@@ -18,16 +20,26 @@ def get_conversation(db: Session, conversation_id: uuid.UUID, user_id: str) -> O
     ).first()
 
 
-def get_conversations(db: Session, user_id: str, skip: int = 0, limit: int = 100) -> List[models.Conversation]:
-    """Lista todas as conversas do usuário, ordenadas pela última mensagem."""
-    return db.query(models.Conversation).options(
+def get_conversations(db: Session, user_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Lista as conversas do usuário, da atividade mais recente para a mais antiga, paginadas por cursor.
+    Conversas sem mensagens usam a data de criação como última atividade.
+    """
+    query = db.query(models.Conversation).options(
         joinedload(models.Conversation.contractor)
     ).filter(
         models.Conversation.user_id == user_id
-    ).order_by(
-        desc(models.Conversation.last_message_at),
-        desc(models.Conversation.created_at)
-    ).offset(skip).limit(limit).all()
+    )
+    return paginate_query(
+        query,
+        # Mesma expressão do índice idx_conversations_user_id_activity
+        (func.coalesce(models.Conversation.last_message_at, models.Conversation.created_at), models.Conversation.id),
+        (datetime, uuid.UUID),
+        lambda conversation: (conversation.last_message_at or conversation.created_at, conversation.id),
+        limit,
+        cursor,
+        descending=True
+    )
 
 
 def create_conversation(db: Session, conversation: schemas.ConversationCreate, user_id: str) -> models.Conversation:
@@ -41,6 +53,8 @@ def create_conversation(db: Session, conversation: schemas.ConversationCreate, u
     conversation_data["user_id"] = user_id
     db_conversation = models.Conversation(**conversation_data)
     db.add(db_conversation)
+    db.flush()
+    apply_dashboard_delta(db, user_id, after=conversation_contribution(db_conversation))
     db.commit()
     db.refresh(db_conversation)
     
@@ -84,6 +98,48 @@ def get_or_create_conversation(db: Session, user_id: str, contractor_phone: str,
     return conversation
 
 
+def get_or_create_conversations_bulk(
+    db: Session, user_id: str, keys: Iterable[Tuple[uuid.UUID, str]]
+) -> Dict[Tuple[uuid.UUID, str], uuid.UUID]:
+    """
+    Resolve em lote as conversas do usuário por (contractor_id, canal), criando as que não existem
+    com um único INSERT. Não faz commit.
+    Retorna {(contractor_id, canal): conversation_id}.
+    """
+    keys = set(keys)
+    if not keys:
+        return {}
+
+    rows = db.query(
+        models.Conversation.contractor_id, models.Conversation.channel, models.Conversation.id
+    ).filter(
+        models.Conversation.user_id == user_id,
+        models.Conversation.contractor_id.in_({contractor_id for contractor_id, _ in keys}),
+        models.Conversation.channel.in_({channel for _, channel in keys})
+    ).order_by(models.Conversation.created_at).all()
+
+    conversation_ids = {}
+    for contractor_id, channel, conversation_id in rows:
+        if (contractor_id, channel) in keys:
+            conversation_ids.setdefault((contractor_id, channel), conversation_id)
+
+    missing = keys - conversation_ids.keys()
+    if missing:
+        statement = insert(models.Conversation).values([
+            {"user_id": user_id, "contractor_id": contractor_id, "channel": channel}
+            for contractor_id, channel in missing
+        ]).returning(
+            models.Conversation.contractor_id, models.Conversation.channel, models.Conversation.id
+        )
+        for contractor_id, channel, conversation_id in db.execute(statement).all():
+            conversation_ids[(contractor_id, channel)] = conversation_id
+
+        # Conversas novas começam abertas
+        apply_dashboard_delta(db, user_id, after={"open_conversations": len(missing)})
+
+    return conversation_ids
+
+
 def update_conversation_last_message(db: Session, conversation_id: uuid.UUID, timestamp: datetime) -> None:
     """Atualiza o timestamp da última mensagem da conversa."""
     db.query(models.Conversation).filter(
@@ -1,10 +1,12 @@
 import uuid
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import date
 from sqlalchemy.orm import Session, joinedload
 
 from . import models
 from . import schemas
+from .pagination import paginate_query
+from .crud.crud_dashboard_snapshot import apply_dashboard_delta, event_contribution
 
 
 def get_event(db: Session, event_id: uuid.UUID, user_id: str) -> Optional[models.Event]:
@@ -18,10 +20,10 @@ def get_event(db: Session, event_id: uuid.UUID, user_id: str) -> Optional[models
     ).first()
 
 
-def get_events(db: Session, user_id: str, skip: int = 0, limit: int = 100, 
-               start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[models.Event]:
+def get_events(db: Session, user_id: str, limit: int = 100, cursor: Optional[str] = None,
+               start_date: Optional[date] = None, end_date: Optional[date] = None) -> Dict[str, Any]:
     """
-    Lista os eventos do usuário, com suporte para paginação e filtros de data.
+    Lista os eventos do usuário, paginados por cursor sobre (event_date, id), com filtros de data.
     Inclui os objetos Artist e Contractor aninhados.
     """
     query = db.query(models.Event).options(
@@ -35,7 +37,14 @@ def get_events(db: Session, user_id: str, skip: int = 0, limit: int = 100,
     if end_date:
         query = query.filter(models.Event.event_date <= end_date)
     
-    return query.offset(skip).limit(limit).all()
+    return paginate_query(
+        query,
+        (models.Event.event_date, models.Event.id),
+        (date, uuid.UUID),
+        lambda event: (event.event_date, event.id),
+        limit,
+        cursor
+    )
 
 
 def create_event(db: Session, event: schemas.EventCreate, user_id: str) -> models.Event:
@@ -63,6 +72,8 @@ def create_event(db: Session, event: schemas.EventCreate, user_id: str) -> model
     event_data["user_id"] = user_id
     db_event = models.Event(**event_data)
     db.add(db_event)
+    db.flush()
+    apply_dashboard_delta(db, user_id, after=event_contribution(db_event))
     db.commit()
     db.refresh(db_event)
     
@@ -105,8 +116,10 @@ def update_event(db: Session, event_id: uuid.UUID, event_update: schemas.EventUp
             raise ValueError("Contratante não encontrado ou não pertence ao usuário")
     
     # Aplicar atualizações
+    before = event_contribution(db_event)
     for field, value in update_data.items():
         setattr(db_event, field, value)
+    apply_dashboard_delta(db, user_id, before=before, after=event_contribution(db_event))
     
     db.commit()
     db.refresh(db_event)
@@ -132,6 +145,7 @@ def delete_event(db: Session, event_id: uuid.UUID, user_id: str) -> Optional[mod
     
     if db_event:
         db.delete(db_event)
+        apply_dashboard_delta(db, user_id, before=event_contribution(db_event))
         db.commit()
     
     return db_event
@@ -0,0 +1,129 @@
+from collections import defaultdict
+from typing import Any, Dict, List
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+
+from . import models, schemas
+from . import crud_message
+from .crud.crud_dashboard import invalidate_pipeline_summary
+
+logger = logging.getLogger(__name__)
+
+# Itens que falharam esse número de vezes deixam de ser processados e ficam na tabela para análise
+MAX_INGRESS_ATTEMPTS = 5
+
+
+def enqueue_ingress_messages(db: Session, ingress_messages: List[schemas.IngressMessage], user_id: str) -> int:
+    """Grava as mensagens na fila de ingressão com um único INSERT. Retorna o número de itens enfileirados."""
+    if not ingress_messages:
+        return 0
+
+    db.execute(insert(models.IngressQueueItem), [
+        {"user_id": user_id, "payload": message.model_dump(mode="json")}
+        for message in ingress_messages
+    ])
+    db.commit()
+    return len(ingress_messages)
+
+
+def drain_ingress_queue(db: Session, batch_size: int = 200) -> int:
+    """
+    Processa um micro-lote da fila: bloqueia os itens mais antigos (FOR UPDATE SKIP LOCKED,
+    para que vários workers drenem em paralelo), grava as mensagens e remove os itens na mesma transação.
+    Se o lote falhar, os itens são reprocessados um a um para isolar o que tem problema.
+    Retorna o número de itens processados.
+    """
+    items = db.query(models.IngressQueueItem).filter(
+        models.IngressQueueItem.attempts < MAX_INGRESS_ATTEMPTS
+    ).order_by(
+        models.IngressQueueItem.id
+    ).limit(batch_size).with_for_update(skip_locked=True).all()
+
+    if not items:
+        db.rollback()
+        return 0
+
+    item_ids = [item.id for item in items]
+    try:
+        user_ids = _write_items(db, items)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        if len(item_ids) == 1:
+            _record_failure(db, item_ids[0], e)
+            return 0
+        logger.warning(f"Falha ao processar lote da fila de ingressão ({len(item_ids)} itens): {str(e)}")
+        return sum(_process_item(db, item_id) for item_id in item_ids)
+
+    for user_id in user_ids:
+        invalidate_pipeline_summary(user_id)
+    return len(item_ids)
+
+
+def get_ingress_queue_metrics(db: Session) -> Dict[str, Any]:
+    """Profundidade da fila, itens com falha definitiva e atraso (idade do item pendente mais antigo)."""
+    pending = models.IngressQueueItem.attempts < MAX_INGRESS_ATTEMPTS
+    depth, failed, lag_seconds = db.query(
+        func.count().filter(pending),
+        func.count().filter(~pending),
+        func.extract("epoch", func.now() - func.min(models.IngressQueueItem.received_at).filter(pending))
+    ).one()
+
+    return {
+        "depth": depth,
+        "failed": failed,
+        "lag_seconds": round(float(lag_seconds or 0), 3),
+    }
+
+
+def _write_items(db: Session, items: List[models.IngressQueueItem]) -> List[str]:
+    """Grava as mensagens dos itens, agrupadas por usuário, e remove os itens da fila. Não faz commit."""
+    messages_by_user = defaultdict(list)
+    for item in items:
+        messages_by_user[item.user_id].append(schemas.IngressMessage(**item.payload))
+
+    for user_id, ingress_messages in messages_by_user.items():
+        crud_message.write_ingress_messages(db, ingress_messages, user_id)
+
+    db.query(models.IngressQueueItem).filter(
+        models.IngressQueueItem.id.in_([item.id for item in items])
+    ).delete(synchronize_session=False)
+    return list(messages_by_user)
+
+
+def _process_item(db: Session, item_id: int) -> int:
+    """Processa um único item em sua própria transação. Retorna 1 se foi processado."""
+    item = db.query(models.IngressQueueItem).filter(
+        models.IngressQueueItem.id == item_id,
+        models.IngressQueueItem.attempts < MAX_INGRESS_ATTEMPTS
+    ).with_for_update(skip_locked=True).first()
+
+    # Já processado, bloqueado por outro worker ou sem tentativas restantes
+    if item is None:
+        db.rollback()
+        return 0
+
+    try:
+        user_ids = _write_items(db, [item])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        _record_failure(db, item_id, e)
+        return 0
+
+    for user_id in user_ids:
+        invalidate_pipeline_summary(user_id)
+    return 1
+
+
+def _record_failure(db: Session, item_id: int, error: Exception) -> None:
+    """Incrementa as tentativas do item e registra o erro."""
+    logger.error(f"Erro ao processar item {item_id} da fila de ingressão: {str(error)}")
+    db.query(models.IngressQueueItem).filter(
+        models.IngressQueueItem.id == item_id
+    ).update({
+        "attempts": models.IngressQueueItem.attempts + 1,
+        "last_error": str(error)
+    }, synchronize_session=False)
+    db.commit()
@@ -1,11 +1,23 @@
 import uuid
-from typing import Optional, List
+import logging
+from typing import Any, Dict, Optional, List, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import desc, func, values, column, select, true, tuple_
+from sqlalchemy.dialects.postgresql import insert, UUID
+from sqlalchemy.types import DateTime
 
 from . import models, schemas
 from . import crud_conversation
+from . import crud_contractor
+from .crud.crud_dashboard import invalidate_pipeline_summary
+from .realtime import queue_inbox_event
+from .pagination import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Número máximo de mensagens aceitas em uma chamada de ingressão em lote
+MAX_INGRESS_BATCH_SIZE = 500
 
 
 def get_message(db: Session, message_id: uuid.UUID, user_id: str) -> Optional[models.Message]:
@@ -16,19 +28,65 @@ def get_message(db: Session, message_id: uuid.UUID, user_id: str) -> Optional[mo
     ).first()
 
 
-def get_messages_by_conversation(db: Session, conversation_id: uuid.UUID, user_id: str, skip: int = 0, limit: int = 100) -> List[models.Message]:
-    """Lista todas as mensagens de uma conversa específica."""
-    # Verificar se a conversa pertence ao usuário
-    conversation = crud_conversation.get_conversation(db, conversation_id, user_id)
-    if not conversation:
-        raise ValueError("Conversa não encontrada ou não pertence ao usuário")
-    
-    return db.query(models.Message).filter(
-        models.Message.conversation_id == conversation_id,
+def get_messages_by_conversation(
+    db: Session,
+    conversation_id: uuid.UUID,
+    user_id: str,
+    limit: int = 100,
+    before: Optional[str] = None,
+    after: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Lista as mensagens de uma conversa com paginação por cursor sobre (timestamp, id).
+    Sem cursor, retorna as mensagens mais recentes; `before` busca as anteriores e `after` as posteriores.
+    A verificação de que a conversa pertence ao usuário é feita na mesma consulta.
+    Retorna {"items", "before_cursor", "after_cursor"}, com os itens em ordem cronológica.
+    """
+    key = tuple_(models.Message.timestamp, models.Message.id)
+    page = select(models.Message).where(
+        models.Message.conversation_id == models.Conversation.id,
         models.Message.user_id == user_id
-    ).order_by(
-        models.Message.timestamp
-    ).offset(skip).limit(limit).all()
+    )
+
+    if after:
+        page = page.where(key > tuple_(*decode_cursor(after, datetime, uuid.UUID))).order_by(
+            models.Message.timestamp, models.Message.id
+        )
+    else:
+        if before:
+            page = page.where(key < tuple_(*decode_cursor(before, datetime, uuid.UUID)))
+        page = page.order_by(desc(models.Message.timestamp), desc(models.Message.id))
+
+    # Uma linha extra indica se há mais mensagens na direção da busca
+    page = page.limit(limit + 1).lateral()
+    message = aliased(models.Message, page)
+
+    rows = db.execute(
+        select(models.Conversation.id, message).outerjoin(page, true()).where(
+            models.Conversation.id == conversation_id,
+            models.Conversation.user_id == user_id
+        )
+    ).all()
+
+    if not rows:
+        raise ValueError("Conversa não encontrada ou não pertence ao usuário")
+
+    messages = [row[1] for row in rows if row[1] is not None]
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    if not after:
+        messages.reverse()
+
+    first_cursor = encode_cursor(messages[0].timestamp, messages[0].id) if messages else after
+    last_cursor = encode_cursor(messages[-1].timestamp, messages[-1].id) if messages else after
+
+    return {
+        "items": messages,
+        # Nulo quando não há mensagens anteriores
+        "before_cursor": first_cursor if after or has_more else None,
+        # Sempre o cursor da mensagem mais recente da página, para buscar (ou aguardar) as seguintes
+        "after_cursor": last_cursor,
+    }
 
 
 def create_message(db: Session, message: schemas.MessageCreate, user_id: str) -> models.Message:
@@ -50,6 +108,9 @@ def create_message(db: Session, message: schemas.MessageCreate, user_id: str) ->
     db.commit()
     db.refresh(db_message)
     
+    # Publicados na caixa de entrada junto com o commit abaixo
+    _queue_message_events(db, user_id, [db_message], {db_message.conversation_id: db_message.timestamp})
+    
     # Atualizar o timestamp da última mensagem na conversa
     crud_conversation.update_conversation_last_message(
         db, message.conversation_id, db_message.timestamp
@@ -58,28 +119,147 @@ def create_message(db: Session, message: schemas.MessageCreate, user_id: str) ->
     return db_message
 
 
+def get_message_by_whatsapp_id(db: Session, whatsapp_message_id: str, user_id: str) -> Optional[models.Message]:
+    """Busca uma mensagem pelo ID da mensagem no WhatsApp e user_id."""
+    return db.query(models.Message).filter(
+        models.Message.whatsapp_message_id == whatsapp_message_id,
+        models.Message.user_id == user_id
+    ).first()
+
+
 def create_ingress_message(db: Session, ingress_data: schemas.IngressMessage, user_id: str) -> models.Message:
-    """Cria uma mensagem a partir de dados externos (endpoint de ingressão)."""
-    # Encontrar ou criar a conversa
-    conversation = crud_conversation.get_or_create_conversation(
-        db, user_id, ingress_data.from_phone, ingress_data.channel
+    """
+    Cria uma mensagem a partir de dados externos (endpoint de ingressão).
+    Idempotente por whatsapp_message_id: uma retentativa do mesmo webhook retorna a mensagem
+    já registrada. Mensagem, whatsapp_message_id e last_message_at são gravados em uma única transação.
+    """
+    if ingress_data.whatsapp_message_id:
+        existing = get_message_by_whatsapp_id(db, ingress_data.whatsapp_message_id, user_id)
+        if existing:
+            return existing
+
+    result, message_ids = write_ingress_messages(db, [ingress_data], user_id)
+    if result["rejected"]:
+        db.rollback()
+        raise ValueError("Este telefone já está sendo usado por outro usuário no sistema.")
+
+    db.commit()
+    invalidate_pipeline_summary(user_id)
+
+    if message_ids:
+        return db.get(models.Message, message_ids[0])
+
+    # Gravada por uma requisição concorrente com o mesmo whatsapp_message_id
+    existing = get_message_by_whatsapp_id(db, ingress_data.whatsapp_message_id, user_id)
+    if not existing:
+        raise ValueError("whatsapp_message_id já registrado para outro usuário")
+    return existing
+
+
+def create_ingress_messages_batch(
+    db: Session, ingress_messages: List[schemas.IngressMessage], user_id: str
+) -> Dict[str, int]:
+    """
+    Cria em lote mensagens vindas de dados externos, em uma única transação.
+    Retorna as contagens de mensagens recebidas, criadas, duplicadas e rejeitadas.
+    """
+    result, _ = write_ingress_messages(db, ingress_messages, user_id)
+    db.commit()
+    invalidate_pipeline_summary(user_id)
+    return result
+
+
+def write_ingress_messages(
+    db: Session, ingress_messages: List[schemas.IngressMessage], user_id: str
+) -> Tuple[Dict[str, int], List[uuid.UUID]]:
+    """
+    Grava mensagens de ingressão sem fazer commit: contratantes e conversas são resolvidos
+    em bloco, as mensagens entram em um único INSERT ... ON CONFLICT (whatsapp_message_id) DO NOTHING
+    e last_message_at é atualizado uma vez por conversa.
+    Retorna as contagens e os IDs das mensagens criadas.
+    """
+    result = {"received": len(ingress_messages), "created": 0, "duplicates": 0, "rejected": 0}
+    if not ingress_messages:
+        return result, []
+
+    contractor_ids = crud_contractor.get_or_create_contractors_by_phone(
+        db, user_id, {message.from_phone for message in ingress_messages}
     )
-    
-    # Criar a mensagem
-    message_data = schemas.MessageCreate(
-        conversation_id=conversation.id,
-        sender_type="user",  # Mensagem vem do contratante
-        content_type=ingress_data.content_type,
-        content=ingress_data.content,
-        timestamp=ingress_data.timestamp or datetime.utcnow()
+
+    accepted = []
+    for message in ingress_messages:
+        if message.from_phone in contractor_ids:
+            accepted.append(message)
+        else:
+            logger.warning(f"Telefone {message.from_phone} pertence a outro usuário; mensagem de ingressão rejeitada")
+            result["rejected"] += 1
+
+    conversation_ids = crud_conversation.get_or_create_conversations_bulk(
+        db, user_id, {(contractor_ids[message.from_phone], message.channel) for message in accepted}
     )
-    
-    message = create_message(db, message_data, user_id)
-    
-    # Se há whatsapp_message_id, atualizar
-    if ingress_data.whatsapp_message_id:
-        message.whatsapp_message_id = ingress_data.whatsapp_message_id
-        db.commit()
-        db.refresh(message)
-    
-    return message
\ No newline at end of file
+
+    rows = []
+    seen_whatsapp_ids = set()
+    for message in accepted:
+        # Repetições do mesmo whatsapp_message_id dentro do lote
+        if message.whatsapp_message_id:
+            if message.whatsapp_message_id in seen_whatsapp_ids:
+                result["duplicates"] += 1
+                continue
+            seen_whatsapp_ids.add(message.whatsapp_message_id)
+
+        rows.append({
+            "user_id": user_id,
+            "conversation_id": conversation_ids[(contractor_ids[message.from_phone], message.channel)],
+            "sender_type": "user",  # Mensagem vem do contratante
+            "content_type": message.content_type,
+            "content": message.content,
+            "whatsapp_message_id": message.whatsapp_message_id,
+            "timestamp": message.timestamp or datetime.utcnow(),
+        })
+
+    message_ids = []
+    if rows:
+        statement = insert(models.Message).values(rows).on_conflict_do_nothing(
+            index_elements=[models.Message.whatsapp_message_id]
+        ).returning(*(c for c in models.Message.__table__.c if c.key != "search_vector"))
+        inserted = db.execute(statement).all()
+        message_ids = [message.id for message in inserted]
+        result["created"] = len(inserted)
+        result["duplicates"] += len(rows) - len(inserted)
+
+        # Última mensagem de cada conversa, aplicada com um único UPDATE
+        last_message_at = {}
+        for message in inserted:
+            if message.conversation_id not in last_message_at or message.timestamp > last_message_at[message.conversation_id]:
+                last_message_at[message.conversation_id] = message.timestamp
+
+        if last_message_at:
+            latest = values(
+                column("conversation_id", UUID(as_uuid=True)),
+                column("timestamp", DateTime(timezone=True)),
+                name="latest"
+            ).data(list(last_message_at.items()))
+            db.query(models.Conversation).filter(
+                models.Conversation.id == latest.c.conversation_id
+            ).update({
+                "last_message_at": func.greatest(models.Conversation.last_message_at, latest.c.timestamp)
+            }, synchronize_session=False)
+
+        _queue_message_events(db, user_id, inserted, last_message_at)
+
+    return result, message_ids
+
+
+def _queue_message_events(db: Session, user_id: str, messages, last_message_at: Dict[uuid.UUID, datetime]) -> None:
+    """Registra os eventos de novas mensagens e conversas atualizadas, publicados no commit da transação."""
+    for message in messages:
+        queue_inbox_event(
+            db, user_id, "message.created",
+            schemas.Message.model_validate(message).model_dump(mode="json")
+        )
+    for conversation_id, timestamp in last_message_at.items():
+        queue_inbox_event(db, user_id, "conversation.updated", {
+            "id": str(conversation_id),
+            "last_message_at": timestamp.isoformat()
+        })
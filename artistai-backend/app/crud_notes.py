@@ -1,26 +1,22 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import and_
 import uuid
 
 from . import models, schemas
+from .pagination import paginate_query
 
 
-def get_notes_by_contractor(db: Session, contractor_id: uuid.UUID, user_id: str, skip: int = 0, limit: int = 100) -> List[models.Note]:
-    """Buscar todas as anotações de um contratante, ordenadas por data de criação (mais recentes primeiro)."""
-    return (
-        db.query(models.Note)
-        .filter(
-            and_(
-                models.Note.contractor_id == contractor_id,
-                models.Note.user_id == user_id
-            )
+def get_notes_by_contractor(db: Session, contractor_id: uuid.UUID, user_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Buscar as anotações de um contratante, paginadas por cursor (mais recentes primeiro)."""
+    query = db.query(models.Note).filter(
+        and_(
+            models.Note.contractor_id == contractor_id,
+            models.Note.user_id == user_id
         )
-        .order_by(desc(models.Note.created_at))
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
+    return _paginate_notes(query, limit, cursor)
 
 
 def get_note(db: Session, note_id: uuid.UUID, user_id: str) -> Optional[models.Note]:
@@ -76,13 +72,19 @@ def delete_note(db: Session, note_id: uuid.UUID, user_id: str) -> bool:
     return True
 
 
-def get_notes_by_user(db: Session, user_id: str, skip: int = 0, limit: int = 100) -> List[models.Note]:
-    """Buscar todas as anotações de um usuário, ordenadas por data de criação (mais recentes primeiro)."""
-    return (
-        db.query(models.Note)
-        .filter(models.Note.user_id == user_id)
-        .order_by(desc(models.Note.created_at))
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
\ No newline at end of file
+def get_notes_by_user(db: Session, user_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Buscar as anotações de um usuário, paginadas por cursor (mais recentes primeiro)."""
+    query = db.query(models.Note).filter(models.Note.user_id == user_id)
+    return _paginate_notes(query, limit, cursor)
+
+
+def _paginate_notes(query, limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+    return paginate_query(
+        query,
+        (models.Note.created_at, models.Note.id),
+        (datetime, uuid.UUID),
+        lambda note: (note.created_at, note.id),
+        limit,
+        cursor,
+        descending=True
+    )
@@ -0,0 +1,142 @@
+import uuid
+from typing import Any, Dict, Optional, Sequence
+from sqlalchemy import select, union_all, literal, null, cast, case, func, or_, tuple_
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
+from sqlalchemy.orm import Session
+
+from . import models
+from .models import SEARCH_CONFIG
+from .pagination import encode_cursor, decode_cursor
+
+SEARCH_TYPES = ("message", "note", "contractor")
+
+# Trechos destacados pelo ts_headline. O conteúdo é escapado para HTML antes (ver _html_escape),
+# então as marcações <mark></mark> são as únicas tags do resultado
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def search(
+    db: Session,
+    user_id: str,
+    q: str,
+    types: Sequence[str] = SEARCH_TYPES,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Busca nas mensagens, anotações e contratantes do usuário, ordenada por relevância.
+
+    - Mensagens e anotações: busca textual (tsvector/websearch_to_tsquery), ranqueada por ts_rank.
+    - Contratantes: nome, telefone e e-mail por trigramas (pg_trgm), ranqueados por similarity.
+
+    Paginada por cursor sobre (rank, id). O destaque (ts_headline) é calculado apenas
+    para os itens da página. Retorna {"items", "next_cursor"}.
+    Levanta InvalidCursorError se o cursor for inválido.
+    """
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    branches = []
+
+    if "message" in types:
+        branches.append(
+            select(
+                literal("message").label("type"),
+                models.Message.id.label("id"),
+                cast(func.ts_rank(models.Message.search_vector, ts_query, 32), DOUBLE_PRECISION).label("rank"),
+                models.Message.content.label("content"),
+                models.Message.conversation_id.label("conversation_id"),
+                models.Conversation.contractor_id.label("contractor_id"),
+                models.Message.timestamp.label("created_at"),
+            ).join(
+                models.Conversation, models.Conversation.id == models.Message.conversation_id
+            ).where(
+                models.Message.user_id == user_id,
+                models.Message.search_vector.op("@@")(ts_query)
+            )
+        )
+
+    if "note" in types:
+        branches.append(
+            select(
+                literal("note").label("type"),
+                models.Note.id.label("id"),
+                cast(func.ts_rank(models.Note.search_vector, ts_query, 32), DOUBLE_PRECISION).label("rank"),
+                models.Note.content.label("content"),
+                null().label("conversation_id"),
+                models.Note.contractor_id.label("contractor_id"),
+                models.Note.created_at.label("created_at"),
+            ).where(
+                models.Note.user_id == user_id,
+                models.Note.search_vector.op("@@")(ts_query)
+            )
+        )
+
+    if "contractor" in types:
+        pattern = "%" + _escape_like(q) + "%"
+        fields = (models.Contractor.name, models.Contractor.phone, models.Contractor.email)
+        branches.append(
+            select(
+                literal("contractor").label("type"),
+                models.Contractor.id.label("id"),
+                cast(
+                    func.greatest(*(func.similarity(field, q) for field in fields)), DOUBLE_PRECISION
+                ).label("rank"),
+                models.Contractor.name.label("content"),
+                null().label("conversation_id"),
+                models.Contractor.id.label("contractor_id"),
+                models.Contractor.created_at.label("created_at"),
+            ).where(
+                models.Contractor.user_id == user_id,
+                # Substring (telefone/e-mail parciais) ou nome parecido, ambos atendidos pelo índice de trigramas
+                or_(
+                    *(field.ilike(pattern, escape="\\") for field in fields),
+                    models.Contractor.name.op("%")(q)
+                )
+            )
+        )
+
+    if not branches:
+        return {"items": [], "next_cursor": None}
+
+    hits = union_all(*branches).subquery("hits")
+    page = select(hits)
+    if cursor:
+        page = page.where(
+            tuple_(hits.c.rank, hits.c.id) < tuple_(*decode_cursor(cursor, float, uuid.UUID))
+        )
+    # Um item a mais indica se existe uma próxima página
+    page = page.order_by(hits.c.rank.desc(), hits.c.id.desc()).limit(limit + 1).subquery("page")
+
+    rows = db.execute(
+        select(
+            page.c.type,
+            page.c.id,
+            page.c.rank,
+            case(
+                (page.c.type == "contractor", _html_escape(page.c.content)),
+                else_=func.ts_headline(SEARCH_CONFIG, _html_escape(page.c.content), ts_query, HEADLINE_OPTIONS)
+            ).label("highlight"),
+            page.c.conversation_id,
+            page.c.contractor_id,
+            page.c.created_at,
+        ).order_by(page.c.rank.desc(), page.c.id.desc())
+    ).mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["id"])
+    return {"items": [dict(row) for row in rows], "next_cursor": next_cursor}
+
+
+def _html_escape(column):
+    """
+    Escapa &, <, > e aspas em SQL. O conteúdo vem de remetentes externos (WhatsApp) e o destaque
+    é exibido como HTML; o parser do ts_headline trata as entidades como símbolos, não como palavras.
+    """
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#39;")):
+        column = func.replace(column, char, entity)
+    return column
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -1,20 +1,24 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 import uuid
 
 from . import models, schemas
+from .pagination import paginate_query
+from .crud.crud_dashboard import invalidate_pipeline_summary
+from .crud.crud_dashboard_snapshot import apply_dashboard_delta
 
 
-def get_stages(db: Session, user_id: str, skip: int = 0, limit: int = 100) -> List[models.PipelineStage]:
-    """Buscar todas as etapas do pipeline de um usuário, ordenadas por order."""
-    return (
-        db.query(models.PipelineStage)
-        .filter(models.PipelineStage.user_id == user_id)
-        .order_by(models.PipelineStage.order)
-        .offset(skip)
-        .limit(limit)
-        .all()
+def get_stages(db: Session, user_id: str, limit: int = 100, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Buscar as etapas do pipeline de um usuário, ordenadas por order e paginadas por cursor."""
+    query = db.query(models.PipelineStage).filter(models.PipelineStage.user_id == user_id)
+    return paginate_query(
+        query,
+        (models.PipelineStage.order, models.PipelineStage.id),
+        (int, uuid.UUID),
+        lambda stage: (stage.order, stage.id),
+        limit,
+        cursor
     )
 
 
@@ -42,6 +46,7 @@ def create_stage(db: Session, stage: schemas.PipelineStageCreate, user_id: str)
     db.add(db_stage)
     db.commit()
     db.refresh(db_stage)
+    invalidate_pipeline_summary(user_id)
     return db_stage
 
 
@@ -57,6 +62,7 @@ def update_stage(db: Session, stage_id: uuid.UUID, stage_update: schemas.Pipelin
     
     db.commit()
     db.refresh(db_stage)
+    invalidate_pipeline_summary(user_id)
     return db_stage
 
 
@@ -66,29 +72,18 @@ def delete_stage(db: Session, stage_id: uuid.UUID, user_id: str) -> bool:
     if not db_stage:
         return False
     
-    # Verificar se há contratantes usando esta etapa
-    contractors_count = (
-        db.query(models.Contractor)
-        .filter(
-            and_(
-                models.Contractor.stage_id == stage_id,
-                models.Contractor.user_id == user_id
-            )
+    # Remover a referência dos contratantes que usam esta etapa antes de deletar
+    unassigned_count = db.query(models.Contractor).filter(
+        and_(
+            models.Contractor.stage_id == stage_id,
+            models.Contractor.user_id == user_id
         )
-        .count()
-    )
-    
-    if contractors_count > 0:
-        # Se há contratantes, remover a referência antes de deletar
-        db.query(models.Contractor).filter(
-            and_(
-                models.Contractor.stage_id == stage_id,
-                models.Contractor.user_id == user_id
-            )
-        ).update({models.Contractor.stage_id: None})
+    ).update({models.Contractor.stage_id: None}, synchronize_session=False)
+    apply_dashboard_delta(db, user_id, before={"active_leads_count": unassigned_count})
     
     db.delete(db_stage)
     db.commit()
+    invalidate_pipeline_summary(user_id)
     return True
 
 
@@ -102,18 +97,28 @@ def reorder_stages(db: Session, stage_orders: List[dict], user_id: str) -> List[
     Returns:
         Lista das etapas atualizadas
     """
-    updated_stages = []
+    new_orders = {uuid.UUID(str(stage_order['id'])): stage_order['order'] for stage_order in stage_orders}
     
-    for stage_order in stage_orders:
-        stage_id = stage_order['id']
-        new_order = stage_order['order']
-        
-        db_stage = get_stage(db, stage_id, user_id)
+    # Buscar todas as etapas envolvidas em uma única consulta
+    stages_by_id = {
+        stage.id: stage
+        for stage in db.query(models.PipelineStage).filter(
+            and_(
+                models.PipelineStage.id.in_(list(new_orders.keys())),
+                models.PipelineStage.user_id == user_id
+            )
+        ).all()
+    }
+    
+    updated_stages = []
+    for stage_id, new_order in new_orders.items():
+        db_stage = stages_by_id.get(stage_id)
         if db_stage:
             db_stage.order = new_order
             updated_stages.append(db_stage)
     
     db.commit()
+    invalidate_pipeline_summary(user_id)
     
     # Refresh all updated stages
     for stage in updated_stages:
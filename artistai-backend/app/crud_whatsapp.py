@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -20,6 +20,31 @@ def get_whatsapp_instance_by_instance_name(db: Session, instance_name: str) -> O
     ).first()
 
 
+def get_all_whatsapp_instances(db: Session) -> List[models.WhatsAppInstance]:
+    """Lista todas as instâncias de WhatsApp (usado na atualização periódica de status)."""
+    return db.query(models.WhatsAppInstance).order_by(models.WhatsAppInstance.created_at).all()
+
+
+def update_whatsapp_instance_statuses(db: Session, statuses: Dict[str, str]) -> int:
+    """
+    Atualiza o status de várias instâncias de uma vez, a partir de {instance_name: status}.
+    Executa um UPDATE por status distinto e retorna o número de linhas alteradas.
+    """
+    names_by_status: Dict[str, List[str]] = {}
+    for instance_name, status in statuses.items():
+        names_by_status.setdefault(status, []).append(instance_name)
+
+    updated = 0
+    for status, instance_names in names_by_status.items():
+        updated += db.query(models.WhatsAppInstance).filter(
+            models.WhatsAppInstance.instance_name.in_(instance_names),
+            models.WhatsAppInstance.status != status
+        ).update({"status": status}, synchronize_session=False)
+
+    db.commit()
+    return updated
+
+
 def create_whatsapp_instance(
     db: Session, 
     user_id: uuid.UUID, 
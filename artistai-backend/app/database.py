@@ -1,22 +1,194 @@
-import os
+import asyncio
+import threading
+import time
+import uuid
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 
+from .config.database import DatabaseConfig
+
 # Carrega as variáveis de ambiente do arquivo .env
 # Especifica o caminho absoluto para o arquivo .env
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+db_config = DatabaseConfig()
+
+DATABASE_URL = db_config.url
 
 if DATABASE_URL is None:
     raise ValueError("A variável de ambiente DATABASE_URL não foi definida.")
 
+# Habilita o caminho assíncrono (AsyncEngine/AsyncSession com asyncpg)
+DATABASE_ASYNC = db_config.use_async
+
+
+class PoolMetrics:
+    """
+    Métricas acumuladas de um pool de conexões: checkouts, tempo de espera
+    por uma conexão livre, timeouts e pico de overflow.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_peak = 0
+
+    def record_checkout(self, wait_seconds: float, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+            self.overflow_peak = max(self.overflow_peak, overflow)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "overflow_peak": self.overflow_peak,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+def _instrumented_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """
+    Cria uma subclasse do pool que mede o tempo de espera de cada checkout.
+    A classe carrega as métricas consigo, então elas sobrevivem a engine.dispose().
+    """
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                metrics.record_timeout()
+                raise
+            metrics.record_checkout(time.perf_counter() - started, self.overflow())
+            return connection
+
+    return InstrumentedPool
+
+
+# Parâmetros de URL da libpq (psycopg2) que o asyncpg.connect não aceita
+LIBPQ_SSL_PARAMS = ("sslmode", "sslrootcert", "sslcert", "sslkey")
+LIBPQ_ONLY_PARAMS = (
+    "gssencmode", "channel_binding", "keepalives", "keepalives_idle", "keepalives_interval", "keepalives_count"
+)
+
+
+def get_async_database_url(url: str) -> Tuple[URL, Dict[str, Any]]:
+    """
+    Converte a URL do banco para o driver asyncpg.
+    Os parâmetros da libpq saem da URL: sslmode (com os certificados), connect_timeout e
+    application_name viram os connect_args equivalentes do asyncpg e os demais são descartados.
+    Retorna a URL convertida e esses connect_args.
+    """
+    parsed = make_url(url)
+    if parsed.drivername in ("postgresql", "postgresql+psycopg2", "postgres"):
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+
+    query = dict(parsed.query)
+    connect_args: Dict[str, Any] = {}
+
+    ssl_params = {name: query.pop(name) for name in LIBPQ_SSL_PARAMS if name in query}
+    if ssl_params:
+        connect_args["ssl"] = _asyncpg_ssl(**ssl_params)
+    if "connect_timeout" in query:
+        connect_args["timeout"] = float(query.pop("connect_timeout"))
+    if "application_name" in query:
+        connect_args["server_settings"] = {"application_name": query.pop("application_name")}
+    for name in LIBPQ_ONLY_PARAMS:
+        query.pop(name, None)
+
+    return parsed.set(query=query), connect_args
+
+
+def _asyncpg_ssl(sslmode: str = "prefer", sslrootcert: Optional[str] = None,
+                 sslcert: Optional[str] = None, sslkey: Optional[str] = None) -> Any:
+    """
+    O asyncpg aceita os mesmos valores de sslmode da libpq; com certificados na URL,
+    monta um SSLContext com a mesma verificação.
+    """
+    if sslmode == "disable" or not (sslrootcert or sslcert):
+        return sslmode
+
+    import ssl
+
+    context = ssl.create_default_context(cafile=sslrootcert)
+    if sslcert:
+        context.load_cert_chain(sslcert, sslkey)
+    # Como na libpq: só verify-full confere o nome do servidor, e o certificado só é validado
+    # em verify-ca/verify-full ou em require com um certificado raiz informado
+    context.check_hostname = sslmode == "verify-full"
+    if not (sslmode in ("verify-ca", "verify-full") or (sslmode == "require" and sslrootcert)):
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def create_db_engine(config: DatabaseConfig, metrics: PoolMetrics):
+    """
+    Cria a engine síncrona (psycopg2) com o pool configurado.
+    psycopg2 não usa prepared statements no servidor, então funciona com o pooler em modo transação.
+    """
+    return create_engine(
+        config.url,
+        poolclass=_instrumented_pool_class(QueuePool, metrics),
+        **config.engine_options()
+    )
+
+
+def create_async_db_engine(config: DatabaseConfig, metrics: PoolMetrics):
+    """
+    Cria a engine assíncrona (asyncpg) com o pool configurado, a partir da mesma DATABASE_URL da síncrona.
+    No modo transação do pooler, desabilita os caches de prepared statements do asyncpg
+    e gera nomes únicos, já que cada transação pode cair em outra conexão do servidor.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url, connect_args = get_async_database_url(config.url)
+    if config.transaction_pooler:
+        connect_args.update({
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        })
+
+    return create_async_engine(
+        url,
+        poolclass=_instrumented_pool_class(AsyncAdaptedQueuePool, metrics),
+        connect_args=connect_args,
+        **config.engine_options()
+    )
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
 # Cria a engine de conexão com o banco de dados
-engine = create_engine(DATABASE_URL)
+engine = create_db_engine(db_config, pool_metrics)
 
 # Cria uma fábrica de sessões para interagir com o banco
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -24,6 +196,31 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base para as classes de modelo declarativas do SQLAlchemy
 Base = declarative_base()
 
+async_engine = None
+AsyncSessionLocal = None
+
+if DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = create_async_db_engine(db_config, async_pool_metrics)
+    # expire_on_commit=False evita carregamentos implícitos após o commit,
+    # que não são permitidos fora do contexto assíncrono
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """
+    Estado atual e métricas acumuladas dos pools de conexão deste processo.
+    """
+    status = {
+        "max_connections_per_engine": db_config.max_connections,
+        "transaction_pooler": db_config.transaction_pooler,
+        "sync": pool_metrics.snapshot(engine.pool),
+    }
+    if async_engine is not None:
+        status["async"] = async_pool_metrics.snapshot(async_engine.sync_engine.pool)
+    return status
+
 
 def get_db():
     """
@@ -34,4 +231,74 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    Versão assíncrona de get_db. Requer DATABASE_ASYNC habilitado.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("DATABASE_ASYNC não está habilitado.")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+T = TypeVar("T")
+
+
+class DBRunner:
+    """
+    Executa as funções CRUD (síncronas) a partir de rotas assíncronas sem bloquear o event loop.
+
+    - Com DATABASE_ASYNC habilitado, usa AsyncSession.run_sync: a função roda sobre a
+      conexão asyncpg e não ocupa uma thread enquanto espera o banco.
+    - Caso contrário, executa a função no threadpool com uma sessão síncrona.
+
+    As funções recebem a sessão como primeiro argumento, como em todos os módulos crud_*.
+    """
+
+    def __init__(self, session: Any):
+        self.session = session
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if isinstance(self.session, Session):
+            return await run_in_threadpool(fn, self.session, *args, **kwargs)
+        return await self.session.run_sync(fn, *args, **kwargs)
+
+
+async def run_concurrently(*calls: Callable[[Any], Any]) -> List[Any]:
+    """
+    Executa leituras independentes em paralelo, cada uma em sua própria sessão (e conexão),
+    e retorna os resultados na ordem das chamadas. Cada chamada recebe só a sessão;
+    use functools.partial para fixar os demais argumentos.
+    O tempo total é o da leitura mais lenta, ao custo de uma conexão do pool por chamada.
+    """
+    async def run_one(fn: Callable[[Any], Any]) -> Any:
+        if DATABASE_ASYNC:
+            async with AsyncSessionLocal() as db:
+                return await db.run_sync(fn)
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            return await run_in_threadpool(fn, db)
+        finally:
+            await run_in_threadpool(db.close)
+
+    return list(await asyncio.gather(*(run_one(fn) for fn in calls)))
+
+
+async def get_db_runner():
+    """
+    Dependência para rotas assíncronas: fornece um DBRunner sobre a sessão configurada.
+    """
+    if DATABASE_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield DBRunner(db)
+    else:
+        # Como no caminho assíncrono, os objetos retornados não expiram no commit:
+        # a serialização da resposta acontece no event loop e não deve voltar ao banco
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            yield DBRunner(db)
+        finally:
+            await run_in_threadpool(db.close)
@@ -1,37 +1,110 @@
+import hashlib
+import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from supabase import create_client, Client
 from jose import JWTError, jwt
 from dotenv import load_dotenv
 
+from .cache import TTLCache
+
+if TYPE_CHECKING:
+    from supabase import Client
+
 # Carrega as variáveis de ambiente do arquivo .env
 # Especifica o caminho absoluto para o arquivo .env
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+logger = logging.getLogger(__name__)
+
 # Configuração do Supabase
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
 
-if not all([SUPABASE_URL, SUPABASE_SERVICE_KEY]):
-    raise ValueError("SUPABASE_URL e SUPABASE_SERVICE_KEY devem estar definidas no .env")
+# Cliente Supabase, criado apenas no primeiro uso (ver get_supabase_client)
+_supabase_client: Optional["Client"] = None
+_supabase_lock = threading.Lock()
+
 
-# Cliente Supabase
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+def get_supabase_client() -> "Client":
+    """
+    Retorna o cliente Supabase, criando-o no primeiro uso.
+    A importação do SDK e a criação do cliente ficam fora do caminho de inicialização da API.
+    """
+    global _supabase_client
+    if _supabase_client is None:
+        with _supabase_lock:
+            if _supabase_client is None:
+                if not all([SUPABASE_URL, SUPABASE_SERVICE_KEY]):
+                    raise ValueError("SUPABASE_URL e SUPABASE_SERVICE_KEY devem estar definidas no .env")
+                from supabase import create_client
+
+                _supabase_client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+    return _supabase_client
 
 # Esquema de autenticação Bearer
 security = HTTPBearer()
 
 class User:
+    __slots__ = ("id", "email", "role")
+
     def __init__(self, id: str, email: str, role: str = "authenticated"):
         self.id = id
         self.email = email
         self.role = role
 
+
+# Cache de usuários autenticados, indexado pelo hash do token.
+# Evita decodificar e validar o mesmo JWT a cada requisição.
+AUTH_CACHE_MAX_TTL_SECONDS = 300
+AUTH_CACHE_MAXSIZE = 4096
+
+_user_cache = TTLCache(ttl_seconds=AUTH_CACHE_MAX_TTL_SECONDS, maxsize=AUTH_CACHE_MAXSIZE)
+
+def _get_cached_user(token: str) -> User:
+    """
+    Valida o token e retorna o User correspondente, reutilizando o resultado
+    enquanto o token não expirar (até AUTH_CACHE_MAX_TTL_SECONDS).
+    Levanta JWTError se o token for inválido.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    user = _user_cache.get(key)
+    if user is not None:
+        return user
+
+    payload = jwt.decode(
+        token,
+        SUPABASE_JWT_SECRET,
+        algorithms=["HS256"],
+        audience="authenticated"
+    )
+
+    user_id = payload.get("sub")
+    if not user_id:
+        raise JWTError("user_id não encontrado no payload")
+
+    user = User(
+        id=user_id,
+        email=payload.get("email") or "",
+        role=payload.get("role", "authenticated")
+    )
+
+    ttl = AUTH_CACHE_MAX_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        _user_cache.set(key, user, ttl_seconds=ttl)
+
+    logger.debug("Usuário autenticado: user_id=%s", user.id)
+    return user
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> User:
@@ -39,56 +112,23 @@ async def get_current_user(
     Extrai e valida o token JWT do cabeçalho Authorization.
     Retorna os dados do usuário se o token for válido.
     """
-    token = credentials.credentials
-    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Token de acesso inválido",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+    if not SUPABASE_JWT_SECRET:
+        logger.error("SUPABASE_JWT_SECRET não está definido")
+        raise credentials_exception
+
     try:
-        # Verificar o token usando JWT direto
-        if not SUPABASE_JWT_SECRET:
-            print("SUPABASE_JWT_SECRET não está definido")
-            raise credentials_exception
-            
-        print(f"Token recebido: {token[:50]}...")
-        print(f"JWT Secret disponível: {bool(SUPABASE_JWT_SECRET)}")
-        
-        payload = jwt.decode(
-            token, 
-            SUPABASE_JWT_SECRET, 
-            algorithms=["HS256"],
-            audience="authenticated"
-        )
-        
-        print(f"Payload decodificado: {payload}")
-        
-        user_id = payload.get("sub")
-        email = payload.get("email")
-        role = payload.get("role", "authenticated")
-        
-        if not user_id:
-            print("user_id não encontrado no payload")
-            raise credentials_exception
-            
-        user = User(
-            id=user_id,
-            email=email or "",
-            role=role
-        )
-        
-        print(f"Usuário autenticado: {user.id} - {user.email}")
-        return user
-        
+        return _get_cached_user(credentials.credentials)
     except JWTError as e:
-        print(f"Erro JWT: {e}")
-        print(f"Tipo do erro: {type(e)}")
+        logger.debug("Token JWT inválido: %s", e)
         raise credentials_exception
     except Exception as e:
-        print(f"Erro ao validar token: {e}")
-        print(f"Tipo do erro: {type(e)}")
+        logger.debug("Erro ao validar token: %s (%s)", e, type(e).__name__)
         raise credentials_exception
 
 async def get_current_user_optional(
@@ -104,4 +144,4 @@ async def get_current_user_optional(
     try:
         return await get_current_user(credentials)
     except HTTPException:
-        return None
\ No newline at end of file
+        return None
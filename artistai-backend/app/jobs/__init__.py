@@ -0,0 +1 @@
+# Jobs executados fora do ciclo de requisições (cron, linha de comando)
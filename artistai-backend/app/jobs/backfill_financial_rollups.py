@@ -0,0 +1,30 @@
+"""
+Backfill dos totais mensais financeiros.
+
+Recalcula financial_monthly_rollups a partir de financial_transactions para todos os usuários.
+Necessário uma vez após criar a tabela; pode ser reexecutado para corrigir divergências
+das atualizações incrementais (ex.: escritas feitas fora das funções CRUD).
+
+Uso:
+    python -m app.jobs.backfill_financial_rollups
+"""
+import logging
+
+from ..database import SessionLocal
+from ..crud.crud_financial_rollup import backfill_monthly_rollups
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        users = backfill_monthly_rollups(db)
+        logger.info(f"Totais mensais financeiros recalculados para {users} usuários")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
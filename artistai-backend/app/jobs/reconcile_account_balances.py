@@ -0,0 +1,34 @@
+"""
+Reconciliação dos saldos das contas financeiras.
+
+Confere, em lote, o saldo de cada conta contra saldo inicial + receitas - despesas das
+suas transações e corrige as contas divergentes (ex.: escritas feitas fora das funções CRUD).
+
+Uso (ex.: agendado via cron):
+    python -m app.jobs.reconcile_account_balances
+"""
+import logging
+
+from ..database import SessionLocal
+from ..crud.crud_financial import reconcile_account_balances
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        corrected = reconcile_account_balances(db)
+        for account in corrected:
+            logger.warning(
+                f"Saldo da conta {account['account_id']} (usuário {account['user_id']}) corrigido: "
+                f"{account['balance']} -> {account['expected']}"
+            )
+        logger.info(f"{len(corrected)} contas financeiras com saldo corrigido")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
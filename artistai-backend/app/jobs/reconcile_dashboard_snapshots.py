@@ -0,0 +1,29 @@
+"""
+Reconciliação periódica dos snapshots do dashboard.
+
+Recalcula todos os registros de dashboard_snapshots a partir das tabelas de origem,
+corrigindo divergências das atualizações incrementais.
+
+Uso (ex.: agendado via cron):
+    python -m app.jobs.reconcile_dashboard_snapshots
+"""
+import logging
+
+from ..database import SessionLocal
+from ..crud.crud_dashboard_snapshot import reconcile_dashboard_snapshots
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        reconciled = reconcile_dashboard_snapshots(db)
+        logger.info(f"{reconciled} snapshots do dashboard reconciliados")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
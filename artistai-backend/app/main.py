@@ -1,9 +1,41 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import artists, contractors, events, conversations, whatsapp, stages, notes, financial, dashboard
+from .database import get_pool_status, async_engine, engine
+from .realtime import inbox_broker
+from .services import evolution_service, whatsapp_service, ingest_worker
+from .routers import artists, contractors, events, conversations, whatsapp, stages, notes, financial, dashboard, search
 
-app = FastAPI(title="artistAI API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Recursos compartilhados pelo processo: criados na inicialização e liberados no encerramento."""
+    await evolution_service.start()
+    await inbox_broker.start(engine.url.set(drivername="postgresql").render_as_string(hide_password=False))
+    await ingest_worker.start()
+    
+    status_refresher = None
+    if evolution_service.config.is_configured and evolution_service.config.status_refresh_interval > 0:
+        status_refresher = asyncio.create_task(whatsapp_service.run_status_refresher())
+    
+    yield
+    
+    if status_refresher is not None:
+        status_refresher.cancel()
+        try:
+            await status_refresher
+        except asyncio.CancelledError:
+            pass
+    await ingest_worker.stop()
+    await inbox_broker.stop()
+    await evolution_service.close()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+app = FastAPI(title="artistAI API", version="1.0.0", lifespan=lifespan)
 
 # Configurar CORS para desenvolvimento e produção
 allowed_origins = [
@@ -88,6 +120,13 @@ app.include_router(
     tags=["Dashboard"]
 )
 
+# Incluir o router de busca
+app.include_router(
+    search.router,
+    prefix="/api/v1",
+    tags=["Busca"]
+)
+
 @app.get("/", tags=["Health Check"])
 def read_root():
     """Endpoint para verificar se a API está online."""
@@ -96,4 +135,14 @@ def read_root():
 @app.get("/health", tags=["Health Check"])
 def health_check():
     """Endpoint de health check para Docker e monitoramento."""
-    return {"status": "healthy", "service": "artistAI Backend"}
\ No newline at end of file
+    return {"status": "healthy", "service": "artistAI Backend"}
+
+@app.get("/health/db-pool", tags=["Health Check"])
+def db_pool_status():
+    """Métricas do pool de conexões com o banco (checkouts, espera e overflow)."""
+    return get_pool_status()
+
+@app.get("/health/ingress-queue", tags=["Health Check"])
+def ingress_queue_status():
+    """Métricas da fila de ingressão assíncrona (profundidade, atraso e itens processados)."""
+    return ingest_worker.get_metrics()
\ No newline at end of file
@@ -9,13 +9,16 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     Enum,
-    Date
+    Date,
+    BigInteger,
+    Computed
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred, validates
 from sqlalchemy.sql import func
 
 from .database import Base
+from .normalization import normalize_phone, normalize_cpf_cnpj
 
 # Definição dos ENUMs para uso nos modelos
 # (Os nomes devem corresponder aos tipos criados no banco de dados)
@@ -36,6 +39,9 @@ gamification_achievement_category_enum = Enum('sales', 'communication', 'events'
 gamification_challenge_type_enum = Enum('daily', 'weekly', 'monthly', name='challenge_type')
 gamification_reward_type_enum = Enum('points', 'badge', 'feature', name='reward_type')
 
+# Configuração de texto do Postgres usada na busca (stemming e stopwords em português)
+SEARCH_CONFIG = 'portuguese'
+
 
 class Artist(Base):
     __tablename__ = "artists"
@@ -75,6 +81,9 @@ class Contractor(Base):
     cpf_cnpj = Column(String(18), unique=True)
     email = Column(String(255))
     phone = Column(String(20), nullable=False, unique=True)
+    # Formas normalizadas (E.164 e apenas dígitos), únicas por usuário: detectam duplicatas com outra formatação
+    phone_normalized = Column(String(24))
+    cpf_cnpj_normalized = Column(String(18))
     stage_id = Column(UUID(as_uuid=True), ForeignKey("pipeline_stages.id"), nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -84,6 +93,16 @@ class Contractor(Base):
     stage = relationship("PipelineStage", back_populates="contractors")
     notes = relationship("Note", back_populates="contractor")
 
+    @validates("phone")
+    def _set_phone_normalized(self, key, phone):
+        self.phone_normalized = normalize_phone(phone)
+        return phone
+
+    @validates("cpf_cnpj")
+    def _set_cpf_cnpj_normalized(self, key, cpf_cnpj):
+        self.cpf_cnpj_normalized = normalize_cpf_cnpj(cpf_cnpj)
+        return cpf_cnpj
+
 
 class Conversation(Base):
     __tablename__ = "conversations"
@@ -109,6 +128,10 @@ class Message(Base):
     content = Column(Text, nullable=False)
     whatsapp_message_id = Column(String(255), unique=True)
     timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    # Gerada pelo banco para a busca textual; só é carregada quando referenciada explicitamente
+    search_vector = deferred(Column(
+        TSVECTOR, Computed(f"to_tsvector('{SEARCH_CONFIG}', content)", persisted=True)
+    ))
 
     conversation = relationship("Conversation", back_populates="messages")
 
@@ -168,6 +191,9 @@ class Note(Base):
     contractor_id = Column(UUID(as_uuid=True), ForeignKey("contractors.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    search_vector = deferred(Column(
+        TSVECTOR, Computed(f"to_tsvector('{SEARCH_CONFIG}', content)", persisted=True)
+    ))
     
     contractor = relationship("Contractor", back_populates="notes")
 
@@ -181,6 +207,8 @@ class FinancialAccount(Base):
     bank_name = Column(String(255))
     account_number = Column(String(50))
     balance = Column(Numeric(15, 2), nullable=False, default=0.00)
+    # Saldo antes de qualquer transação: balance = opening_balance + receitas - despesas
+    opening_balance = Column(Numeric(15, 2), nullable=False, default=0.00)
     is_active = Column(Boolean, nullable=False, default=True)
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -224,6 +252,9 @@ class FinancialTransaction(Base):
     tax_category = Column(String(100))  # For tax reporting
     notes = Column(Text)
     
+    # Importação de extrato: hash da linha importada, único por conta (evita importar o mesmo lançamento duas vezes)
+    import_hash = Column(String(64), nullable=True)
+    
     # Metadata
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -269,6 +300,21 @@ class FinancialBudget(Base):
     category = relationship("FinancialCategory")
 
 
+class FinancialCategoryRule(Base):
+    __tablename__ = "financial_category_rules"
+    # Regras de categorização da importação de extratos: lançamentos cuja descrição contém
+    # `pattern` recebem a categoria. Avaliadas em ordem crescente de prioridade.
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(String(255), nullable=False)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("financial_categories.id", ondelete="CASCADE"), nullable=False)
+    pattern = Column(String(255), nullable=False)
+    transaction_type = Column(transaction_type_enum, nullable=True)  # Vazio: vale para receitas e despesas
+    priority = Column(Integer, nullable=False, default=0)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    
+    category = relationship("FinancialCategory")
+
+
 # Modelos de Gamificação
 class UserStats(Base):
     __tablename__ = "user_stats"
@@ -356,4 +402,47 @@ class CommunicationStats(Base):
     active_conversations = Column(Integer, default=0)
     last_activity = Column(TIMESTAMP(timezone=True), nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
-    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+class DashboardSnapshot(Base):
+    __tablename__ = "dashboard_snapshots"
+    # Contadores do dashboard principal, um registro por usuário.
+    # Mantidos incrementalmente pelas operações de escrita e reconciliados periodicamente.
+    user_id = Column(String(255), primary_key=True)
+    active_artists_count = Column(Integer, nullable=False, default=0)
+    active_leads_count = Column(Integer, nullable=False, default=0)
+    upcoming_events_count = Column(Integer, nullable=False, default=0)
+    monthly_income = Column(Numeric(15, 2), nullable=False, default=0.00)
+    monthly_expenses = Column(Numeric(15, 2), nullable=False, default=0.00)
+    open_conversations = Column(Integer, nullable=False, default=0)
+    needs_attention = Column(Integer, nullable=False, default=0)
+    computed_on = Column(Date, nullable=False)  # Dia de referência das janelas (mês corrente, próximos 30 dias)
+    refreshed_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+
+
+class FinancialMonthlyRollup(Base):
+    __tablename__ = "financial_monthly_rollups"
+    # Totais mensais das transações completadas por tipo, categoria e conta.
+    # Mantidos incrementalmente pelas operações de escrita e recalculados pelo job de backfill.
+    # Chave única: (user_id, year_month, transaction_type, category_id, account_id), com NULLS NOT DISTINCT
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(String(255), nullable=False)
+    year_month = Column(Date, nullable=False)  # Primeiro dia do mês
+    transaction_type = Column(transaction_type_enum, nullable=False)
+    # Sem CASCADE: ao excluir a categoria, os totais vão para as linhas sem categoria (fold_category_rollups)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("financial_categories.id"), nullable=True)
+    account_id = Column(UUID(as_uuid=True), ForeignKey("financial_accounts.id", ondelete="CASCADE"), nullable=False)
+    total_amount = Column(Numeric(15, 2), nullable=False, default=0.00)
+    transaction_count = Column(Integer, nullable=False, default=0)
+
+
+class IngressQueueItem(Base):
+    __tablename__ = "ingress_queue"
+    # Fila durável de mensagens recebidas pelo endpoint de ingressão assíncrono.
+    # Os itens são removidos quando gravados em messages/conversations.
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(String(255), nullable=False)
+    payload = Column(JSONB, nullable=False)  # schemas.IngressMessage serializado
+    received_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
@@ -0,0 +1,43 @@
+import re
+import unicodedata
+from typing import Optional
+
+# Código do país assumido para números nacionais (DDD + número)
+DEFAULT_COUNTRY_CODE = "55"
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """
+    Normaliza um telefone para E.164 (ex.: "(11) 99988-7766" e "5511999887766" -> "+5511999887766").
+    Números sem código do país (10 ou 11 dígitos com DDD) recebem o DEFAULT_COUNTRY_CODE.
+    Retorna None se não houver dígitos.
+    """
+    if phone is None:
+        return None
+    digits = _NON_DIGITS.sub("", phone)
+    if not digits:
+        return None
+    if not phone.strip().startswith("+"):
+        # Prefixos de discagem (0xx, 00) não fazem parte do número
+        digits = digits.lstrip("0")
+        if len(digits) in (10, 11):
+            digits = DEFAULT_COUNTRY_CODE + digits
+    return "+" + digits
+
+
+def normalize_cpf_cnpj(cpf_cnpj: Optional[str]) -> Optional[str]:
+    """Mantém apenas os dígitos do CPF/CNPJ. Retorna None se não houver dígitos."""
+    if cpf_cnpj is None:
+        return None
+    return _NON_DIGITS.sub("", cpf_cnpj) or None
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Texto para comparação: minúsculas, sem acentos e com espaços simples (ex.: "  PIX  Recebido João" -> "pix recebido joao")."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(without_accents.lower().split())
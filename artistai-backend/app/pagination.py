@@ -0,0 +1,93 @@
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou adulterado"""
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """Codifica os valores da chave de ordenação de um registro em um cursor opaco."""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    """
+    Decodifica um cursor gerado por encode_cursor, convertendo cada valor para o tipo informado.
+    Levanta InvalidCursorError se o cursor for inválido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Cursor inválido")
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursorError("Cursor inválido")
+
+    try:
+        return [_decode_value(value, value_type) for value, value_type in zip(values, types)]
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Cursor inválido")
+
+
+def paginate_query(
+    query: Query,
+    sort_keys: Sequence[Any],
+    key_types: Sequence[type],
+    row_key: Callable[[Any], Sequence[Any]],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Dict[str, Any]:
+    """
+    Paginação por cursor (keyset) de uma query ORM.
+
+    A query é ordenada por `sort_keys` (o último deve ser único, normalmente o id) e, com `cursor`,
+    continua a partir do último registro da página anterior com uma comparação de tupla,
+    que o Postgres resolve pelo índice composto sem percorrer as páginas já lidas.
+    `row_key` extrai de um registro os valores das chaves, na mesma ordem de `sort_keys`.
+
+    Retorna {"items", "next_cursor"}; `next_cursor` é None na última página.
+    Levanta InvalidCursorError se o cursor for inválido.
+    """
+    key = tuple_(*sort_keys)
+    if cursor:
+        bound = tuple_(*decode_cursor(cursor, *key_types))
+        query = query.filter(key < bound if descending else key > bound)
+
+    order = [sort_key.desc() if descending else sort_key.asc() for sort_key in sort_keys]
+    # Um registro a mais indica se existe uma próxima página
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*row_key(rows[-1]))
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(value: Any, value_type: type) -> Any:
+    if value is None:
+        return None
+    if value_type is datetime:
+        return datetime.fromisoformat(value)
+    if value_type is date:
+        return date.fromisoformat(value)
+    return value_type(value)
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Canal do Postgres usado para distribuir os eventos entre workers (LISTEN/NOTIFY)
+INBOX_NOTIFY_CHANNEL = "inbox_events"
+# O payload de NOTIFY é limitado a 8000 bytes; conteúdos maiores são enviados sem o texto da mensagem
+MAX_NOTIFY_PAYLOAD_BYTES = 7500
+# Eventos acumulados por assinante antes de descartar (cliente lento)
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class InboxBroker:
+    """
+    Pub/sub em processo para eventos da caixa de entrada (novas mensagens, conversas atualizadas).
+    Com INBOX_PG_NOTIFY habilitado, os eventos passam pelo Postgres (NOTIFY) e cada processo
+    os recebe por uma conexão dedicada com LISTEN, alcançando assinantes de todos os workers.
+    """
+
+    def __init__(self):
+        self.use_pg_notify = os.getenv("INBOX_PG_NOTIFY", "false").lower() in ("1", "true", "yes")
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    async def start(self, database_url: Optional[str] = None):
+        """Associa o broker ao event loop da aplicação e inicia o LISTEN, se habilitado."""
+        self._loop = asyncio.get_running_loop()
+        if self.use_pg_notify and database_url:
+            self._stopping.clear()
+            self._listener = threading.Thread(
+                target=self._listen, args=(database_url,), name="inbox-listener", daemon=True
+            )
+            self._listener.start()
+
+    async def stop(self):
+        self._stopping.set()
+        if self._listener is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._listener.join)
+            self._listener = None
+        self._loop = None
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id: str, inbox_event: Dict[str, Any]):
+        """Entrega um evento aos assinantes locais. Pode ser chamado de qualquer thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(user_id, inbox_event)
+        else:
+            loop.call_soon_threadsafe(self._deliver, user_id, inbox_event)
+
+    def _deliver(self, user_id: str, inbox_event: Dict[str, Any]):
+        for queue in list(self._subscribers.get(user_id, ())):
+            try:
+                queue.put_nowait(inbox_event)
+            except asyncio.QueueFull:
+                logger.debug("Assinante lento da caixa de entrada; evento descartado (user_id=%s)", user_id)
+
+    def _listen(self, database_url: str):
+        """Recebe os NOTIFY do Postgres em uma conexão dedicada (fora do pool) e os entrega localmente."""
+        import psycopg2
+        import psycopg2.extensions
+
+        while not self._stopping.is_set():
+            try:
+                connection = psycopg2.connect(database_url)
+                connection.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {INBOX_NOTIFY_CHANNEL}")
+
+                while not self._stopping.is_set():
+                    if select.select([connection], [], [], 1.0) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notification = connection.notifies.pop(0)
+                        message = json.loads(notification.payload)
+                        self.publish(message["user_id"], message["event"])
+                connection.close()
+            except Exception as e:
+                logger.error(f"Erro na conexão LISTEN da caixa de entrada: {str(e)}")
+                self._stopping.wait(5)
+
+
+inbox_broker = InboxBroker()
+
+
+def queue_inbox_event(db: Session, user_id: str, event_type: str, data: Dict[str, Any]) -> None:
+    """
+    Registra um evento da caixa de entrada para ser publicado quando a transação de `db` for confirmada.
+    Eventos de transações desfeitas nunca são publicados.
+    """
+    inbox_event = {"type": event_type, "data": data}
+
+    if inbox_broker.use_pg_notify:
+        # NOTIFY é transacional: o Postgres só entrega após o commit
+        payload = json.dumps({"user_id": user_id, "event": inbox_event}, default=str)
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD_BYTES:
+            inbox_event = {"type": event_type, "data": {**data, "content": None, "content_truncated": True}}
+            payload = json.dumps({"user_id": user_id, "event": inbox_event}, default=str)
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": INBOX_NOTIFY_CHANNEL, "payload": payload}
+        )
+        return
+
+    db.info.setdefault("inbox_events", []).append((user_id, inbox_event))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_inbox_events(session: Session):
+    for user_id, inbox_event in session.info.pop("inbox_events", ()):
+        inbox_broker.publish(user_id, inbox_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_inbox_events(session: Session):
+    session.info.pop("inbox_events", None)
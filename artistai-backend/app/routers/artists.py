@@ -1,11 +1,12 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from .. import schemas, crud_artist
 from ..dependencies import get_current_user, User
+from ..pagination import InvalidCursorError
 
 router = APIRouter()
 
@@ -22,18 +23,24 @@ def create_artist(
     return crud_artist.create_artist(db=db, artist=artist, user_id=current_user.id)
 
 
-@router.get("/artists/", response_model=List[schemas.Artist])
+@router.get("/artists/", response_model=schemas.Page[schemas.Artist])
 def read_artists(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Listar artistas com paginação.
+    Listar artistas com paginação por cursor.
+    Use `next_cursor` da resposta como `cursor` para buscar a próxima página.
     """
-    artists = crud_artist.get_artists(db=db, user_id=current_user.id, skip=skip, limit=limit)
-    return artists
+    try:
+        return crud_artist.get_artists(db=db, user_id=current_user.id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/artists/{artist_id}", response_model=schemas.Artist)
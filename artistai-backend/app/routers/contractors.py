@@ -1,12 +1,14 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from .. import schemas, crud_contractor
+from ..database import get_db, get_db_runner, DBRunner
+from .. import schemas, crud_contractor, spreadsheet
 from ..dependencies import get_current_user, User
 from ..crud_contractor import ContractorError, DuplicateContractorError
+from ..pagination import InvalidCursorError
+from ..uploads import request_content_type, spooled_request_body
 
 router = APIRouter()
 
@@ -35,18 +37,73 @@ def create_contractor(
         )
 
 
-@router.get("/contractors/", response_model=List[schemas.Contractor])
+@router.get("/contractors/", response_model=schemas.Page[schemas.Contractor])
 def read_contractors(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Listar contratantes com paginação.
+    Listar contratantes com paginação por cursor.
+    Use `next_cursor` da resposta como `cursor` para buscar a próxima página.
     """
-    contractors = crud_contractor.get_contractors(db=db, user_id=current_user.id, skip=skip, limit=limit)
-    return contractors
+    try:
+        return crud_contractor.get_contractors(db=db, user_id=current_user.id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/contractors/import", response_model=schemas.ContractorImportResult)
+async def import_contractors(
+    request: Request,
+    db: DBRunner = Depends(get_db_runner),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Importar contratantes em lote a partir de uma planilha enviada no corpo da requisição
+    (Content-Type text/csv ou XLSX). Colunas: nome/name, telefone/phone, email, cpf_cnpj.
+    Telefones e CPF/CNPJ já cadastrados (em qualquer formatação) ou repetidos no arquivo
+    são ignorados e listados em `errors` com o número da linha.
+    """
+    content_type = request_content_type(request)
+
+    async with spooled_request_body(request) as upload:
+        try:
+            rows = spreadsheet.iter_rows(upload, content_type)
+            return await db.run(crud_contractor.import_contractors, user_id=current_user.id, rows=rows)
+        except spreadsheet.UnsupportedSpreadsheetError as e:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=str(e)
+            )
+        except spreadsheet.SpreadsheetError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+
+@router.get("/contractors/duplicates", response_model=List[schemas.ContractorDuplicate])
+def read_contractor_duplicates(
+    phone: Optional[str] = None,
+    cpf_cnpj: Optional[str] = None,
+    name: Optional[str] = Query(None, min_length=3),
+    exclude_id: Optional[uuid.UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Verificar possíveis duplicatas antes de cadastrar ou editar um contratante.
+    Telefone e CPF/CNPJ são comparados em qualquer formatação; `name` busca nomes parecidos.
+    Conflitos com contratantes de outros usuários aparecem com `own` falso e sem dados.
+    """
+    return crud_contractor.find_contractor_duplicates(
+        db=db, user_id=current_user.id, phone=phone, cpf_cnpj=cpf_cnpj, name=name, exclude_id=exclude_id
+    )
 
 
 @router.get("/contractors/{contractor_id}", response_model=schemas.Contractor)
@@ -1,47 +1,108 @@
 import uuid
 import os
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
+import json
+import asyncio
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Request
+from fastapi.responses import StreamingResponse
 
-from ..database import get_db
-from .. import schemas, crud_conversation, crud_message
+from ..database import get_db_runner, DBRunner
+from .. import schemas, crud_conversation, crud_message, crud_ingress_queue
 from ..dependencies import get_current_user, User
+from ..realtime import inbox_broker
+from ..pagination import InvalidCursorError
 
 router = APIRouter()
 
 # Chave de API para o endpoint de ingressão
 API_KEY = os.getenv("INGRESS_API_KEY", "your-secret-api-key-here")
 
+# Intervalo dos comentários keep-alive do stream de eventos (mantém proxies com a conexão aberta)
+EVENTS_KEEPALIVE_SECONDS = 15
 
-@router.get("/conversations/", response_model=List[schemas.Conversation])
-def read_conversations(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+
+@router.get("/conversations/", response_model=schemas.Page[schemas.Conversation])
+async def read_conversations(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: DBRunner = Depends(get_db_runner),
+    current_user: User = Depends(get_current_user)
+):
+    """Lista as conversas do usuário logado, da atividade mais recente para a mais antiga, paginadas por cursor."""
+    try:
+        return await db.run(
+            crud_conversation.get_conversations, user_id=current_user.id, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/conversations/events")
+async def stream_inbox_events(
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
-    """Lista todas as conversas do usuário logado."""
-    conversations = crud_conversation.get_conversations(
-        db=db, user_id=current_user.id, skip=skip, limit=limit
+    """
+    Stream (Server-Sent Events) da caixa de entrada do usuário logado.
+    Autenticado pelo cabeçalho Authorization, como as demais rotas: o token de acesso não é aceito
+    na query string, que fica registrada nos logs de acesso.
+    Eventos: `message.created` (dados de schemas.Message) e `conversation.updated` (id e last_message_at).
+    """
+    queue = inbox_broker.subscribe(current_user.id)
+    
+    async def event_stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    inbox_event = await asyncio.wait_for(queue.get(), timeout=EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {inbox_event['type']}\ndata: {json.dumps(inbox_event['data'], default=str)}\n\n"
+        finally:
+            inbox_broker.unsubscribe(current_user.id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    return conversations
 
 
-@router.get("/conversations/{conversation_id}/messages", response_model=List[schemas.Message])
-def read_conversation_messages(
+@router.get("/conversations/{conversation_id}/messages", response_model=schemas.MessagePage)
+async def read_conversation_messages(
     conversation_id: uuid.UUID,
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    db: DBRunner = Depends(get_db_runner),
     current_user: User = Depends(get_current_user)
 ):
-    """Lista todas as mensagens de uma conversa específica."""
+    """
+    Lista as mensagens de uma conversa, paginadas por cursor.
+    Sem cursor, retorna as mais recentes; use `before_cursor` como `before` para carregar o histórico
+    e `after_cursor` como `after` para buscar mensagens novas.
+    """
+    if before and after:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use apenas um dos parâmetros: before ou after"
+        )
+    
     try:
-        messages = crud_message.get_messages_by_conversation(
-            db=db, conversation_id=conversation_id, user_id=current_user.id, skip=skip, limit=limit
+        return await db.run(
+            crud_message.get_messages_by_conversation,
+            conversation_id=conversation_id, user_id=current_user.id, limit=limit, before=before, after=after
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        return messages
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -50,10 +111,10 @@ def read_conversation_messages(
 
 
 @router.post("/conversations/ingress", response_model=schemas.Message)
-def ingress_message(
+async def ingress_message(
     ingress_data: schemas.IngressMessage,
     x_api_key: str = Header(..., alias="X-API-Key"),
-    db: Session = Depends(get_db)
+    db: DBRunner = Depends(get_db_runner)
 ):
     """Endpoint de ingressão para mensagens externas (n8n)."""
     # Verificar a chave de API
@@ -68,8 +129,8 @@ def ingress_message(
     user_id = "default-user-id"  # AJUSTAR CONFORME SUA LÓGICA
     
     try:
-        message = crud_message.create_ingress_message(
-            db=db, ingress_data=ingress_data, user_id=user_id
+        message = await db.run(
+            crud_message.create_ingress_message, ingress_data=ingress_data, user_id=user_id
         )
         return message
     except ValueError as e:
@@ -79,11 +140,74 @@ def ingress_message(
         )
 
 
+@router.post("/conversations/ingress/batch", response_model=schemas.IngressBatchResult)
+async def ingress_messages_batch(
+    ingress_messages: List[schemas.IngressMessage],
+    x_api_key: str = Header(..., alias="X-API-Key"),
+    db: DBRunner = Depends(get_db_runner)
+):
+    """Endpoint de ingressão em lote para mensagens externas (n8n), em uma única transação."""
+    if x_api_key != API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Chave de API inválida"
+        )
+    
+    if len(ingress_messages) > crud_message.MAX_INGRESS_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O lote excede o limite de {crud_message.MAX_INGRESS_BATCH_SIZE} mensagens"
+        )
+    
+    # Mesmo user_id padrão do endpoint de ingressão individual
+    user_id = "default-user-id"  # AJUSTAR CONFORME SUA LÓGICA
+    
+    return await db.run(
+        crud_message.create_ingress_messages_batch, ingress_messages=ingress_messages, user_id=user_id
+    )
+
+
+@router.post(
+    "/conversations/ingress/queue",
+    response_model=schemas.IngressQueued,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def enqueue_ingress_messages(
+    ingress_data: Union[schemas.IngressMessage, List[schemas.IngressMessage]],
+    x_api_key: str = Header(..., alias="X-API-Key"),
+    db: DBRunner = Depends(get_db_runner)
+):
+    """
+    Endpoint de ingressão assíncrona: valida e grava as mensagens na fila durável e responde 202.
+    As mensagens são gravadas em conversas pelos workers da fila (services.ingest_worker).
+    """
+    if x_api_key != API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Chave de API inválida"
+        )
+    
+    ingress_messages = ingress_data if isinstance(ingress_data, list) else [ingress_data]
+    if len(ingress_messages) > crud_message.MAX_INGRESS_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"O lote excede o limite de {crud_message.MAX_INGRESS_BATCH_SIZE} mensagens"
+        )
+    
+    # Mesmo user_id padrão do endpoint de ingressão individual
+    user_id = "default-user-id"  # AJUSTAR CONFORME SUA LÓGICA
+    
+    queued = await db.run(
+        crud_ingress_queue.enqueue_ingress_messages, ingress_messages=ingress_messages, user_id=user_id
+    )
+    return schemas.IngressQueued(queued=queued)
+
+
 @router.post("/conversations/{conversation_id}/messages", response_model=schemas.Message)
-def create_message(
+async def create_message(
     conversation_id: uuid.UUID,
     message_data: schemas.MessageCreate,
-    db: Session = Depends(get_db),
+    db: DBRunner = Depends(get_db_runner),
     current_user: User = Depends(get_current_user)
 ):
     """Cria uma nova mensagem em uma conversa (para respostas manuais)."""
@@ -91,8 +215,8 @@ def create_message(
     message_data.conversation_id = conversation_id
     
     try:
-        message = crud_message.create_message(
-            db=db, message=message_data, user_id=current_user.id
+        message = await db.run(
+            crud_message.create_message, message=message_data, user_id=current_user.id
         )
         return message
     except ValueError as e:
@@ -1,8 +1,7 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_db_runner, DBRunner
 from ..dependencies import get_current_user, User
 from ..crud import crud_dashboard
 from ..schemas import (
@@ -18,13 +17,13 @@ router = APIRouter()
 
 
 @router.get("/kpis", response_model=DashboardKPIs)
-def get_dashboard_kpis(
-    db: Session = Depends(get_db),
+async def get_dashboard_kpis(
+    db: DBRunner = Depends(get_db_runner),
     current_user: User = Depends(get_current_user)
 ):
     """Obter KPIs principais do dashboard."""
     try:
-        kpis_data = crud_dashboard.get_kpis(db=db, user_id=current_user.id)
+        kpis_data = await db.run(crud_dashboard.get_kpis, user_id=current_user.id)
         return DashboardKPIs(**kpis_data)
     except Exception as e:
         logger.error(f"Erro ao buscar KPIs para usuário {current_user.id}: {str(e)}")
@@ -35,13 +34,13 @@ def get_dashboard_kpis(
 
 
 @router.get("/pipeline-summary", response_model=List[PipelineSummaryItem])
-def get_pipeline_summary(
-    db: Session = Depends(get_db),
+async def get_pipeline_summary(
+    db: DBRunner = Depends(get_db_runner),
     current_user: User = Depends(get_current_user)
 ):
     """Obter resumo do pipeline de vendas."""
     try:
-        pipeline_data = crud_dashboard.get_pipeline_summary(db=db, user_id=current_user.id)
+        pipeline_data = await db.run(crud_dashboard.get_pipeline_summary, user_id=current_user.id)
         return [PipelineSummaryItem(**item) for item in pipeline_data]
     except Exception as e:
         logger.error(f"Erro ao buscar resumo do pipeline para usuário {current_user.id}: {str(e)}")
@@ -52,13 +51,13 @@ def get_pipeline_summary(
 
 
 @router.get("/financial-summary", response_model=FinancialSummaryDashboard)
-def get_financial_summary(
-    db: Session = Depends(get_db),
+async def get_financial_summary(
+    db: DBRunner = Depends(get_db_runner),
     current_user: User = Depends(get_current_user)
 ):
     """Obter resumo financeiro do mês."""
     try:
-        financial_data = crud_dashboard.get_financial_summary(db=db, user_id=current_user.id)
+        financial_data = await db.run(crud_dashboard.get_financial_summary, user_id=current_user.id)
         return FinancialSummaryDashboard(**financial_data)
     except Exception as e:
         logger.error(f"Erro ao buscar resumo financeiro para usuário {current_user.id}: {str(e)}")
@@ -69,13 +68,13 @@ def get_financial_summary(
 
 
 @router.get("/recent-activities", response_model=list[RecentActivity])
-def get_recent_activities(
-    db: Session = Depends(get_db),
+async def get_recent_activities(
+    db: DBRunner = Depends(get_db_runner),
     current_user = Depends(get_current_user)
 ):
     """Obter atividades recentes."""
     try:
-        activities_data = crud_dashboard.get_recent_activities(db=db, user_id=current_user.id)
+        activities_data = await db.run(crud_dashboard.get_recent_activities, user_id=current_user.id)
         return [RecentActivity(**activity) for activity in activities_data]
     except Exception as e:
         logger.error(f"Erro ao buscar atividades recentes para usuário {current_user.id}: {str(e)}")
@@ -86,13 +85,13 @@ def get_recent_activities(
 
 
 @router.get("/upcoming-events", response_model=list[UpcomingEventSummary])
-def get_upcoming_events(
-    db: Session = Depends(get_db),
+async def get_upcoming_events(
+    db: DBRunner = Depends(get_db_runner),
     current_user = Depends(get_current_user)
 ):
     """Obter próximos eventos."""
     try:
-        events_data = crud_dashboard.get_upcoming_events(db=db, user_id=current_user.id)
+        events_data = await db.run(crud_dashboard.get_upcoming_events, user_id=current_user.id)
         return [UpcomingEventSummary(**event) for event in events_data]
     except Exception as e:
         logger.error(f"Erro ao buscar eventos futuros para usuário {current_user.id}: {str(e)}")
@@ -103,13 +102,13 @@ def get_upcoming_events(
 
 
 @router.get("/conversations-summary", response_model=ConversationsSummary)
-def get_conversations_summary(
-    db: Session = Depends(get_db),
+async def get_conversations_summary(
+    db: DBRunner = Depends(get_db_runner),
     current_user = Depends(get_current_user)
 ):
     """Obter resumo das conversas."""
     try:
-        conversations_data = crud_dashboard.get_conversations_summary(db=db, user_id=current_user.id)
+        conversations_data = await db.run(crud_dashboard.get_conversations_summary, user_id=current_user.id)
         return ConversationsSummary(**conversations_data)
     except Exception as e:
         logger.error(f"Erro ao buscar resumo de conversas para usuário {current_user.id}: {str(e)}")
@@ -120,29 +119,22 @@ def get_conversations_summary(
 
 
 @router.get("/", response_model=MainDashboard)
-def get_main_dashboard(
-    db: Session = Depends(get_db),
+async def get_main_dashboard(
+    db: DBRunner = Depends(get_db_runner),
     current_user: User = Depends(get_current_user)
 ):
     """Obter todos os dados do dashboard principal."""
     try:
-        user_id = current_user.id
-        
-        # Buscar todos os dados necessários
-        kpis_data = crud_dashboard.get_kpis(db=db, user_id=user_id)
-        pipeline_data = crud_dashboard.get_pipeline_summary(db=db, user_id=user_id)
-        financial_data = crud_dashboard.get_financial_summary(db=db, user_id=user_id)
-        activities_data = crud_dashboard.get_recent_activities(db=db, user_id=user_id)
-        events_data = crud_dashboard.get_upcoming_events(db=db, user_id=user_id)
-        conversations_data = crud_dashboard.get_conversations_summary(db=db, user_id=user_id)
+        # Buscar todos os dados necessários com o mínimo de consultas
+        dashboard_data = await db.run(crud_dashboard.get_main_dashboard, user_id=current_user.id)
         
         return MainDashboard(
-            kpis=DashboardKPIs(**kpis_data),
-            pipeline_summary=[PipelineSummaryItem(**item) for item in pipeline_data],
-            financial_summary=FinancialSummaryDashboard(**financial_data),
-            recent_activities=[RecentActivity(**activity) for activity in activities_data],
-            upcoming_events=[UpcomingEventSummary(**event) for event in events_data],
-            conversations_summary=ConversationsSummary(**conversations_data)
+            kpis=DashboardKPIs(**dashboard_data["kpis"]),
+            pipeline_summary=[PipelineSummaryItem(**item) for item in dashboard_data["pipeline_summary"]],
+            financial_summary=FinancialSummaryDashboard(**dashboard_data["financial_summary"]),
+            recent_activities=[RecentActivity(**activity) for activity in dashboard_data["recent_activities"]],
+            upcoming_events=[UpcomingEventSummary(**event) for event in dashboard_data["upcoming_events"]],
+            conversations_summary=ConversationsSummary(**dashboard_data["conversations_summary"])
         )
     except Exception as e:
         logger.error(f"Erro ao buscar dashboard principal para usuário {current_user.id}: {str(e)}")
@@ -153,12 +145,12 @@ def get_main_dashboard(
 
 
 @router.get("/conversation-summary")
-def get_conversation_summary_endpoint(db: Session = Depends(get_db)):
+async def get_conversation_summary_endpoint(db: DBRunner = Depends(get_db_runner)):
     """
     Endpoint para obter resumo das conversas
     """
     try:
-        summary = crud_dashboard.get_conversation_summary(db)
+        summary = await db.run(crud_dashboard.get_conversation_summary)
         return summary
     except Exception as e:
         logger.error(f"Erro no endpoint de resumo de conversas: {e}")
@@ -166,15 +158,15 @@ def get_conversation_summary_endpoint(db: Session = Depends(get_db)):
 
 
 @router.get("/gamification/user-stats/{user_id}")
-def get_user_stats_endpoint(user_id: str, db: Session = Depends(get_db)):
+async def get_user_stats_endpoint(user_id: str, db: DBRunner = Depends(get_db_runner)):
     """
     Endpoint para obter estatísticas de gamificação do usuário
     """
     try:
-        user_stats = crud_dashboard.get_user_stats(db, user_id)
+        user_stats = await db.run(crud_dashboard.get_user_stats, user_id)
         if not user_stats:
             # Criar estatísticas iniciais se não existirem
-            user_stats = crud_dashboard.create_user_stats(db, user_id)
+            user_stats = await db.run(crud_dashboard.create_user_stats, user_id)
         
         if not user_stats:
             raise HTTPException(status_code=404, detail="Usuário não encontrado")
@@ -195,12 +187,12 @@ def get_user_stats_endpoint(user_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/gamification/achievements/{user_id}")
-def get_user_achievements_endpoint(user_id: str, db: Session = Depends(get_db)):
+async def get_user_achievements_endpoint(user_id: str, db: DBRunner = Depends(get_db_runner)):
     """
     Endpoint para obter conquistas do usuário
     """
     try:
-        achievements = crud_dashboard.get_user_achievements(db, user_id)
+        achievements = await db.run(crud_dashboard.get_user_achievements, user_id)
         
         return {
             "achievements": [
@@ -225,12 +217,12 @@ def get_user_achievements_endpoint(user_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/gamification/challenges/{user_id}")
-def get_user_challenges_endpoint(user_id: str, db: Session = Depends(get_db)):
+async def get_user_challenges_endpoint(user_id: str, db: DBRunner = Depends(get_db_runner)):
     """
     Endpoint para obter desafios do usuário
     """
     try:
-        challenges = crud_dashboard.get_user_challenges(db, user_id)
+        challenges = await db.run(crud_dashboard.get_user_challenges, user_id)
         
         return {
             "challenges": [
@@ -256,16 +248,16 @@ def get_user_challenges_endpoint(user_id: str, db: Session = Depends(get_db)):
 
 
 @router.get("/communication/stats/{user_id}")
-def get_communication_stats_endpoint(user_id: str, db: Session = Depends(get_db)):
+async def get_communication_stats_endpoint(user_id: str, db: DBRunner = Depends(get_db_runner)):
     """
     Endpoint para obter estatísticas de comunicação do usuário
     """
     try:
-        comm_stats = crud_dashboard.get_communication_stats(db, user_id)
+        comm_stats = await db.run(crud_dashboard.get_communication_stats, user_id)
         
         if not comm_stats:
             # Criar estatísticas iniciais se não existirem
-            comm_stats = crud_dashboard.update_communication_stats(db, user_id)
+            comm_stats = await db.run(crud_dashboard.update_communication_stats, user_id)
         
         if not comm_stats:
             raise HTTPException(status_code=404, detail="Usuário não encontrado")
@@ -286,12 +278,12 @@ def get_communication_stats_endpoint(user_id: str, db: Session = Depends(get_db)
 
 
 @router.get("/communication/messages/{user_id}")
-def get_recent_messages_endpoint(user_id: str, limit: int = 20, db: Session = Depends(get_db)):
+async def get_recent_messages_endpoint(user_id: str, limit: int = 20, db: DBRunner = Depends(get_db_runner)):
     """
     Endpoint para obter mensagens recentes do usuário para o CommunicationHub
     """
     try:
-        messages = crud_dashboard.get_recent_messages(db, user_id, limit)
+        messages = await db.run(crud_dashboard.get_recent_messages, user_id, limit)
         return {"messages": messages}
     except Exception as e:
         logger.error(f"Erro no endpoint de mensagens recentes do usuário {user_id}: {e}")
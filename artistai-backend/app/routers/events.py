@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from .. import schemas, crud_event
 from ..dependencies import get_current_user, User
+from ..pagination import InvalidCursorError
 
 router = APIRouter()
 
@@ -30,28 +31,33 @@ def create_event(
         )
 
 
-@router.get("/events/", response_model=List[schemas.Event])
+@router.get("/events/", response_model=schemas.Page[schemas.Event])
 def read_events(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     start_date: Optional[date] = Query(None, description="Data de início para filtrar eventos (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="Data de fim para filtrar eventos (YYYY-MM-DD)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Listar eventos com paginação e filtros de data.
+    Listar eventos por data, com paginação por cursor e filtros de data.
     Inclui objetos aninhados de Artist e Contractor.
     """
-    events = crud_event.get_events(
-        db=db, 
-        user_id=current_user.id, 
-        skip=skip, 
-        limit=limit,
-        start_date=start_date,
-        end_date=end_date
-    )
-    return events
+    try:
+        return crud_event.get_events(
+            db=db, 
+            user_id=current_user.id, 
+            limit=limit,
+            cursor=cursor,
+            start_date=start_date,
+            end_date=end_date
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/events/{event_id}", response_model=schemas.Event)
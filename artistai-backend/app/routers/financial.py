@@ -1,12 +1,18 @@
+from functools import partial
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import date, datetime, timedelta
 import uuid
 
-from app.database import get_db
+from app import bank_statement, spreadsheet
+from app.database import get_db, get_db_runner, run_concurrently, DBRunner
 from app.dependencies import get_current_user, User
+from app.pagination import InvalidCursorError
+from app.uploads import request_content_type, spooled_request_body
 from app.crud import crud_financial
+from app.services import financial_export
 from app.schemas import (
     # Financial Accounts
     FinancialAccount, FinancialAccountCreate, FinancialAccountUpdate,
@@ -18,9 +24,12 @@ from app.schemas import (
     FinancialGoal, FinancialGoalCreate, FinancialGoalUpdate,
     # Financial Budgets
     FinancialBudget, FinancialBudgetCreate, FinancialBudgetUpdate,
+    # Category Rules e Importação de Extratos
+    FinancialCategoryRule, FinancialCategoryRuleCreate, BankStatementImportResult,
     # Analytics
     FinancialSummary, CategorySummary, MonthlyTrend, FinancialAnalytics,
-    FinancialDashboard
+    FinancialDashboard,
+    Page
 )
 
 router = APIRouter()
@@ -91,6 +100,40 @@ def delete_account(
     return {"message": "Conta deletada com sucesso"}
 
 
+@router.post("/accounts/{account_id}/import", response_model=BankStatementImportResult)
+async def import_bank_statement(
+    account_id: uuid.UUID,
+    request: Request,
+    db: DBRunner = Depends(get_db_runner),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Importar um extrato bancário enviado no corpo da requisição (Content-Type application/x-ofx,
+    text/csv ou XLSX) como transações completadas da conta.
+    Colunas das planilhas: data, descricao/historico, valor, e opcionalmente tipo, referencia e categoria;
+    sem a coluna tipo, valores negativos são despesas. Sem categoria, valem as regras de categorização.
+    Lançamentos já importados (mesma referência/FITID ou mesmo lançamento) são contados em `duplicates`;
+    linhas inválidas são listadas em `errors` com o número da linha.
+    """
+    content_type = request_content_type(request)
+
+    async with spooled_request_body(request) as upload:
+        try:
+            rows = bank_statement.iter_statement_rows(upload, content_type)
+            result = await db.run(
+                crud_financial.import_bank_statement,
+                user_id=current_user.id, account_id=account_id, rows=rows
+            )
+        except spreadsheet.UnsupportedSpreadsheetError as e:
+            raise HTTPException(status_code=415, detail=str(e))
+        except spreadsheet.SpreadsheetError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Conta não encontrada")
+    return result
+
+
 # ==================== FINANCIAL CATEGORIES ====================
 
 @router.post("/categories/", response_model=FinancialCategory)
@@ -167,10 +210,10 @@ def create_transaction(
     return crud_financial.create_financial_transaction(db=db, transaction=transaction, user_id=current_user.id)
 
 
-@router.get("/transactions/", response_model=List[FinancialTransaction])
+@router.get("/transactions/", response_model=Page[FinancialTransaction])
 def read_transactions(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     account_id: Optional[uuid.UUID] = Query(None, description="Filtrar por conta"),
     category_id: Optional[uuid.UUID] = Query(None, description="Filtrar por categoria"),
     transaction_type: Optional[str] = Query(None, description="Filtrar por tipo (income/expense)"),
@@ -179,12 +222,64 @@ def read_transactions(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Listar todas as transações financeiras do usuário"""
-    return crud_financial.get_financial_transactions(
-        db=db, user_id=current_user.id, skip=skip, limit=limit,
+    """Listar as transações financeiras do usuário, paginadas por cursor (mais recentes primeiro)"""
+    try:
+        return crud_financial.get_financial_transactions(
+            db=db, user_id=current_user.id, limit=limit, cursor=cursor,
+            account_id=account_id, category_id=category_id, transaction_type=transaction_type,
+            start_date=start_date, end_date=end_date
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/transactions/export")
+def export_transactions(
+    format: str = Query("csv", description="Formato do arquivo: csv, xlsx ou ofx"),
+    account_id: Optional[uuid.UUID] = Query(None, description="Filtrar por conta (obrigatório no OFX)"),
+    category_id: Optional[uuid.UUID] = Query(None, description="Filtrar por categoria"),
+    transaction_type: Optional[str] = Query(None, description="Filtrar por tipo (income/expense)"),
+    start_date: Optional[date] = Query(None, description="Data inicial"),
+    end_date: Optional[date] = Query(None, description="Data final"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exportar as transações do usuário em ordem cronológica, com os mesmos filtros da listagem.
+    O arquivo é transmitido conforme as transações são lidas do banco, sem limite de quantidade.
+    O OFX é um extrato de uma única conta, por isso exige account_id.
+    """
+    if format not in financial_export.EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato inválido: {format}. Use {', '.join(financial_export.EXPORT_FORMATS)}"
+        )
+    try:
+        financial_export.check_export_format(format)
+    except financial_export.ExportUnavailableError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filters = dict(
         account_id=account_id, category_id=category_id, transaction_type=transaction_type,
         start_date=start_date, end_date=end_date
     )
+    account = None
+    period = None
+    if format == "ofx":
+        if account_id is None:
+            raise HTTPException(status_code=400, detail="Informe account_id para exportar em OFX")
+        account = crud_financial.get_financial_account(db=db, account_id=account_id, user_id=current_user.id)
+        if account is None:
+            raise HTTPException(status_code=404, detail="Conta não encontrada")
+        first, last = crud_financial.get_financial_transactions_date_range(db=db, user_id=current_user.id, **filters)
+        period = (start_date or first or date.today(), end_date or last or date.today())
+
+    filename = f"transacoes_{date.today():%Y%m%d}.{format}"
+    return StreamingResponse(
+        financial_export.stream_transactions_export(format, current_user.id, filters, account, period),
+        media_type=financial_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.get("/transactions/{transaction_id}", response_model=FinancialTransaction)
@@ -357,6 +452,47 @@ def delete_budget(
     return {"message": "Orçamento deletado com sucesso"}
 
 
+# ==================== CATEGORY RULES ====================
+
+@router.post("/category-rules/", response_model=FinancialCategoryRule)
+def create_category_rule(
+    rule: FinancialCategoryRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Criar uma regra de categorização para a importação de extratos"""
+    if not rule.pattern.strip():
+        raise HTTPException(status_code=400, detail="Informe o trecho da descrição")
+    if rule.transaction_type is not None and rule.transaction_type not in ('income', 'expense'):
+        raise HTTPException(status_code=400, detail="Tipo de transação inválido. Use: income, expense")
+    category = crud_financial.get_financial_category(db=db, category_id=rule.category_id, user_id=current_user.id)
+    if category is None:
+        raise HTTPException(status_code=404, detail="Categoria não encontrada")
+    return crud_financial.create_financial_category_rule(db=db, rule=rule, user_id=current_user.id)
+
+
+@router.get("/category-rules/", response_model=List[FinancialCategoryRule])
+def read_category_rules(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Listar as regras de categorização do usuário, na ordem em que são avaliadas"""
+    return crud_financial.get_financial_category_rules(db=db, user_id=current_user.id)
+
+
+@router.delete("/category-rules/{rule_id}")
+def delete_category_rule(
+    rule_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Deletar uma regra de categorização"""
+    success = crud_financial.delete_financial_category_rule(db=db, rule_id=rule_id, user_id=current_user.id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Regra não encontrada")
+    return {"message": "Regra deletada com sucesso"}
+
+
 # ==================== ANALYTICS & REPORTS ====================
 
 @router.get("/analytics/summary", response_model=FinancialSummary)
@@ -408,38 +544,43 @@ def get_monthly_trends(
 
 
 @router.get("/analytics/dashboard", response_model=FinancialDashboard)
-def get_financial_dashboard(
-    db: Session = Depends(get_db),
+async def get_financial_dashboard(
     current_user: User = Depends(get_current_user)
 ):
-    """Obter dados completos para o dashboard financeiro"""
+    """
+    Obter dados completos para o dashboard financeiro.
+    As leituras são independentes e rodam em paralelo, cada uma em sua própria conexão
+    (com os relacionamentos da resposta já carregados, pois as sessões são fechadas antes
+    da serialização); o resultado fica em cache por usuário até a próxima escrita financeira.
+    """
     user_id = current_user.id
+    cached = crud_financial.get_cached_financial_dashboard(user_id)
+    if cached is not None:
+        return cached
+
+    # Janela de datas única para todas as leituras
     today = date.today()
     start_of_month = today.replace(day=1)
     
-    # Buscar dados necessários
-    accounts = crud_financial.get_financial_accounts(db=db, user_id=user_id)
-    recent_transactions = crud_financial.get_financial_transactions(
-        db=db, user_id=user_id, limit=10
-    )
-    monthly_summary = crud_financial.get_financial_summary(
-        db=db, user_id=user_id, start_date=start_of_month, end_date=today
-    )
-    active_goals = crud_financial.get_financial_goals(
-        db=db, user_id=user_id, is_active=True
-    )
-    budget_alerts = crud_financial.get_financial_budgets(
-        db=db, user_id=user_id, is_active=True
-    )
-    cash_flow_prediction = crud_financial.get_monthly_trends(
-        db=db, user_id=user_id, months=6
+    (
+        accounts, recent_transactions, monthly_summary,
+        active_goals, budget_alerts, cash_flow_prediction
+    ) = await run_concurrently(
+        partial(crud_financial.get_financial_accounts, user_id=user_id),
+        partial(crud_financial.get_recent_financial_transactions, user_id=user_id, limit=10),
+        partial(crud_financial.get_financial_summary, user_id=user_id, start_date=start_of_month, end_date=today),
+        partial(crud_financial.get_financial_goals, user_id=user_id, is_active=True),
+        partial(crud_financial.get_financial_budgets, user_id=user_id, is_active=True),
+        partial(crud_financial.get_monthly_trends, user_id=user_id, months=6, today=today)
     )
     
-    return FinancialDashboard(
+    dashboard = FinancialDashboard(
         accounts=accounts,
         recent_transactions=recent_transactions,
         monthly_summary=monthly_summary,
         active_goals=active_goals,
         budget_alerts=budget_alerts,
         cash_flow_prediction=cash_flow_prediction
-    )
\ No newline at end of file
+    )
+    crud_financial.cache_financial_dashboard(user_id, dashboard)
+    return dashboard
\ No newline at end of file
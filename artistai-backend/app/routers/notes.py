@@ -1,11 +1,12 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from .. import schemas, crud_notes
 from ..dependencies import get_current_user, User
+from ..pagination import InvalidCursorError
 
 router = APIRouter()
 
@@ -20,40 +21,50 @@ def create_note(
     return crud_notes.create_note(db=db, note=note, user_id=current_user.id)
 
 
-@router.get("/contractors/{contractor_id}/notes", response_model=List[schemas.Note])
+@router.get("/contractors/{contractor_id}/notes", response_model=schemas.Page[schemas.Note])
 def read_contractor_notes(
     contractor_id: uuid.UUID,
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Listar anotações de um contratante específico."""
-    notes = crud_notes.get_notes_by_contractor(
-        db=db, 
-        contractor_id=contractor_id, 
-        user_id=current_user.id, 
-        skip=skip, 
-        limit=limit
-    )
-    return notes
+    """Listar anotações de um contratante específico, paginadas por cursor."""
+    try:
+        return crud_notes.get_notes_by_contractor(
+            db=db, 
+            contractor_id=contractor_id, 
+            user_id=current_user.id, 
+            limit=limit,
+            cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
-@router.get("/notes/", response_model=List[schemas.Note])
+@router.get("/notes/", response_model=schemas.Page[schemas.Note])
 def read_notes(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Listar todas as anotações do usuário."""
-    notes = crud_notes.get_notes_by_user(
-        db=db, 
-        user_id=current_user.id, 
-        skip=skip, 
-        limit=limit
-    )
-    return notes
+    """Listar as anotações do usuário, paginadas por cursor."""
+    try:
+        return crud_notes.get_notes_by_user(
+            db=db, 
+            user_id=current_user.id, 
+            limit=limit,
+            cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/notes/{note_id}", response_model=schemas.Note)
@@ -0,0 +1,42 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+
+from ..database import get_db_runner, DBRunner
+from .. import schemas, crud_search
+from ..dependencies import get_current_user, User
+from ..pagination import InvalidCursorError
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=schemas.Page[schemas.SearchHit])
+async def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Termos da busca"),
+    types: Optional[List[str]] = Query(None, description="Tipos buscados: message, note, contractor"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: DBRunner = Depends(get_db_runner),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Busca nas mensagens, anotações e contratantes do usuário logado, ordenada por relevância.
+    `highlight` traz o trecho encontrado com os termos entre <mark> e </mark>.
+    Use `next_cursor` da resposta como `cursor` para buscar a próxima página.
+    """
+    types = types or list(crud_search.SEARCH_TYPES)
+    invalid = [t for t in types if t not in crud_search.SEARCH_TYPES]
+    if invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tipos de busca inválidos: {', '.join(invalid)}"
+        )
+
+    try:
+        return await db.run(
+            crud_search.search, user_id=current_user.id, q=q, types=types, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
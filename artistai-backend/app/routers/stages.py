@@ -1,12 +1,13 @@
 import uuid
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from ..database import get_db
 from .. import schemas, crud_stages
 from ..dependencies import get_current_user, User
+from ..pagination import InvalidCursorError
 
 router = APIRouter()
 
@@ -26,16 +27,21 @@ def create_stage(
     return crud_stages.create_stage(db=db, stage=stage, user_id=current_user.id)
 
 
-@router.get("/stages/", response_model=List[schemas.PipelineStage])
+@router.get("/stages/", response_model=schemas.Page[schemas.PipelineStage])
 def read_stages(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Listar etapas do pipeline com paginação, ordenadas por order."""
-    stages = crud_stages.get_stages(db=db, user_id=current_user.id, skip=skip, limit=limit)
-    return stages
+    """Listar etapas do pipeline com paginação por cursor, ordenadas por order."""
+    try:
+        return crud_stages.get_stages(db=db, user_id=current_user.id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/stages/{stage_id}", response_model=schemas.PipelineStage)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Optional, List, Generic, TypeVar
 from pydantic import BaseModel
 
 
@@ -67,6 +67,28 @@ class Contractor(ContractorBase):
         from_attributes = True
 
 
+class ContractorDuplicate(BaseModel):
+    id: Optional[uuid.UUID] = None
+    name: Optional[str] = None
+    phone: Optional[str] = None
+    cpf_cnpj: Optional[str] = None
+    own: bool
+    matches: List[str]  # phone, cpf_cnpj e/ou name
+    similarity: float
+
+
+class ContractorImportError(BaseModel):
+    row: int  # linha no arquivo (o cabeçalho é a linha 1)
+    error: str
+
+
+class ContractorImportResult(BaseModel):
+    received: int
+    created: int
+    failed: int
+    errors: List[ContractorImportError]
+
+
 # Schemas para Eventos
 class EventBase(BaseModel):
     title: str
@@ -160,6 +182,32 @@ class Message(MessageBase):
         from_attributes = True
 
 
+class MessagePage(BaseModel):
+    items: List[Message]
+    before_cursor: Optional[str] = None
+    after_cursor: Optional[str] = None
+
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Página de uma listagem paginada por cursor; use `next_cursor` como `cursor` para a próxima."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+# Esquemas para Busca
+class SearchHit(BaseModel):
+    type: str  # message, note ou contractor
+    id: uuid.UUID
+    rank: float
+    highlight: str
+    conversation_id: Optional[uuid.UUID] = None
+    contractor_id: Optional[uuid.UUID] = None
+    created_at: datetime
+
+
 # Esquemas para Gamificação
 class UserStatsBase(BaseModel):
     user_id: str
@@ -336,6 +384,17 @@ class IngressMessage(BaseModel):
     timestamp: Optional[datetime] = None
 
 
+class IngressBatchResult(BaseModel):
+    received: int
+    created: int
+    duplicates: int
+    rejected: int
+
+
+class IngressQueued(BaseModel):
+    queued: int
+
+
 # Schemas para WhatsApp Instances
 class WhatsAppInstanceBase(BaseModel):
     instance_name: str
@@ -623,6 +682,43 @@ class FinancialBudget(FinancialBudgetBase):
         from_attributes = True
 
 
+# Schemas para Financial Category Rules (categorização na importação de extratos)
+class FinancialCategoryRuleBase(BaseModel):
+    category_id: uuid.UUID
+    pattern: str  # Trecho procurado na descrição, sem diferenciar maiúsculas e acentos
+    transaction_type: Optional[str] = None
+    priority: int = 0  # Menor valor é avaliado primeiro
+
+
+class FinancialCategoryRuleCreate(FinancialCategoryRuleBase):
+    pass
+
+
+class FinancialCategoryRule(FinancialCategoryRuleBase):
+    id: uuid.UUID
+    user_id: str
+    created_at: datetime
+    category: FinancialCategory
+    
+    class Config:
+        from_attributes = True
+
+
+# Schemas para Importação de Extratos
+class BankStatementImportError(BaseModel):
+    row: int  # linha da planilha (o cabeçalho é a linha 1) ou posição da transação no OFX
+    error: str
+
+
+class BankStatementImportResult(BaseModel):
+    received: int
+    created: int
+    duplicates: int  # já importados antes (mesma referência ou mesmo lançamento)
+    failed: int
+    errors: List[BankStatementImportError]
+    balance: float  # saldo da conta após a importação
+
+
 # Schemas para Analytics e Relatórios
 class FinancialSummary(BaseModel):
     total_income: float
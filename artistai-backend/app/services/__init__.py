@@ -1,5 +1,6 @@
 # Services module
 from .whatsapp_service import whatsapp_service
 from .evolution_api import evolution_service
+from .ingest_worker import ingest_worker
 
-__all__ = ['whatsapp_service', 'evolution_service']
\ No newline at end of file
+__all__ = ['whatsapp_service', 'evolution_service', 'ingest_worker']
\ No newline at end of file
@@ -1,3 +1,4 @@
+import importlib.util
 import httpx
 from typing import Dict, Any, Optional
 from fastapi import HTTPException, status
@@ -9,6 +10,33 @@ class EvolutionAPIService:
     
     def __init__(self):
         self.config = evolution_config
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """Cria o cliente HTTP compartilhado, com keep-alive e HTTP/2 quando o pacote h2 está instalado"""
+        return httpx.AsyncClient(
+            timeout=self.config.get_timeout("default"),
+            limits=self.config.limits,
+            http2=importlib.util.find_spec("h2") is not None
+        )
+    
+    async def start(self):
+        """Cria o cliente HTTP do processo. Chamado no lifespan da aplicação."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+    
+    async def close(self):
+        """Fecha o cliente HTTP e suas conexões. Chamado no encerramento da aplicação."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP compartilhado; criado sob demanda fora do lifespan (ex.: scripts)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
     
     def _check_config(self):
         """Verifica se a configuração está disponível"""
@@ -24,110 +52,110 @@ class EvolutionAPIService:
         
         payload = self.config.get_instance_payload(instance_name)
         
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            try:
-                response = await client.post(
-                    f"{self.config.api_url}/instance/create",
-                    json=payload,
-                    headers=self.config.headers
-                )
-                
-                if response.status_code != 201:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Erro ao criar instância: {response.text}"
-                    )
-                
-                return response.json()
-                
-            except httpx.RequestError as e:
+        try:
+            response = await self.client.post(
+                f"{self.config.api_url}/instance/create",
+                json=payload,
+                headers=self.config.headers,
+                timeout=self.config.get_timeout("create_instance")
+            )
+            
+            if response.status_code != 201:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erro de conexão: {str(e)}"
+                    detail=f"Erro ao criar instância: {response.text}"
                 )
+            
+            return response.json()
+            
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Erro de conexão: {str(e)}"
+            )
     
     async def get_qr_code(self, instance_name: str) -> Dict[str, Any]:
         """Obtém o QR Code de uma instância"""
         self._check_config()
         
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            try:
-                response = await client.get(
-                    f"{self.config.api_url}/instance/connect/{instance_name}",
-                    headers=self.config.headers
-                )
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Erro ao obter QR Code: {response.text}"
-                    )
-                
-                return response.json()
-                
-            except httpx.RequestError as e:
+        try:
+            response = await self.client.get(
+                f"{self.config.api_url}/instance/connect/{instance_name}",
+                headers=self.config.headers,
+                timeout=self.config.get_timeout("get_qr_code")
+            )
+            
+            if response.status_code != 200:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erro de conexão: {str(e)}"
+                    detail=f"Erro ao obter QR Code: {response.text}"
                 )
+            
+            return response.json()
+            
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Erro de conexão: {str(e)}"
+            )
     
     async def get_instance_status(self, instance_name: str) -> Dict[str, Any]:
         """Verifica o status de uma instância"""
         self._check_config()
         
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            try:
-                response = await client.get(
-                    f"{self.config.api_url}/instance/connectionState/{instance_name}",
-                    headers=self.config.headers
-                )
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Erro ao verificar status: {response.text}"
-                    )
-                
-                return response.json()
-                
-            except httpx.RequestError as e:
+        try:
+            response = await self.client.get(
+                f"{self.config.api_url}/instance/connectionState/{instance_name}",
+                headers=self.config.headers,
+                timeout=self.config.get_timeout("get_instance_status")
+            )
+            
+            if response.status_code != 200:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Erro de conexão: {str(e)}"
+                    detail=f"Erro ao verificar status: {response.text}"
                 )
+            
+            return response.json()
+            
+        except httpx.RequestError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Erro de conexão: {str(e)}"
+            )
     
     async def delete_instance(self, instance_name: str) -> bool:
         """Deleta uma instância"""
         if not self.config.is_configured:
             return False
         
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            try:
-                response = await client.delete(
-                    f"{self.config.api_url}/instance/delete/{instance_name}",
-                    headers=self.config.headers
-                )
-                
-                # Considera sucesso se retornar 200, 204 ou 404 (já não existe)
-                return response.status_code in [200, 204, 404]
-                
-            except Exception:
-                return False
+        try:
+            response = await self.client.delete(
+                f"{self.config.api_url}/instance/delete/{instance_name}",
+                headers=self.config.headers,
+                timeout=self.config.get_timeout("delete_instance")
+            )
+            
+            # Considera sucesso se retornar 200, 204 ou 404 (já não existe)
+            return response.status_code in [200, 204, 404]
+            
+        except Exception:
+            return False
     
     async def instance_exists(self, instance_name: str) -> bool:
         """Verifica se uma instância existe"""
         if not self.config.is_configured:
             return False
         
-        async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-            try:
-                response = await client.get(
-                    f"{self.config.api_url}/instance/connectionState/{instance_name}",
-                    headers=self.config.headers
-                )
-                return response.status_code == 200
-            except Exception:
-                return False
+        try:
+            response = await self.client.get(
+                f"{self.config.api_url}/instance/connectionState/{instance_name}",
+                headers=self.config.headers,
+                timeout=self.config.get_timeout("instance_exists")
+            )
+            return response.status_code == 200
+        except Exception:
+            return False
 
 # Instância global do serviço
 evolution_service = EvolutionAPIService()
\ No newline at end of file
@@ -0,0 +1,202 @@
+import csv
+import io
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from ..crud import crud_financial
+from ..database import SessionLocal
+from ..models import FinancialAccount
+
+EXPORT_FORMATS = ("csv", "xlsx", "ofx")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "ofx": "application/x-ofx",
+}
+
+# Colunas da exportação: (cabeçalho, campo da linha consultada)
+EXPORT_COLUMNS = [
+    ("data", "transaction_date"),
+    ("vencimento", "due_date"),
+    ("descricao", "description"),
+    ("tipo", "transaction_type"),
+    ("valor", "amount"),
+    ("status", "status"),
+    ("conta", "account_name"),
+    ("categoria", "category_name"),
+    ("referencia", "reference_number"),
+    ("dedutivel", "is_tax_deductible"),
+    ("categoria_fiscal", "tax_category"),
+    ("observacoes", "notes"),
+    ("id", "id"),
+]
+
+# Tamanho dos pedaços enviados ao cliente ao transmitir o XLSX já montado
+XLSX_STREAM_CHUNK = 64 * 1024
+# Acima disso o XLSX em montagem vai para o disco em vez de ficar na memória
+XLSX_SPOOL_BYTES = 1024 * 1024
+
+OFX_ACCOUNT_TYPES = {"checking": "CHECKING", "savings": "SAVINGS"}
+
+# Primeiros caracteres que fazem o Excel/LibreOffice interpretar a célula do CSV como fórmula
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportUnavailableError(Exception):
+    """Formato de exportação indisponível neste servidor"""
+    pass
+
+
+def check_export_format(export_format: str) -> None:
+    """Falha antes de iniciar a resposta se o formato depende de uma biblioteca ausente."""
+    if export_format == "xlsx":
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            raise ExportUnavailableError("Exportação em XLSX indisponível (openpyxl não instalado). Use CSV.")
+
+
+def stream_transactions_export(export_format: str, user_id: str, filters: Dict[str, Any],
+                               account: Optional[FinancialAccount] = None,
+                               period: Optional[Tuple[date, date]] = None) -> Iterator[bytes]:
+    """
+    Gera o arquivo de exportação em pedaços, lendo as transações em lotes por um cursor no servidor.
+    Abre a própria sessão, que vive enquanto a resposta é transmitida. No OFX, `account` e `period`
+    descrevem a conta exportada e o intervalo do extrato.
+    """
+    db = SessionLocal()
+    try:
+        batches = crud_financial.iter_financial_transactions_for_export(db, user_id, **filters)
+        if export_format == "xlsx":
+            yield from _iter_xlsx(batches)
+        elif export_format == "ofx":
+            yield from _iter_ofx(batches, account, period)
+        else:
+            yield from _iter_csv(batches)
+    finally:
+        db.close()
+
+
+def _iter_csv(batches: Iterable[List[Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # BOM para o Excel reconhecer o arquivo como UTF-8
+    buffer.write("\ufeff")
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for batch in batches:
+        for row in batch:
+            writer.writerow([_csv_value(getattr(row, field)) for _, field in EXPORT_COLUMNS])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "sim" if value else "nao"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    # Descrições e observações vêm do usuário (ou de extratos importados): um texto como
+    # "=HYPERLINK(...)" viraria fórmula ao abrir o CSV, então é prefixado com apóstrofo
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _iter_xlsx(batches: Iterable[List[Any]]) -> Iterator[bytes]:
+    from openpyxl import Workbook
+
+    # write_only grava as linhas num arquivo temporário conforme chegam; o XLSX (zip) só fica
+    # completo no save, então ele é montado num arquivo temporário e transmitido em seguida
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Transacoes")
+    sheet.append([header for header, _ in EXPORT_COLUMNS])
+    for batch in batches:
+        for row in batch:
+            sheet.append([_xlsx_cell(sheet, getattr(row, field)) for _, field in EXPORT_COLUMNS])
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES) as file:
+        workbook.save(file)
+        file.seek(0)
+        while True:
+            chunk = file.read(XLSX_STREAM_CHUNK)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _xlsx_cell(sheet: Any, value: Any) -> Any:
+    from openpyxl.cell import WriteOnlyCell
+
+    if value is None or isinstance(value, (bool, int, Decimal, date, datetime)):
+        return value
+    # O openpyxl grava como fórmula todo texto que começa com "="; textos vindos do usuário
+    # são forçados a célula de texto para não virarem fórmula na planilha exportada
+    cell = WriteOnlyCell(sheet, value=str(value))
+    cell.data_type = "s"
+    return cell
+
+
+def _iter_ofx(batches: Iterable[List[Any]], account: FinancialAccount, period: Tuple[date, date]) -> Iterator[bytes]:
+    now = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    start, end = period
+    yield (
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n'
+        '<?OFX OFXHEADER="200" VERSION="211" SECURITY="NONE" OLDFILEUID="NONE" NEWFILEUID="NONE"?>\n'
+        "<OFX>\n"
+        "<SIGNONMSGSRSV1><SONRS>"
+        "<STATUS><CODE>0</CODE><SEVERITY>INFO</SEVERITY></STATUS>"
+        f"<DTSERVER>{now}</DTSERVER><LANGUAGE>POR</LANGUAGE>"
+        "</SONRS></SIGNONMSGSRSV1>\n"
+        "<BANKMSGSRSV1><STMTTRNRS><TRNUID>0</TRNUID>"
+        "<STATUS><CODE>0</CODE><SEVERITY>INFO</SEVERITY></STATUS>\n"
+        "<STMTRS><CURDEF>BRL</CURDEF>"
+        "<BANKACCTFROM>"
+        f"<BANKID>{_ofx_text(account.bank_name or 'NONE', 9)}</BANKID>"
+        f"<ACCTID>{_ofx_text(account.account_number or str(account.id), 22)}</ACCTID>"
+        f"<ACCTTYPE>{OFX_ACCOUNT_TYPES.get(account.account_type, 'CHECKING')}</ACCTTYPE>"
+        "</BANKACCTFROM>\n"
+        f"<BANKTRANLIST><DTSTART>{start:%Y%m%d}</DTSTART><DTEND>{end:%Y%m%d}</DTEND>\n"
+    ).encode("utf-8")
+
+    for batch in batches:
+        lines = []
+        for row in batch:
+            # Transações canceladas não movimentaram a conta e não entram no extrato
+            if row.status == "cancelled":
+                continue
+            amount = row.amount if row.transaction_type == "income" else -row.amount
+            lines.append(
+                "<STMTTRN>"
+                f"<TRNTYPE>{'CREDIT' if row.transaction_type == 'income' else 'DEBIT'}</TRNTYPE>"
+                f"<DTPOSTED>{row.transaction_date:%Y%m%d}</DTPOSTED>"
+                f"<TRNAMT>{amount:.2f}</TRNAMT>"
+                f"<FITID>{row.id}</FITID>"
+                + (f"<CHECKNUM>{_ofx_text(row.reference_number, 12)}</CHECKNUM>" if row.reference_number else "")
+                + f"<NAME>{_ofx_text(row.description, 32)}</NAME>"
+                f"<MEMO>{_ofx_text(row.description, 255)}</MEMO>"
+                "</STMTTRN>\n"
+            )
+        if lines:
+            yield "".join(lines).encode("utf-8")
+
+    yield (
+        "</BANKTRANLIST>\n"
+        f"<LEDGERBAL><BALAMT>{account.balance:.2f}</BALAMT><DTASOF>{now}</DTASOF></LEDGERBAL>\n"
+        "</STMTRS></STMTTRNRS></BANKMSGSRSV1>\n"
+        "</OFX>\n"
+    ).encode("utf-8")
+
+
+def _ofx_text(value: str, max_length: int) -> str:
+    return escape(" ".join(value.split())[:max_length])
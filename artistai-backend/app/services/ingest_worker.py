@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List
+from starlette.concurrency import run_in_threadpool
+
+from .. import crud_ingress_queue
+from ..database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class IngestWorker:
+    """Pool de workers que drena a fila de ingressão (ingress_queue) em micro-lotes"""
+    
+    def __init__(self):
+        self.workers = int(os.getenv("INGEST_WORKERS", "2"))
+        self.batch_size = int(os.getenv("INGEST_BATCH_SIZE", "200"))
+        self.poll_interval = float(os.getenv("INGEST_POLL_INTERVAL", "0.5"))
+        self.processed = 0
+        self.batches = 0
+        self._tasks: List[asyncio.Task] = []
+    
+    async def start(self):
+        """Inicia os workers. Chamado no lifespan da aplicação."""
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+    
+    async def stop(self):
+        """Interrompe os workers; itens não confirmados voltam a ficar disponíveis na fila."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    async def _run(self):
+        while True:
+            try:
+                processed = await run_in_threadpool(self._drain_once)
+            except Exception as e:
+                logger.error(f"Erro no worker da fila de ingressão: {str(e)}")
+                processed = 0
+            
+            if processed:
+                self.processed += processed
+                self.batches += 1
+            else:
+                # Fila vazia: aguarda antes de consultar novamente
+                await asyncio.sleep(self.poll_interval)
+    
+    def _drain_once(self) -> int:
+        db = SessionLocal()
+        try:
+            return crud_ingress_queue.drain_ingress_queue(db, self.batch_size)
+        finally:
+            db.close()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métricas da fila (profundidade, falhas, atraso) e contadores deste processo"""
+        db = SessionLocal()
+        try:
+            metrics = crud_ingress_queue.get_ingress_queue_metrics(db)
+        finally:
+            db.close()
+        
+        metrics.update({
+            "workers": len(self._tasks),
+            "processed": self.processed,
+            "batches": self.batches,
+        })
+        return metrics
+
+# Instância global do serviço
+ingest_worker = IngestWorker()
@@ -1,21 +1,40 @@
 import asyncio
-from typing import Dict, Any
+import logging
+from typing import Dict, Any, List, Tuple
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from .evolution_api import evolution_service
 from .. import crud_whatsapp
+from ..cache import TTLCache
+from ..database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Tempo de vida do status em cache. Instâncias ainda não conectadas expiram antes,
+# para que a leitura do QR Code apareça rapidamente para o usuário.
+STATUS_CACHE_TTL_SECONDS = 90
+PENDING_STATUS_CACHE_TTL_SECONDS = 5
+
+# Espera pela remoção de uma instância na Evolution API antes de recriá-la
+INSTANCE_REMOVAL_TIMEOUT_SECONDS = 3.0
+INSTANCE_REMOVAL_INITIAL_DELAY_SECONDS = 0.05
+INSTANCE_REMOVAL_MAX_DELAY_SECONDS = 0.5
 
 class WhatsAppService:
     """Serviço simplificado para operações WhatsApp"""
     
     def __init__(self):
         self.evolution = evolution_service
+        # Status por user_id, mantido pela atualização periódica (run_status_refresher)
+        self._status_cache = TTLCache(ttl_seconds=STATUS_CACHE_TTL_SECONDS, maxsize=10000)
     
     async def connect(self, user_id: str, db: Session) -> Dict[str, Any]:
         """Conecta ao WhatsApp e retorna o QR code"""
         try:
             # Nome simples da instância
             instance_name = f"user_{user_id[:8]}"
+            self._status_cache.invalidate(str(user_id))
             
             # Limpa instância existente
             await self._cleanup_existing_instance(user_id, instance_name, db)
@@ -39,6 +58,7 @@ class WhatsAppService:
                 instance_name=instance_name,
                 api_key=api_key
             )
+            self._status_cache.invalidate(str(user_id))
             
             return {
                 'success': True,
@@ -55,7 +75,20 @@ class WhatsAppService:
             }
     
     async def get_status(self, user_id: str, db: Session) -> Dict[str, Any]:
-        """Verifica o status da conexão WhatsApp"""
+        """
+        Verifica o status da conexão WhatsApp.
+        Responde a partir do cache; consulta a Evolution API apenas se a entrada não existir ou tiver expirado.
+        """
+        cached = self._status_cache.get(str(user_id))
+        if cached is not None:
+            return cached
+        
+        result = await self._fetch_status(user_id, db)
+        self._cache_status(user_id, result)
+        return result
+    
+    async def _fetch_status(self, user_id: str, db: Session) -> Dict[str, Any]:
+        """Consulta o status na Evolution API e sincroniza o banco"""
         instance = crud_whatsapp.get_whatsapp_instance_by_user_id(db, user_id)
         if not instance:
             raise ValueError("Nenhuma instância encontrada")
@@ -110,18 +143,104 @@ class WhatsAppService:
             pass  # Continua mesmo se falhar na Evolution API
         
         crud_whatsapp.delete_whatsapp_instance_by_user_id(db, user_id)
+        self._status_cache.invalidate(str(user_id))
         return {"message": "Instância WhatsApp desconectada com sucesso"}
     
-    async def _cleanup_existing_instance(self, user_id: str, instance_name: str, db: Session):
-        """Limpa instância existente se houver"""
-        # Remove do banco
-        crud_whatsapp.delete_whatsapp_instance_by_user_id(db, user_id)
+    def _cache_status(self, user_id: str, status: Dict[str, Any]):
+        """Armazena o status no cache, com TTL menor para instâncias não conectadas"""
+        ttl = STATUS_CACHE_TTL_SECONDS if status['connected'] else PENDING_STATUS_CACHE_TTL_SECONDS
+        self._status_cache.set(str(user_id), status, ttl_seconds=ttl)
+    
+    async def refresh_all_statuses(self) -> int:
+        """
+        Atualiza o status de todas as instâncias consultando a Evolution API em lotes concorrentes.
+        Grava no banco apenas os status que mudaram. Retorna o número de instâncias consultadas.
+        """
+        if not self.evolution.config.is_configured:
+            return 0
+        
+        instances = await run_in_threadpool(self._load_instances)
+        batch_size = self.evolution.config.status_refresh_batch_size
+        changed = {}
         
-        # Remove da Evolution API
+        for start in range(0, len(instances), batch_size):
+            batch = instances[start:start + batch_size]
+            results = await asyncio.gather(
+                *(self.evolution.get_instance_status(instance_name) for _, instance_name, _ in batch),
+                return_exceptions=True
+            )
+            
+            for (user_id, instance_name, current_status), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    # Mantém a entrada atual; ela expira e get_status volta a consultar
+                    continue
+                
+                is_connected = result.get("state") == "open"
+                new_status = "connected" if is_connected else "disconnected"
+                if current_status != new_status:
+                    changed[instance_name] = new_status
+                
+                self._cache_status(user_id, {
+                    'instance_name': instance_name,
+                    'status': new_status,
+                    'connected': is_connected
+                })
+        
+        if changed:
+            await run_in_threadpool(self._save_statuses, changed)
+        
+        return len(instances)
+    
+    async def run_status_refresher(self):
+        """Laço da atualização periódica de status. Executado como tarefa no lifespan da aplicação."""
+        interval = self.evolution.config.status_refresh_interval
+        while True:
+            try:
+                await self.refresh_all_statuses()
+            except Exception as e:
+                logger.error(f"Erro ao atualizar status das instâncias WhatsApp: {str(e)}")
+            await asyncio.sleep(interval)
+    
+    def _load_instances(self) -> List[Tuple[str, str, str]]:
+        """Carrega (user_id, instance_name, status) de todas as instâncias"""
+        db = SessionLocal()
+        try:
+            return [
+                (str(instance.user_id), instance.instance_name, instance.status)
+                for instance in crud_whatsapp.get_all_whatsapp_instances(db)
+            ]
+        finally:
+            db.close()
+    
+    def _save_statuses(self, statuses: Dict[str, str]):
+        """Grava no banco os status alterados"""
+        db = SessionLocal()
+        try:
+            crud_whatsapp.update_whatsapp_instance_statuses(db, statuses)
+        finally:
+            db.close()
+    
+    async def _cleanup_existing_instance(self, user_id: str, instance_name: str, db: Session):
+        """Limpa instância existente se houver (banco e Evolution API em paralelo)"""
+        await asyncio.gather(
+            run_in_threadpool(crud_whatsapp.delete_whatsapp_instance_by_user_id, db, user_id),
+            self._delete_remote_instance(instance_name)
+        )
+    
+    async def _delete_remote_instance(self, instance_name: str):
+        """Remove a instância da Evolution API e aguarda até que ela deixe de existir"""
         await self.evolution.delete_instance(instance_name)
         
-        # Aguarda limpeza
-        await asyncio.sleep(1)
+        # Consulta com backoff exponencial em vez de uma espera fixa
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + INSTANCE_REMOVAL_TIMEOUT_SECONDS
+        delay = INSTANCE_REMOVAL_INITIAL_DELAY_SECONDS
+        while await self.evolution.instance_exists(instance_name):
+            if loop.time() >= deadline:
+                logger.warning(f"Instância {instance_name} ainda existe na Evolution API após a remoção")
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, INSTANCE_REMOVAL_MAX_DELAY_SECONDS)
     
     def _extract_qr_code(self, evolution_response: Dict[str, Any]) -> str:
         """Extrai QR code da resposta da Evolution API"""
@@ -0,0 +1,111 @@
+import codecs
+import csv
+import io
+from typing import BinaryIO, Dict, Iterator, Tuple
+
+CSV_CONTENT_TYPES = ("text/csv", "application/csv", "text/plain")
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Delimitadores aceitos na detecção (planilhas exportadas em pt-BR costumam usar ";")
+CSV_DELIMITERS = ",;\t"
+SNIFF_BYTES = 64 * 1024
+
+
+class SpreadsheetError(Exception):
+    """Arquivo de planilha inválido ou em formato não suportado"""
+    pass
+
+
+class UnsupportedSpreadsheetError(SpreadsheetError):
+    """Tipo de conteúdo não suportado"""
+    pass
+
+
+def iter_rows(file: BinaryIO, content_type: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Lê uma planilha CSV ou XLSX linha a linha, sem carregá-la inteira na memória.
+    Gera (número da linha no arquivo, {coluna: valor}), com os nomes das colunas do cabeçalho
+    em minúsculas e sem espaços nas pontas. Linhas vazias são ignoradas.
+    """
+    if content_type == XLSX_CONTENT_TYPE:
+        return _iter_xlsx_rows(file)
+    if content_type in CSV_CONTENT_TYPES:
+        return _iter_csv_rows(file)
+    raise UnsupportedSpreadsheetError(
+        f"Tipo de conteúdo não suportado: '{content_type}'. Envie text/csv ou {XLSX_CONTENT_TYPE}."
+    )
+
+
+def _iter_csv_rows(file: BinaryIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    sample = file.read(SNIFF_BYTES)
+    file.seek(0)
+
+    # Sem UTF-8 válido na amostra, assume a codificação padrão do Excel em português
+    encoding = "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        encoding = "cp1252"
+
+    text_sample = sample.decode(encoding, errors="ignore")
+    try:
+        dialect = csv.Sniffer().sniff(text_sample, delimiters=CSV_DELIMITERS)
+    except csv.Error:
+        dialect = csv.excel
+
+    reader = csv.reader(io.TextIOWrapper(file, encoding=encoding, newline=""), dialect)
+    try:
+        header = next(reader, None)
+        if not header:
+            raise SpreadsheetError("Arquivo vazio ou sem cabeçalho")
+        columns = [_column_name(name) for name in header]
+
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            yield reader.line_num, {
+                column: value.strip() for column, value in zip(columns, values) if column
+            }
+    except (csv.Error, UnicodeDecodeError) as e:
+        raise SpreadsheetError(f"Erro ao ler o CSV na linha {reader.line_num}: {str(e)}")
+
+
+def _iter_xlsx_rows(file: BinaryIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise UnsupportedSpreadsheetError("Importação de XLSX indisponível (openpyxl não instalado). Envie um CSV.")
+
+    try:
+        # read_only percorre a planilha sob demanda, sem montar todas as células na memória
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise SpreadsheetError(f"Arquivo XLSX inválido: {str(e)}")
+
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            raise SpreadsheetError("Planilha vazia ou sem cabeçalho")
+        columns = [_column_name(name) for name in header]
+
+        for line_number, values in enumerate(rows, start=2):
+            cells = [_cell_text(value) for value in values]
+            if not any(cells):
+                continue
+            yield line_number, {column: value for column, value in zip(columns, cells) if column}
+    finally:
+        workbook.close()
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    # Números inteiros (telefones, CPF) chegam como float das células numéricas
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _column_name(name) -> str:
+    return str(name or "").strip().lower()
@@ -0,0 +1,34 @@
+from contextlib import asynccontextmanager
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator
+
+from fastapi import HTTPException, Request, status
+
+# Tamanho máximo dos arquivos enviados no corpo da requisição; até UPLOAD_SPOOL_BYTES fica em memória, depois em disco
+UPLOAD_MAX_BYTES = 20 * 1024 * 1024
+UPLOAD_SPOOL_BYTES = 1024 * 1024
+
+
+def request_content_type(request: Request) -> str:
+    """Content-Type da requisição sem parâmetros (charset, boundary) e em minúsculas."""
+    return request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+@asynccontextmanager
+async def spooled_request_body(request: Request, max_bytes: int = UPLOAD_MAX_BYTES) -> AsyncIterator[SpooledTemporaryFile]:
+    """
+    Recebe o corpo da requisição em pedaços num arquivo temporário, posicionado no início.
+    Responde 413 se o corpo passar de `max_bytes`.
+    """
+    with SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES) as upload:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Arquivo maior que {max_bytes // (1024 * 1024)} MB"
+                )
+            upload.write(chunk)
+        upload.seek(0)
+        yield upload
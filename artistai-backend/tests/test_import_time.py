@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Orçamento do `import app.main` (cold start no Render após scale-to-zero).
+# Hoje fica em torno de 1,1-1,5 s; ajustável por ambiente para máquinas de CI mais lentas
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "2.0"))
+RUNS = 3
+
+_MEASURE = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _measure_import() -> float:
+    """Tempo do `import app.main` num interpretador novo, sem contar a inicialização do Python."""
+    completed = subprocess.run(
+        [sys.executable, "-c", _MEASURE],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def test_import_app_main_within_budget():
+    # Melhor de algumas execuções, para não falhar por ruído da máquina
+    elapsed = min(_measure_import() for _ in range(RUNS))
+    assert elapsed <= IMPORT_TIME_BUDGET_SECONDS, (
+        f"import app.main levou {elapsed:.2f} s (orçamento: {IMPORT_TIME_BUDGET_SECONDS:.2f} s). "
+        "Veja o que ficou mais lento com: python -X importtime -c \"import app.main\""
+    )
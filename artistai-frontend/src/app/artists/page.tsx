@@ -7,30 +7,23 @@ import { Artist, artistsApi } from "@/lib/apiClient";
 import { ArtistTable } from "@/components/ArtistTable";
 import { ArtistForm } from "@/components/ArtistForm";
 import { DashboardLayout } from "@/components/DashboardLayout";
+import { LoadMoreButton } from "@/components/LoadMoreButton";
+import { useCursorList } from "@/hooks/use-cursor-list";
 
 export default function ArtistsPage() {
-  const [artists, setArtists] = useState<Artist[]>([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    items: artists, loading, loadingMore, error: loadError, hasMore, reload: loadArtists, loadMore,
+  } = useCursorList<Artist>((cursor) => artistsApi.getArtists(100, cursor));
   const [showCreateForm, setShowCreateForm] = useState(false);
-  const [error, setError] = useState<string | null>(null);
-
-  const loadArtists = async () => {
-    try {
-      setLoading(true);
-      setError(null);
-      const data = await artistsApi.getArtists();
-      setArtists(data);
-    } catch (err) {
-      setError("Erro ao carregar artistas. Verifique se o backend está rodando.");
-      console.error("Erro ao carregar artistas:", err);
-    } finally {
-      setLoading(false);
-    }
-  };
+  const error = loadError ? "Erro ao carregar artistas. Verifique se o backend está rodando." : null;
 
   useEffect(() => {
     loadArtists();
-  }, []);
+  }, [loadArtists]);
+
+  useEffect(() => {
+    if (loadError) console.error("Erro ao carregar artistas:", loadError);
+  }, [loadError]);
 
   const handleArtistChanged = () => {
     loadArtists();
@@ -78,7 +71,7 @@ export default function ArtistsPage() {
                 <p className="text-sm font-medium text-muted-foreground">
                   Total de Artistas
                 </p>
-                <p className="text-2xl font-bold">{artists.length}</p>
+                <p className="text-2xl font-bold">{artists.length}{hasMore ? "+" : ""}</p>
               </div>
             </div>
           </div>
@@ -118,6 +111,7 @@ export default function ArtistsPage() {
 
         {/* Tabela de Artistas */}
         <ArtistTable artists={artists} onArtistChanged={handleArtistChanged} />
+        <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
 
         {/* Modal de Criação */}
         <ArtistForm
@@ -11,35 +11,28 @@ import { KanbanBoard } from "@/components/contractors/KanbanBoard";
 import { ContractorDetails } from "@/components/contractors/ContractorDetails";
 import { Contractor, contractorsApi } from "@/lib/apiClient";
 import { DashboardLayout } from "@/components/DashboardLayout";
+import { LoadMoreButton } from "@/components/LoadMoreButton";
+import { useCursorList } from "@/hooks/use-cursor-list";
 
 type ViewMode = "list" | "kanban" | "details";
 
 export default function ContractorsPage() {
-  const [contractors, setContractors] = useState<Contractor[]>([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    items: contractors, loading, loadingMore, error: loadError, hasMore, reload: loadContractors, loadMore,
+  } = useCursorList<Contractor>((cursor) => contractorsApi.getContractors(100, cursor));
   const [showCreateForm, setShowCreateForm] = useState(false);
-  const [error, setError] = useState<string | null>(null);
+  const error = loadError ? "Erro ao carregar contratantes. Verifique se o backend está rodando." : null;
   const [editingContractor, setEditingContractor] = useState<Contractor | undefined>(undefined);
   const [viewMode, setViewMode] = useState<ViewMode>("kanban");
   const [selectedContractorId, setSelectedContractorId] = useState<string | undefined>(undefined);
 
-  const loadContractors = async () => {
-    try {
-      setLoading(true);
-      setError(null);
-      const data = await contractorsApi.getContractors();
-      setContractors(data);
-    } catch (err) {
-      setError("Erro ao carregar contratantes. Verifique se o backend está rodando.");
-      console.error("Erro ao carregar contratantes:", err);
-    } finally {
-      setLoading(false);
-    }
-  };
-
   useEffect(() => {
     loadContractors();
-  }, []);
+  }, [loadContractors]);
+
+  useEffect(() => {
+    if (loadError) console.error("Erro ao carregar contratantes:", loadError);
+  }, [loadError]);
 
   const handleContractorChanged = () => {
     loadContractors();
@@ -149,6 +142,7 @@ export default function ContractorsPage() {
               onContractorChanged={handleContractorChanged}
               onContractorClick={handleViewContractorDetails} 
             />
+            <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
           </TabsContent>
 
           <TabsContent value="list" className="space-y-4">
@@ -160,7 +154,7 @@ export default function ContractorsPage() {
                     <p className="text-sm font-medium text-muted-foreground">
                       Total de Contratantes
                     </p>
-                    <p className="text-2xl font-bold">{contractors.length}</p>
+                    <p className="text-2xl font-bold">{contractors.length}{hasMore ? "+" : ""}</p>
                   </div>
                 </div>
               </div>
@@ -203,6 +197,7 @@ export default function ContractorsPage() {
                   onDelete={handleDeleteContractor}
                   onView={handleViewContractorDetails}
                 />
+                <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
               </CardContent>
             </Card>
           </TabsContent>
@@ -1,39 +1,21 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Plus, Calendar as CalendarIcon, Users, Building2, DollarSign } from "lucide-react";
 import { Button } from "@/components/ui/button";
-import { Event, eventsApi } from "@/lib/apiClient";
+import { Event } from "@/lib/apiClient";
 import { EventCalendar } from "@/components/events/EventCalendar";
 import { EventForm } from "@/components/events/EventForm";
 import { DashboardLayout } from "@/components/DashboardLayout";
 
 export default function EventsPage() {
+  // Eventos do período visível no calendário, que também alimentam as estatísticas
   const [events, setEvents] = useState<Event[]>([]);
-  const [loading, setLoading] = useState(true);
   const [showCreateForm, setShowCreateForm] = useState(false);
-  const [error, setError] = useState<string | null>(null);
-
-  const loadEvents = async () => {
-    try {
-      setLoading(true);
-      setError(null);
-      const data = await eventsApi.getEvents(0, 1000);
-      setEvents(data);
-    } catch (err) {
-      setError("Erro ao carregar eventos. Verifique se o backend está rodando.");
-      console.error("Erro ao carregar eventos:", err);
-    } finally {
-      setLoading(false);
-    }
-  };
-
-  useEffect(() => {
-    loadEvents();
-  }, []);
+  const [reloadKey, setReloadKey] = useState(0);
 
   const handleEventChanged = () => {
-    loadEvents();
+    setReloadKey((key) => key + 1);
   };
 
   // Calcular estatísticas
@@ -44,34 +26,6 @@ export default function EventsPage() {
     .filter(e => e.status === "confirmed" || e.status === "completed")
     .reduce((sum, e) => sum + e.agreed_fee, 0);
 
-  if (loading) {
-    return (
-      <DashboardLayout>
-        <div className="flex items-center justify-center h-64">
-          <div className="text-center">
-            <div className="animate-spin rounded-full h-8 w-8 border-b-2 border-primary mx-auto mb-4"></div>
-            <p className="text-muted-foreground">Carregando eventos...</p>
-          </div>
-        </div>
-      </DashboardLayout>
-    );
-  }
-
-  if (error) {
-    return (
-      <DashboardLayout>
-        <div className="flex items-center justify-center h-64">
-          <div className="text-center">
-            <p className="text-red-600 mb-4">{error}</p>
-            <Button onClick={loadEvents} variant="outline">
-              Tentar Novamente
-            </Button>
-          </div>
-        </div>
-      </DashboardLayout>
-    );
-  }
-
   return (
     <DashboardLayout>
       <div className="space-y-6">
@@ -96,7 +50,7 @@ export default function EventsPage() {
               <CalendarIcon className="h-5 w-5 text-blue-600" />
               <div>
                 <p className="text-sm font-medium text-muted-foreground">
-                  Total de Eventos
+                  Eventos no Período
                 </p>
                 <p className="text-2xl font-bold">{totalEvents}</p>
               </div>
@@ -174,7 +128,10 @@ export default function EventsPage() {
         </div>
 
         {/* Calendário */}
-        <EventCalendar onEventChanged={handleEventChanged} />
+        <EventCalendar
+          onEventsLoaded={setEvents}
+          reloadKey={reloadKey}
+        />
 
         {/* Modal de Criação */}
         <EventForm
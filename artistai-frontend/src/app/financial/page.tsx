@@ -39,14 +39,14 @@ export default function FinancialPage() {
         const [summaryData, accountsData, transactionsData, goalsData, budgetsData] = await Promise.all([
           financialReportsApi.getSummary(),
           financialAccountsApi.getAccounts(0, 10),
-          financialTransactionsApi.getTransactions(0, 10),
+          financialTransactionsApi.getTransactions(10),
           financialGoalsApi.getGoals(0, 10),
           financialBudgetsApi.getBudgets(0, 10)
         ]);
 
         setSummary(summaryData);
         setAccounts(accountsData);
-        setRecentTransactions(transactionsData);
+        setRecentTransactions(transactionsData.items);
         setActiveGoals(goalsData.filter(goal => goal.status === 'active'));
         setActiveBudgets(budgetsData.filter(budget => budget.status === 'active'));
       } catch (err) {
@@ -53,7 +53,9 @@ import Link from "next/link";
 import { format } from "date-fns";
 import { ptBR } from "date-fns/locale";
 import { financialTransactionsApi, financialAccountsApi, financialCategoriesApi } from "@/lib/apiClient";
-import type { FinancialTransaction, FinancialTransactionCreate, FinancialAccount, FinancialCategory } from "@/lib/apiClient";
+import type { FinancialTransaction, FinancialTransactionCreate, FinancialAccount, FinancialCategory, TransactionFilters } from "@/lib/apiClient";
+import { LoadMoreButton } from "@/components/LoadMoreButton";
+import { useCursorList } from "@/hooks/use-cursor-list";
 
 // Interface já definida no apiClient.ts
 
@@ -70,7 +72,6 @@ const statusLabels = {
 };
 
 export default function FinancialTransactionsPage() {
-  const [transactions, setTransactions] = useState<FinancialTransaction[]>([]);
   const [filteredTransactions, setFilteredTransactions] = useState<FinancialTransaction[]>([]);
   const [accounts, setAccounts] = useState<FinancialAccount[]>([]);
   const [categories, setCategories] = useState<FinancialCategory[]>([]);
@@ -108,25 +109,53 @@ export default function FinancialTransactionsPage() {
     notes: '',
   });
 
+  // Filtros aplicados pela API; busca e status são aplicados sobre as transações já carregadas
+  const serverFilters = (): TransactionFilters => ({
+    transaction_type: filters.type !== 'all' ? filters.type : undefined,
+    account_id: filters.account !== 'all' ? filters.account : undefined,
+    category_id: filters.category !== 'all' ? filters.category : undefined,
+    start_date: filters.startDate || undefined,
+    end_date: filters.endDate || undefined,
+  });
+
+  // Transações carregadas por página (mais recentes primeiro)
+  const {
+    items: transactions,
+    loading: loadingTransactions,
+    loadingMore,
+    error: transactionsError,
+    hasMore,
+    reload: reloadTransactions,
+    loadMore,
+  } = useCursorList<FinancialTransaction>((cursor) => financialTransactionsApi.getTransactions(100, cursor, serverFilters()));
+
   // Carregar dados da API
   useEffect(() => {
     loadData();
   }, []);
 
+  useEffect(() => {
+    reloadTransactions();
+  }, [reloadTransactions, filters.type, filters.account, filters.category, filters.startDate, filters.endDate]);
+
+  useEffect(() => {
+    if (transactionsError) {
+      console.error('Erro ao carregar transações:', transactionsError);
+      setError('Erro ao carregar dados. Tente novamente.');
+    }
+  }, [transactionsError]);
+
   const loadData = async () => {
     try {
       setLoading(true);
       setError(null);
       
       // Carregar dados em paralelo
-      const [transactionsData, accountsData, categoriesData] = await Promise.all([
-        financialTransactionsApi.getTransactions(),
+      const [accountsData, categoriesData] = await Promise.all([
         financialAccountsApi.getAccounts(),
         financialCategoriesApi.getCategories()
       ]);
       
-      setTransactions(transactionsData);
-      setFilteredTransactions(transactionsData);
       setAccounts(accountsData);
       setCategories(categoriesData);
     } catch (err) {
@@ -137,7 +166,12 @@ export default function FinancialTransactionsPage() {
     }
   };
 
-  // Aplicar filtros
+  const retryLoad = () => {
+    loadData();
+    reloadTransactions();
+  };
+
+  // Aplicar filtros locais
   useEffect(() => {
     let filtered = [...transactions];
 
@@ -151,31 +185,13 @@ export default function FinancialTransactionsPage() {
       );
     }
 
-    // Filtro de tipo
-    if (filters.type !== 'all') {
-      filtered = filtered.filter(transaction => transaction.transaction_type === filters.type);
-    }
-
     // Filtro de status
     if (filters.status !== 'all') {
       filtered = filtered.filter(transaction => transaction.status === filters.status);
     }
 
-    // Filtro de conta
-    if (filters.account !== 'all') {
-      filtered = filtered.filter(transaction => transaction.account_id === filters.account);
-    }
-
-    // Filtro de data
-    if (filters.startDate) {
-      filtered = filtered.filter(transaction => transaction.transaction_date >= filters.startDate);
-    }
-    if (filters.endDate) {
-      filtered = filtered.filter(transaction => transaction.transaction_date <= filters.endDate);
-    }
-
     setFilteredTransactions(filtered);
-  }, [transactions, filters]);
+  }, [transactions, filters.search, filters.status]);
 
   const resetForm = () => {
     setFormData({
@@ -253,7 +269,7 @@ export default function FinancialTransactionsPage() {
         await financialTransactionsApi.createTransaction(transactionData as FinancialTransactionCreate);
       }
 
-      await loadData(); // Recarregar dados
+      await reloadTransactions(); // Recarregar dados
       setShowCreateForm(false);
       resetForm();
       setEditingTransaction(null);
@@ -314,7 +330,7 @@ export default function FinancialTransactionsPage() {
         <div className="flex items-center justify-center h-64">
           <div className="text-center">
             <p className="text-red-500 mb-4">{error}</p>
-            <Button onClick={loadData}>Tentar Novamente</Button>
+            <Button onClick={retryLoad}>Tentar Novamente</Button>
           </div>
         </div>
       </DashboardLayout>
@@ -484,7 +500,7 @@ export default function FinancialTransactionsPage() {
           <CardHeader>
             <CardTitle>Transações</CardTitle>
             <CardDescription>
-              {filteredTransactions.length} de {transactions.length} transações
+              {filteredTransactions.length} de {transactions.length}{hasMore ? '+' : ''} transações
             </CardDescription>
           </CardHeader>
           <CardContent>
@@ -506,7 +522,7 @@ export default function FinancialTransactionsPage() {
                   {filteredTransactions.length === 0 ? (
                     <TableRow>
                       <TableCell colSpan={8} className="text-center py-8 text-muted-foreground">
-                        Nenhuma transação encontrada
+                        {loadingTransactions ? 'Carregando transações...' : 'Nenhuma transação encontrada'}
                       </TableCell>
                     </TableRow>
                   ) : (
@@ -575,6 +591,7 @@ export default function FinancialTransactionsPage() {
                 </TableBody>
               </Table>
             </div>
+            <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
           </CardContent>
         </Card>
 
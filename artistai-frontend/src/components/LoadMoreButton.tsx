@@ -0,0 +1,22 @@
+"use client";
+
+import { Button } from "@/components/ui/button";
+
+interface LoadMoreButtonProps {
+  hasMore: boolean;
+  loading: boolean;
+  onClick: () => void;
+}
+
+// Botão "Carregar mais" das listagens paginadas por cursor; some quando não há próxima página
+export function LoadMoreButton({ hasMore, loading, onClick }: LoadMoreButtonProps) {
+  if (!hasMore) return null;
+
+  return (
+    <div className="flex justify-center py-4">
+      <Button variant="outline" onClick={onClick} disabled={loading}>
+        {loading ? "Carregando..." : "Carregar mais"}
+      </Button>
+    </div>
+  );
+}
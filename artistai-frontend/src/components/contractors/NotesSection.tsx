@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect, useCallback } from "react";
+import { useState, useEffect } from "react";
 import { Plus, Edit, Trash2, Save, X } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
@@ -19,6 +19,8 @@ import {
 import { Note, notesApi, NoteCreate, NoteUpdate } from "@/lib/apiClient";
 import { formatDistanceToNow } from "date-fns";
 import { ptBR } from "date-fns/locale";
+import { LoadMoreButton } from "@/components/LoadMoreButton";
+import { useCursorList } from "@/hooks/use-cursor-list";
 
 interface NotesSectionProps {
   contractorId: string;
@@ -26,29 +28,23 @@ interface NotesSectionProps {
 }
 
 export function NotesSection({ contractorId, contractorName }: NotesSectionProps) {
-  const [notes, setNotes] = useState<Note[]>([]);
-  const [loading, setLoading] = useState(true);
+  // Mais recentes primeiro, na ordem da API
+  const {
+    items: notes, loading, loadingMore, error, hasMore, reload: loadNotes, loadMore,
+  } = useCursorList<Note>((cursor) => notesApi.getNotesByContractor(contractorId, 100, cursor));
   const [showCreateForm, setShowCreateForm] = useState(false);
   const [editingNote, setEditingNote] = useState<Note | null>(null);
   const [deletingNote, setDeletingNote] = useState<Note | null>(null);
   const [newNoteContent, setNewNoteContent] = useState("");
   const [editNoteContent, setEditNoteContent] = useState("");
 
-  const loadNotes = useCallback(async () => {
-    try {
-      setLoading(true);
-      const data = await notesApi.getNotesByContractor(contractorId);
-      setNotes(data.sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime()));
-    } catch (error) {
-      console.error("Erro ao carregar anotações:", error);
-    } finally {
-      setLoading(false);
-    }
-  }, [contractorId]);
-
   useEffect(() => {
     loadNotes();
-  }, [loadNotes]);
+  }, [contractorId, loadNotes]);
+
+  useEffect(() => {
+    if (error) console.error("Erro ao carregar anotações:", error);
+  }, [error]);
 
   const handleCreateNote = async () => {
     if (!newNoteContent.trim()) return;
@@ -131,7 +127,7 @@ export function NotesSection({ contractorId, contractorName }: NotesSectionProps
         <CardTitle className="flex items-center justify-between">
           <div className="flex items-center gap-2">
             <span>Anotações</span>
-            <Badge variant="secondary">{notes.length}</Badge>
+            <Badge variant="secondary">{notes.length}{hasMore ? "+" : ""}</Badge>
           </div>
           <Button
             size="sm"
@@ -258,6 +254,7 @@ export function NotesSection({ contractorId, contractorName }: NotesSectionProps
                 </CardContent>
               </Card>
             ))}
+            <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
           </div>
         )}
 
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useEffect } from "react";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { Skeleton } from "@/components/ui/skeleton";
@@ -8,6 +8,8 @@ import { conversationAPI, Conversation } from "@/lib/apiClient";
 import { formatDistanceToNow } from "date-fns";
 import { ptBR } from "date-fns/locale";
 import { MessageSquare, Phone } from "lucide-react";
+import { LoadMoreButton } from "@/components/LoadMoreButton";
+import { useCursorList } from "@/hooks/use-cursor-list";
 
 interface ConversationListProps {
   onSelectConversation: (conversation: Conversation) => void;
@@ -15,26 +17,18 @@ interface ConversationListProps {
 }
 
 export function ConversationList({ onSelectConversation, selectedConversation }: ConversationListProps) {
-  const [conversations, setConversations] = useState<Conversation[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null);
+  const {
+    items: conversations, loading, loadingMore, error: loadError, hasMore, reload: loadConversations, loadMore,
+  } = useCursorList<Conversation>((cursor) => conversationAPI.getConversations(50, cursor));
+  const error = loadError ? "Erro ao carregar conversas" : null;
 
   useEffect(() => {
     loadConversations();
-  }, []);
+  }, [loadConversations]);
 
-  const loadConversations = async () => {
-    try {
-      setLoading(true);
-      const data = await conversationAPI.getConversations();
-      setConversations(data);
-    } catch (err) {
-      setError("Erro ao carregar conversas");
-      console.error("Erro ao carregar conversas:", err);
-    } finally {
-      setLoading(false);
-    }
-  };
+  useEffect(() => {
+    if (loadError) console.error("Erro ao carregar conversas:", loadError);
+  }, [loadError]);
 
   const getChannelIcon = (channel: string) => {
     switch (channel) {
@@ -96,7 +90,7 @@ export function ConversationList({ onSelectConversation, selectedConversation }:
       <CardHeader>
         <CardTitle className="flex items-center gap-2">
           <MessageSquare className="h-5 w-5" />
-          Conversas ({conversations.length})
+          Conversas ({conversations.length}{hasMore ? "+" : ""})
         </CardTitle>
       </CardHeader>
       
@@ -146,6 +140,7 @@ export function ConversationList({ onSelectConversation, selectedConversation }:
                 )}
               </div>
             ))}
+            <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
           </div>
         )}
       </CardContent>
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import FullCalendar from "@fullcalendar/react";
 import dayGridPlugin from "@fullcalendar/daygrid";
 import interactionPlugin from "@fullcalendar/interaction";
@@ -8,19 +8,28 @@ import { Event, eventsApi } from "@/lib/apiClient";
 import { EventForm } from "./EventForm";
 
 interface EventCalendarProps {
-  onEventChanged: () => void;
+  onEventChanged?: () => void;
+  // Eventos do período visível, a cada carregamento
+  onEventsLoaded?: (events: Event[]) => void;
+  // Alterar o valor recarrega o período visível (ex.: após criar um evento fora do calendário)
+  reloadKey?: number;
 }
 
-export function EventCalendar({ onEventChanged }: EventCalendarProps) {
+export function EventCalendar({ onEventChanged, onEventsLoaded, reloadKey }: EventCalendarProps) {
   const [events, setEvents] = useState<Event[]>([]);
   const [showCreateForm, setShowCreateForm] = useState(false);
   const [editingEvent, setEditingEvent] = useState<Event | null>(null);
   const [selectedDate, setSelectedDate] = useState<string>("");
+  // Período visível no calendário; só os eventos dele são carregados
+  const visibleRange = useRef<{ startDate: string; endDate: string } | null>(null);
 
-  const loadEvents = async (startDate?: string, endDate?: string) => {
+  const loadEvents = async () => {
+    if (!visibleRange.current) return;
     try {
-      const data = await eventsApi.getEvents(0, 1000, startDate, endDate);
+      const { startDate, endDate } = visibleRange.current;
+      const data = await eventsApi.getEventsInRange(startDate, endDate);
       setEvents(data);
+      onEventsLoaded?.(data);
     } catch (error) {
       console.error("Erro ao carregar eventos:", error);
     }
@@ -28,7 +37,8 @@ export function EventCalendar({ onEventChanged }: EventCalendarProps) {
 
   useEffect(() => {
     loadEvents();
-  }, []);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [reloadKey]);
 
   // Converter eventos para formato do FullCalendar
   const calendarEvents = events.map((event) => ({
@@ -70,14 +80,16 @@ export function EventCalendar({ onEventChanged }: EventCalendarProps) {
 
   const handleEventChanged = () => {
     loadEvents();
-    onEventChanged();
+    onEventChanged?.();
   };
 
   const handleDatesSet = (dateInfo: { start: Date; end: Date }) => {
-    // Carregar eventos quando o usuário navegar no calendário
-    const startDate = dateInfo.start.toISOString().split('T')[0];
-    const endDate = dateInfo.end.toISOString().split('T')[0];
-    loadEvents(startDate, endDate);
+    // Carregar eventos quando o usuário navegar no calendário (também dispara na montagem)
+    visibleRange.current = {
+      startDate: dateInfo.start.toISOString().split('T')[0],
+      endDate: dateInfo.end.toISOString().split('T')[0],
+    };
+    loadEvents();
   };
 
   return (
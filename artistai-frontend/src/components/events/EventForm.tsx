@@ -22,6 +22,9 @@ import {
 } from "@/components/ui/select";
 import { Event, EventCreate, EventUpdate, eventsApi, Artist, Contractor, artistsApi, contractorsApi } from "@/lib/apiClient";
 
+// Opções carregadas nos selects de artista e contratante (o máximo de uma página da API)
+const OPTIONS_LIMIT = 500;
+
 interface EventFormProps {
   event?: Event;
   open: boolean;
@@ -59,10 +62,20 @@ export function EventForm({ event, open, onClose, onSuccess, selectedDate }: Eve
     const loadOptions = async () => {
       try {
         setLoadingOptions(true);
-        const [artistsData, contractorsData] = await Promise.all([
-          artistsApi.getArtists(),
-          contractorsApi.getContractors(),
+        // Só a primeira página de cada listagem; o artista e o contratante do evento em edição
+        // entram nas opções mesmo que não estejam nela
+        const [artistsPage, contractorsPage] = await Promise.all([
+          artistsApi.getArtists(OPTIONS_LIMIT),
+          contractorsApi.getContractors(OPTIONS_LIMIT),
         ]);
+        const artistsData = artistsPage.items;
+        const contractorsData = contractorsPage.items;
+        if (event?.artist && !artistsData.some((artist) => artist.id === event.artist_id)) {
+          artistsData.unshift(event.artist);
+        }
+        if (event?.contractor && !contractorsData.some((contractor) => contractor.id === event.contractor_id)) {
+          contractorsData.unshift(event.contractor);
+        }
         setArtists(artistsData);
         setContractors(contractorsData);
       } catch (error) {
@@ -75,7 +88,7 @@ export function EventForm({ event, open, onClose, onSuccess, selectedDate }: Eve
     if (open) {
       loadOptions();
     }
-  }, [open]);
+  }, [open, event]);
 
   const handleInputChange = (field: string, value: string) => {
     setFormData(prev => ({ ...prev, [field]: value }));
@@ -0,0 +1,48 @@
+import * as React from "react"
+
+import { Page } from "@/lib/apiClient"
+
+// Listagem paginada por cursor carregada sob demanda: reload() busca a primeira página
+// e loadMore() acrescenta a seguinte, enquanto houver next_cursor
+export function useCursorList<T>(fetchPage: (cursor?: string | null) => Promise<Page<T>>) {
+  const [items, setItems] = React.useState<T[]>([])
+  const [nextCursor, setNextCursor] = React.useState<string | null>(null)
+  const [loading, setLoading] = React.useState(true)
+  const [loadingMore, setLoadingMore] = React.useState(false)
+  const [error, setError] = React.useState<unknown>(null)
+
+  // Sempre usa a versão mais recente de fetchPage (ex.: com filtros novos) sem exigir useCallback
+  const fetchPageRef = React.useRef(fetchPage)
+  fetchPageRef.current = fetchPage
+
+  const reload = React.useCallback(async () => {
+    try {
+      setLoading(true)
+      setError(null)
+      const page = await fetchPageRef.current(null)
+      setItems(page.items)
+      setNextCursor(page.next_cursor)
+    } catch (err) {
+      setError(err)
+    } finally {
+      setLoading(false)
+    }
+  }, [])
+
+  const loadMore = React.useCallback(async () => {
+    if (!nextCursor || loadingMore) return
+    try {
+      setLoadingMore(true)
+      const page = await fetchPageRef.current(nextCursor)
+      setItems((current) => [...current, ...page.items])
+      setNextCursor(page.next_cursor)
+    } catch (err) {
+      // Mantém o que já foi carregado; o botão continua disponível para tentar de novo
+      console.error("Erro ao carregar mais itens:", err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }, [nextCursor, loadingMore])
+
+  return { items, loading, loadingMore, error, hasMore: nextCursor !== null, reload, loadMore }
+}
@@ -37,6 +37,35 @@ apiClient.interceptors.request.use(
   }
 );
 
+// Página de uma listagem paginada por cursor
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+// Busca uma página de uma listagem; passe o next_cursor recebido para buscar a seguinte
+const getPage = async <T>(url: string, limit = 100, cursor?: string | null): Promise<Page<T>> => {
+  const separator = url.includes('?') ? '&' : '?';
+  let pageUrl = `${url}${separator}limit=${limit}`;
+  if (cursor) pageUrl += `&cursor=${encodeURIComponent(cursor)}`;
+  const response = await apiClient.get<Page<T>>(pageUrl);
+  return response.data;
+};
+
+// Busca todas as páginas de uma listagem, seguindo next_cursor.
+// Só para listagens pequenas e limitadas (etapas do pipeline, eventos de um intervalo de datas):
+// as demais devem ser carregadas sob demanda com getPage
+const getAllPages = async <T>(url: string, limit = 100): Promise<T[]> => {
+  const items: T[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: Page<T> = await getPage<T>(url, limit, cursor);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+};
+
 // Tipos TypeScript para os dados da API
 export interface Artist {
   id: string;
@@ -147,6 +176,23 @@ export interface ContractorUpdate {
   bio?: string;
 }
 
+export interface ContractorDuplicate {
+  id: string | null; // nulo quando o conflito é com contratante de outro usuário
+  name: string | null;
+  phone: string | null;
+  cpf_cnpj: string | null;
+  own: boolean;
+  matches: ('phone' | 'cpf_cnpj' | 'name')[];
+  similarity: number;
+}
+
+export interface ContractorImportResult {
+  received: number;
+  created: number;
+  failed: number;
+  errors: { row: number; error: string }[];
+}
+
 export interface ContractorWithDetails extends Contractor {
   stage?: PipelineStage;
   notes?: Note[];
@@ -190,9 +236,8 @@ export interface EventUpdate {
 // Funções da API para artistas
 export const artistsApi = {
   // Listar artistas
-  getArtists: async (skip = 0, limit = 100): Promise<Artist[]> => {
-    const response = await apiClient.get(`/artists?skip=${skip}&limit=${limit}`);
-    return response.data;
+  getArtists: async (limit = 100, cursor?: string | null): Promise<Page<Artist>> => {
+    return getPage<Artist>('/artists', limit, cursor);
   },
 
   // Buscar artista por ID
@@ -223,8 +268,29 @@ export const artistsApi = {
 // Funções da API para contratantes
 export const contractorsApi = {
   // Listar contratantes
-  getContractors: async (skip = 0, limit = 100): Promise<Contractor[]> => {
-    const response = await apiClient.get(`/contractors?skip=${skip}&limit=${limit}`);
+  getContractors: async (limit = 100, cursor?: string | null): Promise<Page<Contractor>> => {
+    return getPage<Contractor>('/contractors', limit, cursor);
+  },
+
+  // Importar contratantes de uma planilha CSV ou XLSX (o arquivo vai como corpo da requisição)
+  importContractors: async (file: File): Promise<ContractorImportResult> => {
+    const contentType = file.name.toLowerCase().endsWith('.xlsx')
+      ? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+      : 'text/csv';
+    const response = await apiClient.post('/contractors/import', file, {
+      headers: { 'Content-Type': contentType },
+      timeout: 120000,
+    });
+    return response.data;
+  },
+
+  // Verificar possíveis duplicatas (telefone/CPF/CNPJ em qualquer formatação e nomes parecidos)
+  checkDuplicates: async (data: { phone?: string; cpf_cnpj?: string; name?: string; exclude_id?: string }): Promise<ContractorDuplicate[]> => {
+    const params = new URLSearchParams();
+    Object.entries(data).forEach(([key, value]) => {
+      if (value) params.append(key, value);
+    });
+    const response = await apiClient.get(`/contractors/duplicates?${params.toString()}`);
     return response.data;
   },
 
@@ -255,14 +321,15 @@ export const contractorsApi = {
 
 // Funções da API para eventos
 export const eventsApi = {
-  // Listar eventos com filtros de data
-  getEvents: async (skip = 0, limit = 100, startDate?: string, endDate?: string): Promise<Event[]> => {
-    let url = `/events?skip=${skip}&limit=${limit}`;
-    if (startDate) url += `&start_date=${startDate}`;
-    if (endDate) url += `&end_date=${endDate}`;
-    
-    const response = await apiClient.get(url);
-    return response.data;
+  // Listar eventos
+  getEvents: async (limit = 100, cursor?: string | null): Promise<Page<Event>> => {
+    return getPage<Event>('/events', limit, cursor);
+  },
+
+  // Listar todos os eventos de um intervalo de datas (ex.: o período visível no calendário)
+  getEventsInRange: async (startDate: string, endDate: string, limit = 500): Promise<Event[]> => {
+    const params = new URLSearchParams({ start_date: startDate, end_date: endDate });
+    return getAllPages<Event>(`/events?${params.toString()}`, limit);
   },
 
   // Buscar evento por ID
@@ -325,6 +392,12 @@ export interface Message {
   timestamp: string;
 }
 
+export interface MessagePage {
+  items: Message[];
+  before_cursor: string | null;
+  after_cursor: string | null;
+}
+
 export interface MessageCreate {
   conversation_id: string;
   sender_type: string;
@@ -336,14 +409,22 @@ export interface MessageCreate {
 // Funções para Conversas
 export const conversationAPI = {
   // Listar conversas
-  getConversations: async (skip = 0, limit = 100): Promise<Conversation[]> => {
-    const response = await apiClient.get(`/conversations/?skip=${skip}&limit=${limit}`);
-    return response.data;
+  getConversations: async (limit = 100, cursor?: string | null): Promise<Page<Conversation>> => {
+    return getPage<Conversation>('/conversations/', limit, cursor);
+  },
+
+  // Buscar mensagens de uma conversa (as mais recentes, ou as anteriores a `before`)
+  getConversationMessages: async (conversationId: string, limit = 100, before?: string): Promise<Message[]> => {
+    const page = await conversationAPI.getConversationMessagesPage(conversationId, limit, before);
+    return page.items;
   },
 
-  // Buscar mensagens de uma conversa
-  getConversationMessages: async (conversationId: string, skip = 0, limit = 100): Promise<Message[]> => {
-    const response = await apiClient.get(`/conversations/${conversationId}/messages?skip=${skip}&limit=${limit}`);
+  // Buscar uma página de mensagens com os cursores para o histórico (before) e mensagens novas (after)
+  getConversationMessagesPage: async (conversationId: string, limit = 100, before?: string, after?: string): Promise<MessagePage> => {
+    let url = `/conversations/${conversationId}/messages?limit=${limit}`;
+    if (before) url += `&before=${encodeURIComponent(before)}`;
+    if (after) url += `&after=${encodeURIComponent(after)}`;
+    const response = await apiClient.get(url);
     return response.data;
   },
 
@@ -354,6 +435,29 @@ export const conversationAPI = {
   },
 };
 
+// Interfaces para Busca
+export interface SearchHit {
+  type: 'message' | 'note' | 'contractor';
+  id: string;
+  rank: number;
+  highlight: string; // trecho escapado para HTML, com os termos entre <mark> e </mark> (as únicas tags)
+  conversation_id: string | null;
+  contractor_id: string | null;
+  created_at: string;
+}
+
+// Funções para Busca
+export const searchApi = {
+  // Buscar em mensagens, anotações e contratantes (ordenado por relevância)
+  search: async (q: string, types?: SearchHit['type'][], limit = 20, cursor?: string): Promise<Page<SearchHit>> => {
+    const params = new URLSearchParams({ q, limit: String(limit) });
+    types?.forEach((type) => params.append('types', type));
+    if (cursor) params.append('cursor', cursor);
+    const response = await apiClient.get(`/search?${params.toString()}`);
+    return response.data;
+  },
+};
+
 // Interfaces para WhatsApp
 export interface WhatsAppStatus {
   instance_name: string;
@@ -399,9 +503,8 @@ export const whatsappApi = {
 // Funções da API para Pipeline Stages
 export const stagesApi = {
   // Listar stages
-  getStages: async (skip = 0, limit = 100): Promise<PipelineStage[]> => {
-    const response = await apiClient.get(`/stages?skip=${skip}&limit=${limit}`);
-    return response.data;
+  getStages: async (limit = 100): Promise<PipelineStage[]> => {
+    return getAllPages<PipelineStage>('/stages', limit);
   },
 
   // Buscar stage por ID
@@ -437,15 +540,13 @@ export const stagesApi = {
 // Funções da API para Notes
 export const notesApi = {
   // Listar notes de um contractor
-  getNotesByContractor: async (contractorId: string, skip = 0, limit = 100): Promise<Note[]> => {
-    const response = await apiClient.get(`/contractors/${contractorId}/notes?skip=${skip}&limit=${limit}`);
-    return response.data;
+  getNotesByContractor: async (contractorId: string, limit = 100, cursor?: string | null): Promise<Page<Note>> => {
+    return getPage<Note>(`/contractors/${contractorId}/notes`, limit, cursor);
   },
 
   // Listar todas as notes do usuário
-  getNotes: async (skip = 0, limit = 100): Promise<Note[]> => {
-    const response = await apiClient.get(`/notes?skip=${skip}&limit=${limit}`);
-    return response.data;
+  getNotes: async (limit = 100, cursor?: string | null): Promise<Page<Note>> => {
+    return getPage<Note>('/notes', limit, cursor);
   },
 
   // Buscar note por ID
@@ -696,6 +797,32 @@ export interface FinancialBudgetUpdate {
   notes?: string;
 }
 
+export interface FinancialCategoryRule {
+  id: string;
+  category_id: string;
+  pattern: string;
+  transaction_type?: 'income' | 'expense' | null;
+  priority: number;
+  category: FinancialCategory;
+  created_at: string;
+}
+
+export interface FinancialCategoryRuleCreate {
+  category_id: string;
+  pattern: string;
+  transaction_type?: 'income' | 'expense' | null;
+  priority?: number;
+}
+
+export interface BankStatementImportResult {
+  received: number;
+  created: number;
+  duplicates: number;
+  failed: number;
+  errors: { row: number; error: string }[];
+  balance: number;
+}
+
 export interface FinancialSummary {
   total_income: number;
   total_expenses: number;
@@ -777,6 +904,41 @@ export const financialAccountsApi = {
   deleteAccount: async (accountId: string): Promise<void> => {
     await apiClient.delete(`/financial/accounts/${accountId}`);
   },
+
+  // Importar extrato OFX, CSV ou XLSX na conta (o arquivo vai como corpo da requisição)
+  importStatement: async (accountId: string, file: File): Promise<BankStatementImportResult> => {
+    const name = file.name.toLowerCase();
+    const contentType = name.endsWith('.ofx')
+      ? 'application/x-ofx'
+      : name.endsWith('.xlsx')
+        ? 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        : 'text/csv';
+    const response = await apiClient.post(`/financial/accounts/${accountId}/import`, file, {
+      headers: { 'Content-Type': contentType },
+      timeout: 120000,
+    });
+    return response.data;
+  },
+};
+
+// Funções da API para regras de categorização da importação de extratos
+export const financialCategoryRulesApi = {
+  // Listar regras, na ordem em que são avaliadas
+  getRules: async (): Promise<FinancialCategoryRule[]> => {
+    const response = await apiClient.get('/financial/category-rules/');
+    return response.data;
+  },
+
+  // Criar nova regra
+  createRule: async (rule: FinancialCategoryRuleCreate): Promise<FinancialCategoryRule> => {
+    const response = await apiClient.post('/financial/category-rules/', rule);
+    return response.data;
+  },
+
+  // Deletar regra
+  deleteRule: async (ruleId: string): Promise<void> => {
+    await apiClient.delete(`/financial/category-rules/${ruleId}`);
+  },
 };
 
 // Funções da API para categorias financeiras
@@ -811,24 +973,41 @@ export const financialCategoriesApi = {
   },
 };
 
+export interface TransactionFilters {
+  account_id?: string;
+  category_id?: string;
+  transaction_type?: string;
+  status?: string;
+  start_date?: string;
+  end_date?: string;
+}
+
+const transactionParams = (filters?: TransactionFilters): URLSearchParams => {
+  const params = new URLSearchParams();
+  if (filters) {
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value) params.append(key, value);
+    });
+  }
+  return params;
+};
+
 // Funções da API para transações financeiras
 export const financialTransactionsApi = {
-  // Listar transações
-  getTransactions: async (skip = 0, limit = 100, filters?: {
-    account_id?: string;
-    category_id?: string;
-    transaction_type?: string;
-    status?: string;
-    start_date?: string;
-    end_date?: string;
-  }): Promise<FinancialTransaction[]> => {
-    let url = `/financial/transactions?skip=${skip}&limit=${limit}`;
-    if (filters) {
-      Object.entries(filters).forEach(([key, value]) => {
-        if (value) url += `&${key}=${value}`;
-      });
-    }
-    const response = await apiClient.get(url);
+  // Buscar uma página de transações (mais recentes primeiro); use next_cursor para a próxima
+  getTransactions: async (limit = 100, cursor?: string | null, filters?: TransactionFilters): Promise<Page<FinancialTransaction>> => {
+    const query = transactionParams(filters).toString();
+    return getPage<FinancialTransaction>(query ? `/financial/transactions?${query}` : '/financial/transactions', limit, cursor);
+  },
+
+  // Exportar transações (csv, xlsx ou ofx) com os mesmos filtros da listagem; OFX exige account_id
+  exportTransactions: async (format: 'csv' | 'xlsx' | 'ofx' = 'csv', filters?: TransactionFilters): Promise<Blob> => {
+    const params = transactionParams(filters);
+    params.append('format', format);
+    const response = await apiClient.get(`/financial/transactions/export?${params.toString()}`, {
+      responseType: 'blob',
+      timeout: 120000,
+    });
     return response.data;
   },
 